@@ -0,0 +1,71 @@
+"""
+Compares the time taken by each installed JSON backend to decode, parse and
+encode synthetic Pywr networks.
+
+Usage:
+    python benchmarks/bench_backends.py [--nodes N] [--repeat R]
+"""
+import argparse
+import json
+import time
+
+from pywrparser.jsonbackend import available_backends
+from pywrparser.parsers import PywrJSONParser
+from pywrparser.types.network import PywrNetwork
+
+
+def synthetic_network(num_nodes, nested=False):
+    """
+    Returns the JSON text of a linear network of `num_nodes` nodes, each with
+    a parameter.  If `nested`, each parameter holds a deeply nested structure
+    so that decoding is dominated by component content rather than names.
+    """
+    nodes = [{"name": f"node_{i}", "type": "link"} for i in range(num_nodes)]
+    nodes[0]["type"], nodes[-1]["type"] = "input", "output"
+    edges = [[f"node_{i}", f"node_{i+1}"] for i in range(num_nodes - 1)]
+    parameters = {}
+    for i in range(num_nodes):
+        param = {"type": "constant", "value": i * 0.5}
+        if nested:
+            param = {
+                "type": "monthlyprofile",
+                "values": [float(m) for m in range(12)],
+                "comment": {"history": [{"rev": r, "by": "bench"} for r in range(4)]}
+            }
+        parameters[f"param_{i}"] = param
+    return json.dumps({
+        "metadata": {"title": "Synthetic", "minimum_version": "0.1"},
+        "timestepper": {"start": "2000-01-01", "end": "2000-12-31", "timestep": 1},
+        "nodes": nodes,
+        "edges": edges,
+        "parameters": parameters
+    })
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(num_nodes, repeat):
+    print(f"{'model':<8} {'backend':<8} {'decode':>9} {'parse':>9} {'encode':>9}")
+    for label, nested in (("flat", False), ("nested", True)):
+        src = synthetic_network(num_nodes, nested).encode()
+        for backend in available_backends():
+            decode = best_of(repeat, lambda: PywrJSONParser(src, json_backend=backend))
+            parse = best_of(repeat, lambda: PywrNetwork.from_json(src, json_backend=backend))
+            network, _, _ = PywrNetwork.from_json(src)
+            encode = best_of(repeat, lambda: network.as_json(json_backend=backend))
+            print(f"{label:<8} {backend:<8} {decode:>8.3f}s {parse:>8.3f}s {encode:>8.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.nodes, args.repeat)
@@ -16,3 +16,11 @@ def test(session, rich):
     session.install(".", f"rich=={rich}", "pytest", "pytest-cov")
     session.cd("tests")
     session.run("pytest", "--cov=pywrparser", f"--cov-fail-under={COV_MIN}", *session.posargs)
+
+
+@nox.session
+def benchmark(session):
+    """ Run the startup time budgets, which are not part of the test session """
+    session.install(".", "pytest")
+    session.cd("tests")
+    session.run("pytest", "-m", "benchmark", *session.posargs)
@@ -0,0 +1,181 @@
+"""
+Validation of many network files across a pool of worker processes.
+"""
+import glob
+import os
+
+from functools import partial
+
+""" File extensions of networks found by searching a directory """
+NETWORK_SUFFIXES = (".json", ".json.gz", ".json.bz2", ".json.xz")
+
+""" Upper bound on the number of files sent to a worker at once """
+MAX_CHUNK_SIZE = 16
+
+
+def expand_paths(paths):
+    """
+    Expands each of `paths` into the network files it denotes.
+
+    Args:
+        paths (Iterable[str]): Filenames, directories, which are searched
+            recursively for files ending in one of :const:`NETWORK_SUFFIXES`, or glob
+            patterns, which may include ``**`` to match any number of directories.
+
+    Returns:
+        filenames (List[str]): Each file denoted by `paths` in the order given,
+            with any repeated file appearing only once.
+    """
+    filenames = {}
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            matches = sorted(p for p in glob.glob(os.path.join(glob.escape(path), "**", "*"),
+                                                  recursive=True)
+                             if p.endswith(NETWORK_SUFFIXES) and not os.path.isdir(p))
+        elif any(c in path for c in "*?["):
+            matches = sorted(p for p in glob.glob(path, recursive=True) if not os.path.isdir(p))
+        else:
+            matches = [path]
+        for match in matches:
+            filenames.setdefault(match, None)
+
+    return list(filenames)
+
+
+def validate_file(filename, options):
+    """
+    Returns the result of :meth:`PywrNetwork.from_file` for `filename`
+    as a `(filename, network, errors, warnings)` tuple.  This is invoked
+    within worker processes, so must be importable at module level.
+    """
+    from pywrparser.types.network import PywrNetwork
+    return (filename, *PywrNetwork.from_file(filename, **options))
+
+
+def summarise_file(filename, options, cache=None, digest=True):
+    """
+    Returns the :class:`ValidationResult` of validating `filename` with the
+    :meth:`PywrNetwork.from_file` `options` as a `(filename, result, cached)`
+    tuple, in which `cached` indicates whether the result was taken from `cache`.
+    The file is read exactly once, and its digest computed as it is read.
+
+    Args:
+        filename (str | file object): The file to be validated. File objects
+            are never cached.
+        options (Dict): Keyword arguments passed to :meth:`PywrNetwork.from_file`
+        cache (ResultCache): If present, a cache of results which is consulted
+            before validating the file and updated afterwards
+        digest (bool): Whether the sha256 digest of the file is computed where
+            this is not required by `cache`
+    """
+    from pywrparser.results import ValidationResult
+    from pywrparser.source import (
+        MMAP_THRESHOLD,
+        Source
+    )
+    from pywrparser.types.network import PywrNetwork
+
+    use_cache = cache is not None and not hasattr(filename, "read")
+    try:
+        source = Source.read(filename,
+                             mmap_threshold=options.get("mmap_threshold", MMAP_THRESHOLD),
+                             digest=digest or use_cache)
+    except OSError:
+        """ Unreadable files are reported by from_file """
+        return filename, ValidationResult.from_parse(*PywrNetwork.from_file(filename, **options)), False
+
+    key = None
+    if use_cache:
+        key = cache.key(source.sha256, **options)
+        if (result := cache.get(key)) is not None:
+            source.release()
+            result.source = source
+            return filename, result, True
+
+    result = ValidationResult.from_parse(*PywrNetwork.from_file(source, **options), source=source)
+    if key is not None:
+        cache.put(key, result)
+
+    return filename, result, False
+
+
+def chunk_size(num_files, jobs):
+    """
+    Returns the number of files sent to a worker at once, such that each
+    worker receives several chunks so that work remains balanced between them.
+    """
+    return max(1, min(MAX_CHUNK_SIZE, num_files // (jobs * 4)))
+
+
+def map_files(func, filenames, jobs=None):
+    """
+    Applies `func` to each of `filenames` across a pool of `jobs` worker
+    processes, yielding results in the order of `filenames` as each
+    becomes available.  If `jobs` is None, one process per CPU is used.  If
+    `jobs` is 1, or only one file is given, `func` is applied in the calling
+    process.
+    """
+    filenames = list(filenames)
+    jobs = int(jobs) if jobs else os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"Invalid number of jobs: {jobs}")
+
+    if jobs == 1 or len(filenames) <= 1:
+        yield from map(func, filenames)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = min(jobs, len(filenames))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(func, filenames,
+                                chunksize=chunk_size(len(filenames), jobs))
+
+
+def check_options(options):
+    """
+    Raises:
+        ValueError: If the :meth:`PywrNetwork.from_file` `options` give a list
+            of rulesets, whose results are not those of a single validation
+    """
+    if isinstance(options.get("ruleset"), (list, tuple)):
+        raise ValueError("Files are validated against a single ruleset: validate each file"
+                         " with PywrNetwork.from_file to apply several rulesets")
+
+
+def validate_files(filenames, jobs=None, **options):
+    """
+    Validates each of `filenames`, yielding results in the order of
+    `filenames` as each becomes available.
+
+    Args:
+        filenames (Iterable[str]): The files to be validated
+        jobs (int): The number of worker processes. If None, one process per
+            CPU is used. If 1, or only one file is given, files are validated
+            in the calling process.
+        options: Keyword arguments passed to :meth:`PywrNetwork.from_file`
+
+    Returns:
+        results (Iterator[Tuple[str, PywrNetwork, Dict, Dict]]): The `filename`,
+            `network`, `errors` and `warnings` of each file
+
+    Raises:
+        ValueError: If `options` give a list of rulesets
+    """
+    check_options(options)
+    return map_files(partial(validate_file, options=options), filenames, jobs)
+
+
+def summarise_files(filenames, jobs=None, cache=None, digest=True, **options):
+    """
+    As :func:`validate_files`, but yields the `(filename, result, cached)`
+    tuple of :func:`summarise_file` for each file, such that networks are not
+    transferred between processes.
+
+    Raises:
+        ValueError: If `options` give a list of rulesets
+    """
+    check_options(options)
+    summarise = partial(summarise_file, options=options, cache=cache, digest=digest)
+    return map_files(summarise, filenames, jobs)
@@ -0,0 +1,211 @@
+"""
+A persistent on-disk cache of validation results.
+
+Results are keyed by the digest of the network file, the key and version of
+the ruleset applied, the options which affect validation, and the version of
+pywrparser, so that the result of an unchanged network is reused only where
+validating it again would give the same result.
+
+Entries are pickled, so a cache directory should be writable only by
+trusted users.
+"""
+import hashlib
+import json
+import os
+
+from pywrparser import (
+    rules,
+    __version__
+)
+
+""" Default bound on the total size of a cache directory """
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+""" Options of :meth:`PywrNetwork.from_file` which affect the result of validation """
+RESULT_OPTIONS = (
+    "raise_on_parser_error",
+    "raise_on_parser_warning",
+    "ignore_warnings",
+    "allow_duplicate_edges",
+    "max_errors",
+    "max_warnings",
+    "select",
+    "ignore",
+    "level"
+)
+
+ENTRY_SUFFIX = ".pickle"
+
+
+def file_digest(path):
+    """
+    Returns the sha256 digest of the file at `path`, or None if it cannot be read
+    """
+    from pywrparser.utils import sha256digest
+    try:
+        return sha256digest(path)
+    except OSError:
+        return None
+
+
+class ResultCache():
+    """
+    A directory of validation results, of which the least recently used are
+    evicted once the total size of the directory exceeds `max_size` bytes.
+
+    The size of the directory is measured when the cache is first written, and
+    thereafter estimated from the entries written by this instance, so the bound
+    may be exceeded by the entries of concurrent processes until each evicts.
+    """
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """
+        Args:
+            directory (str): The directory in which results are stored. This
+                is created if it does not exist.
+            max_size (int): The maximum total size in bytes of stored results
+        """
+        self.directory = os.fspath(directory)
+        self.max_size = int(max_size)
+        self._size = None
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.directory}, {self.max_size})"
+
+    def key(self, digest, ruleset=None, **options):
+        """
+        Returns the key of the result of validating a file with the sha256
+        `digest` against `ruleset`, with the given `from_file` `options`.
+        Options which do not affect the result are disregarded, and any
+        rule files are identified by their content.
+        """
+        ruleset_version = None
+        if ruleset:
+            ruleset = rules.get_ruleset(ruleset)
+            ruleset, ruleset_version = ruleset.key, ruleset.version
+
+        components = {
+            "digest": digest,
+            "ruleset": ruleset,
+            "ruleset_version": ruleset_version,
+            "rule_files": [file_digest(path) for path in options.get("rule_files") or ()],
+            "options": {option: options.get(option) for option in RESULT_OPTIONS},
+            "version": __version__
+        }
+        return hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """
+        Returns:
+            result: The result stored for `key`, or None if there is no such
+                result or it cannot be read
+        """
+        import pickle
+
+        path = self.path(key)
+        try:
+            with open(path, "rb") as fp:
+                result = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            """ A corrupt or incompatible entry """
+            self.remove(path)
+            return None
+
+        try:
+            """ Mark as recently used """
+            os.utime(path)
+        except OSError:
+            pass
+
+        return result
+
+    def put(self, key, result):
+        """
+        Stores `result` for `key`, then evicts entries if the cache is over size.
+        Failure to write the cache is not an error.  The temporary file to which
+        the entry is written is removed if the entry is not stored, whatever
+        the reason.
+        """
+        import pickle
+        import tempfile
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump(result, fp, protocol=pickle.HIGHEST_PROTOCOL)
+                size = fp.tell()
+            os.replace(tmp_path, self.path(key))
+        except BaseException as err:
+            self.remove(tmp_path)
+            if isinstance(err, OSError):
+                return
+            raise
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += size
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def entries(self):
+        """
+        Returns:
+            entries (List[Tuple[float, int, str]]): The last use time, size and
+                path of each entry in the cache, least recently used first
+        """
+        entries = []
+        try:
+            scan = os.scandir(self.directory)
+        except OSError:
+            return entries
+
+        with scan:
+            for entry in scan:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is within its
+        maximum size.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self.remove(path)
+            total -= size
+        self._size = total
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.remove(path)
+        self._size = 0
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
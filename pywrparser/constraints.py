@@ -0,0 +1,342 @@
+"""
+Numeric constraints upon the values of components, evaluated in bulk.
+
+A rule tests the data of a single component as that component is created.
+A :class:`Constraint` instead relates the numeric values of attributes, such
+as the ``initial_volume`` and ``max_volume`` of a storage node, and is
+evaluated across every valid component of a section at once: the values of
+each attribute are gathered from all components to which the constraint
+applies, and the constraint is a single expression over the resulting
+arrays.  Arrays are NumPy arrays where NumPy is installed, and otherwise the
+expression is evaluated for the values of each component in turn.
+
+A value is numeric if it is a number, an inline constant parameter, or the
+name of a constant parameter of the network.  A component is not tested by
+a constraint if any of its values is absent or not numeric, for example if
+it refers to a time-varying parameter.
+
+Constraints are declared by the ``constraints`` attribute of the component
+types and are named as rules and warnings, such that a constraint whose name
+begins ``rule_`` reports an error and one whose name begins ``warn_`` reports
+a warning.  Constraints may therefore be added by rulesets, and selected,
+ignored and suppressed for individual components, exactly as other rules.
+"""
+import functools
+import inspect
+import math
+
+from pywrparser.types.findings import (
+    PywrErrorFinding,
+    PywrWarningFinding
+)
+from pywrparser.utils import match_types
+
+""" The values of the 'type' of a constant parameter """
+CONSTANT_TYPES = match_types("constantparameter")
+
+""" The types of the numbers decoded from JSON """
+NUMBER_TYPES = frozenset((int, float))
+
+
+def min_values(values):
+    return min(values)
+
+
+def min_array(block, np):
+    return block.min(axis=1)
+
+
+def max_values(values):
+    return max(values)
+
+
+def max_array(block, np):
+    return block.max(axis=1)
+
+
+def rise_values(values):
+    return max((b - a for a, b in zip(values, values[1:])), default=-math.inf)
+
+
+def rise_array(block, np):
+    if block.shape[1] < 2:
+        return np.full(block.shape[0], -np.inf)
+    return np.diff(block, axis=1).max(axis=1)
+
+
+"""
+Reductions of the values of list attributes to one value for each component,
+as functions of a list of values and of a 2-D array with a row of values
+for each component
+"""
+REDUCTIONS = {
+    "min": (min_values, min_array),
+    "max": (max_values, max_array),
+    "rise": (rise_values, rise_array)
+}
+
+
+@functools.lru_cache(maxsize=None)
+def array_module():
+    """
+    Returns:
+        module: The :mod:`numpy` module, or None if NumPy is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def numeric_value(value, constants):
+    """
+    Returns:
+        value (float): The numeric value of the attribute value `value`, given
+            the `constants` of the network, or None if it is not numeric
+    """
+    if is_number(value):
+        return value
+    if isinstance(value, str):
+        return constants.get(value)
+    if (isinstance(value, dict) and str(value.get("type")).lower() in CONSTANT_TYPES
+            and is_number(constant := value.get("value"))):
+        return constant
+    return None
+
+
+def constant_values(parameters):
+    """
+    Returns:
+        constants (Dict[str, float]): The value of each of the `parameters`,
+            a mapping of name to :class:`PywrParameter`, which is a constant
+            parameter with a numeric value
+    """
+    constants = {}
+    for name, param in parameters.items():
+        if str(param.type).lower() in CONSTANT_TYPES and is_number(value := param.data.get("value")):
+            constants[name] = value
+    return constants
+
+
+class Constraint():
+    """
+    A relation between the numeric values of attributes which must hold for
+    each component to which it applies.
+    """
+    __slots__ = ("name", "columns", "test", "message", "typename", "fuzzy", "exact")
+
+    def __init__(self, name, columns, test, message, typename=None, fuzzy=False):
+        """
+        Args:
+            name (str): The name of the constraint, beginning ``rule_`` if
+                a violation is an error or ``warn_`` if it is a warning
+            columns (Iterable[str | Tuple[str, str]]): The attributes whose
+                values are tested, each either the name of a numeric attribute
+                or an `(attribute, reduction)` pair for an attribute whose value
+                is a list of numbers, where `reduction` is a key of
+                :const:`REDUCTIONS`
+            test (Callable): Returns whether the constraint holds, given the
+                values of each column as an argument. Tests are applied both to
+                arrays and to numbers, so may use only arithmetic, comparisons,
+                and ``&``, ``|`` and ``~`` to combine comparisons.
+            message (str): The description of a violation, formatted with the
+                `name` and `type` of the component and the values of each column
+                by position
+            typename (str): The component type to which the constraint applies,
+                as for :func:`match`, or None if it applies to all components
+            fuzzy (bool): As for :func:`match`
+
+        Raises:
+            ValueError: If the name or a reduction is invalid
+        """
+        if not name.startswith(("rule_", "warn_")):
+            raise ValueError(f"Constraint name must begin 'rule_' or 'warn_': {name}")
+        self.name = name
+        self.columns = tuple((column, None) if isinstance(column, str) else tuple(column)
+                             for column in columns)
+        for attr, reduction in self.columns:
+            if reduction is not None and reduction not in REDUCTIONS:
+                raise ValueError(f"Invalid reduction of '{attr}' in {name}: {reduction}")
+        self.test = test
+        self.message = message
+        self.typename = typename.lower() if typename is not None else None
+        self.fuzzy = fuzzy
+        self.exact = match_types(typename) if typename is not None else ()
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.name!r})"
+
+    @property
+    def finding_type(self):
+        return PywrErrorFinding if self.name.startswith("rule_") else PywrWarningFinding
+
+    def applies(self, dtype):
+        """
+        Returns:
+            bool: Whether the constraint applies to components of type `dtype`
+        """
+        if self.typename is None:
+            return True
+        if not isinstance(dtype, str):
+            return False
+        if self.fuzzy:
+            return self.typename in dtype.lower()
+        return dtype.lower() in self.exact
+
+    def rows(self, types, values):
+        """
+        Selects the components to which the constraint applies and whose
+        values are all numeric.
+
+        Args:
+            types (List[str]): The type of each component, as from :func:`gather`
+            values (Dict[Tuple[str, str], List]): The values of each column for
+                each component, as from :func:`gather`
+
+        Returns:
+            (indices, columns): The index of each component selected, and a
+                list of the values of each column for those components
+        """
+        if self.typename is None:
+            indices = range(len(types))
+        else:
+            matched = {dtype for dtype in set(types) if dtype is not None and self.applies(dtype)}
+            indices = [idx for idx, dtype in enumerate(types) if dtype in matched]
+
+        columns = [values[column] for column in self.columns]
+        for column in columns:
+            indices = [idx for idx in indices if column[idx] is not None]
+        return indices, [[column[idx] for idx in indices] for column in columns]
+
+    def violations(self, columns, np=None):
+        """
+        Evaluates the constraint for the gathered `columns`.
+
+        Args:
+            columns (List[List]): The values of each column, as from :meth:`rows`
+            np (module): The :mod:`numpy` module, with which the constraint is
+                evaluated as a whole, or None to evaluate each row in turn
+
+        Returns:
+            violations (List[Tuple[int, Tuple[float]]]): The position among the
+                gathered rows of each row for which the constraint does not hold,
+                with the values of its columns
+        """
+        reduced = []
+        for (attr, reduction), values in zip(self.columns, columns):
+            if reduction is None:
+                reduced.append(values if np is None else np.asarray(values, dtype=float))
+            elif np is None:
+                reduced.append([REDUCTIONS[reduction][0](row) for row in values])
+            else:
+                reduced.append(reduce_rows(values, REDUCTIONS[reduction][1], np))
+
+        if np is None:
+            return [(pos, row) for pos, row in enumerate(zip(*reduced)) if not self.test(*row)]
+
+        holds = np.asarray(self.test(*reduced), dtype=bool)
+        return [(pos, tuple(float(column[pos]) for column in reduced))
+                for pos in np.flatnonzero(~holds).tolist()]
+
+
+def column_value(value, reduction, constants):
+    """
+    Returns:
+        value: The numeric value of the attribute value `value` for a column
+            with `reduction`, either a number or a list of numbers, or None if
+            it is not numeric
+    """
+    if reduction is None:
+        return value if type(value) in NUMBER_TYPES else numeric_value(value, constants)
+    if not isinstance(value, list) or not value:
+        return None
+    """ Lists are most often of numbers alone, which are taken unchanged """
+    if set(map(type, value)) <= NUMBER_TYPES:
+        return value
+    value = [numeric_value(v, constants) for v in value]
+    return None if None in value else value
+
+
+def gather(components, columns, constants):
+    """
+    Gathers the type of each of `components` and the value of each of
+    `columns`, as for :class:`Constraint`, in a single pass.
+
+    Returns:
+        (types, values): The type of each component, or None if it is not a
+            str, and a list of the value of each column for each component,
+            by column, with None where a value is absent or not numeric
+    """
+    types = []
+    values = {column: [] for column in columns}
+    appenders = [(attr, reduction, values[(attr, reduction)].append) for attr, reduction in values]
+    for inst in components:
+        dtype = inst.type
+        types.append(dtype if isinstance(dtype, str) else None)
+        data = inst.data
+        for attr, reduction, append in appenders:
+            append(column_value(data.get(attr), reduction, constants))
+    return types, values
+
+
+def reduce_rows(rows, reduce, np):
+    """
+    Returns:
+        array: The result of `reduce` for each of the lists of numbers `rows`,
+            which are stacked into a 2-D array for each distinct length
+    """
+    by_length = {}
+    for pos, row in enumerate(rows):
+        by_length.setdefault(len(row), []).append(pos)
+
+    reduced = np.empty(len(rows))
+    for positions in by_length.values():
+        reduced[positions] = reduce(np.asarray([rows[pos] for pos in positions], dtype=float), np)
+    return reduced
+
+
+def constraint_findings(constraints, components, constants=None, use_numpy=None):
+    """
+    Evaluates `constraints` across `components` in bulk.
+
+    Args:
+        constraints (Iterable[Constraint]): The constraints evaluated
+        components (Sequence[PywrType]): The valid components of a section
+        constants (Dict[str, float]): The value of each constant parameter of
+            the network, by name, as from :func:`constant_values`
+        use_numpy (bool): Whether constraints are evaluated with NumPy. If None,
+            NumPy is used where it is installed.
+
+    Returns:
+        findings (Dict[int, List[PywrValidationFinding]]): The findings of each
+            component which violates a constraint, by index in `components`,
+            with the findings of each component in the name order of their
+            constraints
+    """
+    np = array_module() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+    constants = constants or {}
+
+    constraints = sorted(constraints, key=lambda constraint: constraint.name)
+    types, values = gather(components, {column for constraint in constraints
+                                        for column in constraint.columns}, constants)
+    findings = {}
+    for constraint in constraints:
+        indices, columns = constraint.rows(types, values)
+        if not indices:
+            continue
+        for pos, row in constraint.violations(columns, np):
+            inst = components[indices[pos]]
+            message = constraint.message.format(*row, name=getattr(inst, "name", None),
+                                                type=inst.type)
+            value_text = inspect.getattr_static(type(inst), "data").trim_value(inst.data)
+            finding = constraint.finding_type(type(inst).__qualname__, constraint.name,
+                                              message, value_text)
+            findings.setdefault(indices[pos], []).append(finding)
+    return findings
@@ -1,21 +1,53 @@
 import datetime
-import io
-import json
 import os
 
-from rich.align import Align
-from rich.console import Console
-from rich.padding import Padding
-from rich.panel import Panel
+from pywrparser.source import source_name
 
-
-console = Console()
+""" The rich Console, created on first use so that rich is imported only when required """
+_console = None
+_console_options = {}
 
 WARN_EMOJI = ":yellow_circle:"
 RULE_EMOJI = ":red_circle:"
 
 
+def get_console():
+    """
+    Returns the rich Console to which reports are written, creating it on first use.
+    The module attribute `console` is equivalent.
+    """
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console(**_console_options)
+    return _console
+
+
+def set_console_options(**options):
+    """
+    Sets attributes of the Console, such as `no_color`, without creating it
+    if it has not yet been used.
+    """
+    _console_options.update(options)
+    if _console is not None:
+        for option, value in options.items():
+            setattr(_console, option, value)
+
+
+def __getattr__(name):
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def write_results(filename, errors, warnings, use_emoji=True):
+    from rich.align import Align
+    from rich.padding import Padding
+    from rich.panel import Panel
+    from pywrparser.types.findings import PywrWarningFinding
+
+    console = get_console()
+    filename = source_name(filename)
     error_total, warning_total = count_errors_warnings(errors, warnings)
     all = coalesce_errors_and_warnings(errors, warnings)
 
@@ -33,7 +65,7 @@ def write_results(filename, errors, warnings, use_emoji=True):
         console.rule("[bold green]Network", style="blue")
         console.print()
     for eow in net_all:
-        if isinstance(eow, Warning):
+        if isinstance(eow, (Warning, PywrWarningFinding)):
             prefix = WARN_EMOJI if use_emoji else "[WARNING]"
             row = "warning"
         else:
@@ -49,7 +81,7 @@ def write_results(filename, errors, warnings, use_emoji=True):
         console.print()
 
         for eow in eows:
-            if isinstance(eow, Warning):
+            if isinstance(eow, (Warning, PywrWarningFinding)):
                 prefix = WARN_EMOJI if use_emoji else eow.desc_text
                 row = eow.warning
             else:
@@ -68,6 +100,32 @@ def write_results(filename, errors, warnings, use_emoji=True):
     console.rule(style="blue")
 
 
+def write_rule_profile(profile, limit=None):
+    """
+    Writes a table of the rules of a :class:`pywrparser.utils.RuleProfile`,
+    the slowest first, to stderr.
+
+    Args:
+        limit (int): The number of rules shown, or None for all
+    """
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    rows = profile.rows()
+    table = Table(title=f"Rule profile: {sum(profile.components.values())} components",
+                  title_style="bold green", header_style="bold blue", box=box.SIMPLE_HEAD)
+    table.add_column("Rule", overflow="fold")
+    for column in ("Calls", "Failed", "Skipped", "ms", "µs/call"):
+        table.add_column(column, justify="right", no_wrap=True, min_width=len(column))
+    for row in rows[:limit]:
+        table.add_row(f"{row['class']}.{row['rule']}",
+                      *(str(row[key]) for key in ("calls", "failed", "skipped")),
+                      f"{row['time'] * 1e3:.3f}", f"{row['mean'] * 1e6:.2f}")
+
+    Console(stderr=True, **_console_options).print(table)
+
+
 def coalesce_errors_and_warnings(errors, warnings):
     warnings = warnings if warnings else {}
     all = errors.copy() if errors else {}
@@ -93,15 +151,27 @@ def count_errors_warnings(errors, warnings):
     return error_total, warning_total
 
 
-def results_as_dict(filename, errors, warnings, include_digest=True):
+def results_as_dict(filename, errors, warnings, include_digest=True, source=None,
+                    ruleset=None):
+    """
+    Returns a dict describing the results of parsing `filename`.
+
+    Args:
+        source (Source): If present, a :class:`pywrparser.source.Source` from which
+            the file was read, whose size, read time and digest are reported
+            without reading the file again
+        ruleset (str | Ruleset): The key of the ruleset applied, or a
+            :class:`pywrparser.rules.Ruleset`. If None, the ruleset set by
+            :func:`pywrparser.rules.set_active_ruleset` is reported, if any.
+    """
     error_total, warning_total = count_errors_warnings(errors, warnings)
 
-    if isinstance(filename, io.StringIO):
-        filename = "stdin"
+    filename = source_name(source if source is not None else filename)
     fbasename = os.path.basename(filename)
     from pywrparser import rules
-    ruleset = rules.get_ruleset_module(rules.ACTIVE_RULESET_KEY)
-    ruleset_name = ruleset.__ruleset_name__ if ruleset else "Default"
+    if ruleset is None and rules.ACTIVE_RULESET_KEY:
+        ruleset = rules.ACTIVE_RULESET_KEY
+    ruleset_name = rules.get_ruleset(ruleset).name if ruleset else "Default"
 
     ret = {
         "parse_results": {
@@ -114,9 +184,27 @@ def results_as_dict(filename, errors, warnings, include_digest=True):
     }
 
     if include_digest:
-        from pywrparser.utils import sha256digest
-        fdigest = sha256digest(filename)
-        ret["parse_results"]["file"]["sha256"] = fdigest
+        fdigest = None
+        if source is not None and source.sha256:
+            fdigest = source.sha256
+        else:
+            from pywrparser.utils import sha256digest
+            try:
+                fdigest = sha256digest(filename)
+            except OSError:
+                """ An unreadable file is reported without a digest """
+                pass
+        if fdigest is not None:
+            ret["parse_results"]["file"]["sha256"] = fdigest
+
+    if source is not None:
+        ret["parse_results"]["file"]["size"] = source.size
+        ret["parse_results"]["file"]["read_time"] = source.read_time
+        if source.compression:
+            ret["parse_results"]["file"]["compression"] = source.compression
+            ret["parse_results"]["file"]["content_size"] = source.content_size
+            if include_digest:
+                ret["parse_results"]["file"]["content_sha256"] = source.content_sha256
 
     if errors:
         component_errs = {}
@@ -132,5 +220,9 @@ def results_as_dict(filename, errors, warnings, include_digest=True):
     return ret
 
 
-def results_as_json(filename, errors, warnings, include_digest=True, indent=0):
-    return json.dumps(results_as_dict(filename, errors, warnings, include_digest), indent=indent)
+def results_as_json(filename, errors, warnings, include_digest=True, indent=0,
+                    json_backend=None, source=None, ruleset=None):
+    from pywrparser.jsonbackend import get_backend
+    results = results_as_dict(filename, errors, warnings, include_digest, source=source,
+                              ruleset=ruleset)
+    return get_backend(json_backend).dumps(results, indent=indent)
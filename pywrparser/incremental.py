@@ -0,0 +1,551 @@
+"""
+Incremental revalidation of a network as it is edited.
+
+An :class:`IncrementalValidator` validates a network once, then applies
+edits given as a JSON Patch (RFC 6902) or as replaced components, and
+revalidates only the components which each edit touches, together with the
+network-level checks of duplicate node and scenario names and duplicate
+edges.  The cost of each edit is therefore proportional to the size of the
+edit, rather than to the size of the network.
+
+For example::
+
+    validator = IncrementalValidator(json_src, ruleset="strict")
+    errors, warnings = validator.apply_patch([
+        {"op": "replace", "path": "/nodes/12/max_volume", "value": 250},
+        {"op": "remove", "path": "/parameters/old_demand"}
+    ])
+"""
+import copy
+
+from collections import Counter
+
+from pywrparser.parsers import PywrJSONParser
+from pywrparser.parsers.duplicates import DuplicateKey
+from pywrparser.parsers.pywrjsonparser import (
+    NAMED_SECTIONS,
+    REQUIRED_SECTIONS,
+    VALIDATION_ORDER,
+    check_component,
+    component_name,
+    suppression_name
+)
+from pywrparser.selection import (
+    SUPPRESSIBLE_SECTIONS,
+    component_type,
+    metadata_suppressions
+)
+from pywrparser.types.exceptions import (
+    PywrNetworkValidationError,
+    PywrParserException
+)
+
+""" Sections comprising a single component """
+SINGLE_SECTIONS = ("metadata", "timestepper")
+
+""" Sections whose components are held in a list, by position """
+LIST_SECTIONS = ("scenarios", "scenario_combinations", "nodes", "edges")
+
+""" Sections in which components must have distinct names """
+NAME_SECTIONS = ("scenarios", "nodes")
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+def parse_pointer(pointer):
+    """
+    Returns:
+        tokens (List[str]): The reference tokens of the JSON Pointer (RFC 6901)
+            `pointer`, which are empty for the whole document
+    """
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise PywrParserException(f"Invalid JSON Pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def format_pointer(tokens):
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def list_index(array, token, allow_end=False):
+    """
+    Returns the index of `array` denoted by the reference token `token`.
+    If `allow_end`, the index may be that following the last member, which
+    is also denoted by "-".
+    """
+    if allow_end and token == "-":
+        return len(array)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise PywrParserException(f"Invalid array index: {token}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise PywrParserException(f"Array index out of range: {token}")
+    return index
+
+
+def resolve_pointer(document, tokens):
+    """
+    Returns:
+        value: The value within `document` denoted by `tokens`
+
+    Raises:
+        PywrParserException: If there is no such value
+    """
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise PywrParserException(f"No such member: {format_pointer(tokens)}")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[list_index(value, token)]
+        else:
+            raise PywrParserException(f"No such member: {format_pointer(tokens)}")
+    return value
+
+
+def apply_operation(document, tokens, op, value=None):
+    """
+    Applies the JSON Patch `add`, `remove` or `replace` operation `op` to the
+    member of `document` denoted by the non-empty `tokens`, in place.
+    """
+    parent = resolve_pointer(document, tokens[:-1])
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if op != "add" and token not in parent:
+            raise PywrParserException(f"No such member: {format_pointer(tokens)}")
+        if op == "remove":
+            del parent[token]
+        else:
+            parent[token] = value
+    elif isinstance(parent, list):
+        if op == "add":
+            parent.insert(list_index(parent, token, allow_end=True), value)
+        elif op == "remove":
+            del parent[list_index(parent, token)]
+        else:
+            parent[list_index(parent, token)] = value
+    else:
+        raise PywrParserException(f"No such member: {format_pointer(tokens[:-1])}")
+
+
+class IncrementalValidator():
+    """
+    A network document and the errors and warnings of each of its components,
+    which are revalidated individually as the document is edited.
+
+    Network errors describing duplicate keys of the original document, such
+    as a parameter defined twice, are reported until the whole document is
+    replaced, as the edited document is a decoded JSON value which cannot
+    contain them.  Budgets and worker processes are not applied.
+
+    Attributes:
+        src (dict): The current decoded document, which is edited in place
+        ruleset (Ruleset): The ruleset applied
+    """
+    def __init__(self, json_src, ruleset=None, json_backend=None, rule_files=None,
+                 allow_duplicate_edges=True, ignore_warnings=False, select=None, ignore=None):
+        """
+        Validates the network `json_src`, recording the errors and warnings of
+        each component.
+
+        Args:
+            json_src (str | bytes | bytearray | memoryview | mmap.mmap): A JSON
+                encoded representation of a Pywr network
+            ruleset (str | Ruleset): The key of a ruleset whose rules are to be
+                applied, or a :class:`pywrparser.rules.Ruleset`
+            json_backend (str): The name of the JSON backend used to decode `json_src`
+            rule_files (Iterable[str]): Paths of TOML or JSON rule files whose
+                rules are applied in addition to those of `ruleset`
+            allow_duplicate_edges (bool): Specifies whether duplicate edges are
+                considered as errors or are permitted in a valid network
+            ignore_warnings (bool): Specifies whether warnings are discarded
+            select (Iterable[str]): Glob patterns of the names of the rules and
+                warnings applied. If None, all are applied.
+            ignore (Iterable[str]): Glob patterns of the names of rules and
+                warnings which are not applied
+
+        Raises:
+            PywrParserException: If `json_src` is not a valid JSON document, or
+                the ruleset or a rule file is invalid
+        """
+        parser = PywrJSONParser(json_src, ruleset, json_backend=json_backend,
+                                rule_files=rule_files, select=select, ignore=ignore)
+        self.ruleset = parser.ruleset
+        self.types = parser.types
+        self.allow_duplicate_edges = allow_duplicate_edges
+        self.ignore_warnings = ignore_warnings
+        self.key_duplicates = [duplicate for duplicate in parser.duplicates
+                               if duplicate.section not in NAME_SECTIONS]
+        self.reset(parser.src)
+
+
+    def reset(self, src):
+        """
+        Validates every component of the document `src`, which replaces the
+        current document.
+        """
+        self.src = src
+        """ (errors, warnings) of each component with either, by section and key """
+        self.outcomes = {section: {} for section in VALIDATION_ORDER}
+        """ Occurrences of each name, and the names occurring more than once """
+        self.names = {section: Counter() for section in NAME_SECTIONS}
+        self.repeated = {section: {} for section in NAME_SECTIONS}
+        """ Occurrences of each valid edge, and the edges occurring more than once """
+        self.edges = Counter()
+        self.repeated_edges = {}
+        """ The order of the components of each named section, as in `src` """
+        self.positions = {section: {} for section in NAMED_SECTIONS}
+        self.next_position = 0
+        """ The rules suppressed for individual components by the metadata """
+        self.suppressions = {}
+        self.suppression_error = None
+        self.update_suppressions(recheck=False)
+
+        for section in VALIDATION_ORDER:
+            self.check_section(section)
+
+
+    def check_section(self, section):
+        """
+        Validates every component of `section` again.
+        """
+        self.outcomes[section].clear()
+        if section in NAME_SECTIONS:
+            self.names[section].clear()
+            self.repeated[section].clear()
+        elif section == "edges":
+            self.edges.clear()
+            self.repeated_edges.clear()
+
+        components = self.src.get(section)
+        if section in SINGLE_SECTIONS:
+            if section in self.src:
+                self.check(section, None)
+        elif section in LIST_SECTIONS:
+            if isinstance(components, list):
+                for index in range(len(components)):
+                    self.check(section, index)
+        else:
+            positions = self.positions[section]
+            positions.clear()
+            if isinstance(components, dict):
+                for name in components:
+                    positions[name] = self.next_position
+                    self.next_position += 1
+                    self.check(section, name)
+
+        if section == "metadata" and section not in self.src:
+            self.update_suppressions()
+
+
+    def update_suppressions(self, recheck=True):
+        """
+        Reads the rules suppressed for individual components from the metadata
+        and, if `recheck`, validates again each section whose suppressions
+        have changed.
+        """
+        previous = self.suppressions
+        try:
+            self.suppressions = metadata_suppressions(self.src.get("metadata"))
+            self.suppression_error = None
+        except ValueError as err:
+            self.suppressions = {}
+            self.suppression_error = PywrNetworkValidationError(f"Invalid rule suppressions: {err}")
+
+        if recheck:
+            for section in SUPPRESSIBLE_SECTIONS:
+                if previous.get(section) != self.suppressions.get(section):
+                    self.check_section(section)
+
+
+    def check(self, section, key):
+        """
+        Validates the component of `section` at `key`, which is None for
+        sections comprising a single component, and records its outcome.
+        """
+        data = self.src[section] if key is None else self.src[section][key]
+        name = key if section in NAMED_SECTIONS else None
+        ctype = component_type(self.types, self.suppressions, section,
+                               suppression_name(section, data, name))
+        if (outcome := check_component(ctype, data, name)) is not None:
+            errors, warnings = outcome
+            if errors or (warnings and not self.ignore_warnings):
+                self.outcomes[section][key] = (errors or [], [] if self.ignore_warnings else warnings or [])
+        self.count(section, key, 1)
+        if section == "metadata":
+            self.update_suppressions()
+
+
+    def forget(self, section, key):
+        """
+        Discards the outcome of the component of `section` at `key`.
+        """
+        self.count(section, key, -1)
+        self.outcomes[section].pop(key, None)
+
+
+    def count(self, section, key, increment):
+        """
+        Adds `increment` to the occurrences of the name of the component of
+        `section` at `key`, or of the edge at `key` if it is valid.
+        """
+        if section in NAME_SECTIONS:
+            counter, repeated = self.names[section], self.repeated[section]
+            if (name := component_name(self.src[section][key])) is None:
+                return
+        elif section == "edges" and not self.outcomes["edges"].get(key, ((),))[0]:
+            counter, repeated = self.edges, self.repeated_edges
+            name = tuple(str(vertex) for vertex in self.src["edges"][key])
+        else:
+            return
+
+        counter[name] += increment
+        if counter[name] > 1:
+            repeated.setdefault(name, None)
+        else:
+            repeated.pop(name, None)
+            if counter[name] == 0:
+                del counter[name]
+
+
+    def shift(self, section, start, offset):
+        """
+        Moves the outcomes of the components of the list `section` from index
+        `start` onwards by `offset`, following an insertion or removal.
+        """
+        self.outcomes[section] = {index + offset if index >= start else index: outcome
+                                  for index, outcome in self.outcomes[section].items()}
+
+
+    def apply_patch(self, patch):
+        """
+        Applies the JSON Patch `patch` to the document and revalidates the
+        components which it changes.
+
+        The operations of the patch are applied in order.  Should an operation
+        fail, those preceding it remain applied, and the outcomes of their
+        components remain current.
+
+        Args:
+            patch (List[Dict]): A JSON Patch (RFC 6902)
+
+        Returns:
+            errors, warnings (Tuple[Dict, Dict]): As :attr:`errors` and :attr:`warnings`
+
+        Raises:
+            PywrParserException: If an operation of `patch` is invalid or fails
+        """
+        if not isinstance(patch, list):
+            raise PywrParserException("A JSON Patch must be an array of operations")
+        for operation in patch:
+            self.apply_operation(operation)
+
+        return self.errors, self.warnings
+
+
+    def apply_operation(self, operation):
+        """
+        Applies the single JSON Patch `operation` to the document.
+        """
+        if not isinstance(operation, dict) or operation.get("op") not in PATCH_OPERATIONS:
+            raise PywrParserException(f"Invalid JSON Patch operation: {operation!r}")
+        op = operation["op"]
+        try:
+            tokens = parse_pointer(operation["path"])
+            if op in ("add", "replace", "test"):
+                value = operation["value"]
+            if op in ("move", "copy"):
+                source = parse_pointer(operation["from"])
+        except KeyError as err:
+            raise PywrParserException(f"JSON Patch {op} operation requires {err}") from None
+
+        if op == "test":
+            if resolve_pointer(self.src, tokens) != value:
+                raise PywrParserException(f"JSON Patch test failed at: {operation['path']}")
+        elif op == "copy":
+            self.edit(tokens, "add", copy.deepcopy(resolve_pointer(self.src, source)))
+        elif op == "move":
+            if len(tokens) > len(source) and tokens[:len(source)] == source:
+                raise PywrParserException(f"Cannot move {operation['from']} into itself")
+            value = resolve_pointer(self.src, source)
+            self.edit(source, "remove")
+            self.edit(tokens, "add", value)
+        else:
+            self.edit(tokens, op, value if op != "remove" else None)
+
+
+    def edit(self, tokens, op, value=None):
+        """
+        Applies the `add`, `remove` or `replace` operation `op` at `tokens`,
+        revalidating the component, or for operations on a whole section the
+        section, which contains the edited value.
+        """
+        if not tokens:
+            if op == "remove" or not isinstance(value, dict):
+                raise PywrParserException("A network document must be an object")
+            self.key_duplicates = []
+            self.reset(value)
+            return
+
+        section = tokens[0]
+        components = self.src.get(section)
+        if (section not in VALIDATION_ORDER or len(tokens) == 1
+                or not isinstance(components, (dict, list))):
+            apply_operation(self.src, tokens, op, value)
+            if section in VALIDATION_ORDER:
+                self.check_section(section)
+            return
+
+        if section in SINGLE_SECTIONS:
+            key = None
+        elif section in LIST_SECTIONS:
+            if not isinstance(components, list):
+                raise PywrParserException(f"No such member: {format_pointer(tokens)}")
+            key = list_index(components, tokens[1], allow_end=(op == "add" and len(tokens) == 2))
+        else:
+            if not isinstance(components, dict):
+                raise PywrParserException(f"No such member: {format_pointer(tokens)}")
+            key = tokens[1]
+            if not (key in components or (op == "add" and len(tokens) == 2)):
+                raise PywrParserException(f"No such member: {format_pointer(tokens)}")
+
+        if key is not None and len(tokens) == 2 and op == "add" and section in LIST_SECTIONS:
+            apply_operation(self.src, tokens, op, value)
+            self.shift(section, key, 1)
+            self.check(section, key)
+        elif key is not None and len(tokens) == 2 and op == "add" and key not in components:
+            apply_operation(self.src, tokens, op, value)
+            self.positions[section][key] = self.next_position
+            self.next_position += 1
+            self.check(section, key)
+        elif key is not None and len(tokens) == 2 and op == "remove":
+            self.forget(section, key)
+            apply_operation(self.src, tokens, op)
+            if section in LIST_SECTIONS:
+                self.shift(section, key + 1, -1)
+            else:
+                del self.positions[section][key]
+        else:
+            """ The component is replaced or edited within, and is checked even should this fail """
+            self.forget(section, key)
+            try:
+                apply_operation(self.src, tokens, op, value)
+            finally:
+                self.check(section, key)
+
+
+    def update(self, changes):
+        """
+        Replaces or adds each of the components given by `changes`, and
+        revalidates them.
+
+        Args:
+            changes (Iterable[Tuple[str, str | int, Any]]): The section, key and
+                data of each changed component. The key is the name of a
+                component of a section in which components are keyed by name,
+                the index of a component of a list section, where the length
+                of the list appends the component, and None for the metadata
+                and timestepper.
+
+        Returns:
+            errors, warnings (Tuple[Dict, Dict]): As :attr:`errors` and :attr:`warnings`
+        """
+        patch = []
+        for section, key, data in changes:
+            components = self.src.get(section)
+            if key is None:
+                patch.append({"op": "add", "path": format_pointer([section]), "value": data})
+            elif isinstance(components, list) and key == len(components):
+                patch.append({"op": "add", "path": format_pointer([section, "-"]), "value": data})
+            else:
+                op = "replace" if isinstance(components, list) else "add"
+                patch.append({"op": op, "path": format_pointer([section, key]), "value": data})
+
+        return self.apply_patch(patch)
+
+
+    def ordered_outcomes(self, section):
+        """
+        Returns:
+            outcomes (List[Tuple[List, List]]): The errors and warnings of each
+                component of `section` with either, in document order
+        """
+        outcomes = self.outcomes[section]
+        if section in NAMED_SECTIONS:
+            positions = self.positions[section]
+            return [outcomes[key] for key in sorted(outcomes, key=positions.__getitem__)]
+        if section in LIST_SECTIONS:
+            return [outcomes[index] for index in sorted(outcomes)]
+        return list(outcomes.values())
+
+
+    @property
+    def network_errors(self):
+        """
+        Returns:
+            errors (List[PywrNetworkValidationError]): The network-level errors
+                of the document
+        """
+        errors = []
+        for duplicate in self.key_duplicates:
+            errors.extend(PywrNetworkValidationError(duplicate.message)
+                          for _ in range(duplicate.count - 1))
+        for section in NAME_SECTIONS:
+            for name in self.repeated[section]:
+                count = self.names[section][name]
+                message = DuplicateKey(section, name, range(count)).message
+                errors.extend(PywrNetworkValidationError(message) for _ in range(count - 1))
+        if self.suppression_error is not None:
+            errors.append(self.suppression_error)
+
+        for section in REQUIRED_SECTIONS:
+            if section not in self.src:
+                errors.append(PywrNetworkValidationError(f"Network contains no {section}"))
+
+        if not self.allow_duplicate_edges:
+            errors.extend(PywrNetworkValidationError(f"Duplicate edge <{edge}>")
+                          for edge in self.repeated_edges)
+
+        return errors
+
+
+    @property
+    def errors(self):
+        """
+        Returns:
+            errors (Dict): The errors of the document by section, as returned
+                by :meth:`PywrNetwork.from_json`, or None if it is valid
+        """
+        errors = {}
+        if network_errors := self.network_errors:
+            errors["network"] = network_errors
+        for section in VALIDATION_ORDER:
+            section_errors = [error for errs, _ in self.ordered_outcomes(section) for error in errs]
+            if section_errors:
+                errors[section] = section_errors
+
+        return errors or None
+
+
+    @property
+    def warnings(self):
+        """
+        Returns:
+            warnings (Dict): The warnings of the document by section, or None
+                if there are none
+        """
+        warnings = {}
+        for section in VALIDATION_ORDER:
+            section_warnings = [warning for _, warns in self.ordered_outcomes(section) for warning in warns]
+            if section_warnings:
+                warnings[section] = section_warnings
+
+        return warnings or None
+
+
+    @property
+    def valid(self):
+        return self.errors is None
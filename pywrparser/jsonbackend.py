@@ -0,0 +1,188 @@
+"""
+Interchangeable implementations of JSON decoding and encoding.
+
+The stdlib :mod:`json` module is always available.  Where an optional faster
+library is installed, it is used in preference unless a backend is named
+explicitly.  Backends differ only in speed: documents which a faster backend
+cannot decode identically to the stdlib module are passed back to the stdlib
+decoder, so that results and error messages do not depend upon the backend.
+"""
+import importlib
+import json
+
+""" Backend names in order of preference when none is specified """
+PREFERENCE = ("orjson", "json")
+
+""" Size of each slice of a buffer counted at once """
+COUNT_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def count_occurrences(src, sub):
+    """
+    Returns the number of occurrences of the str `sub` in `src`, which may
+    be a str or any object supporting the buffer protocol, in which case
+    `sub` is counted as UTF-8.  Buffers are counted in bounded slices rather
+    than copied whole.
+    """
+    if isinstance(src, str):
+        return src.count(sub)
+
+    bsub = sub.encode()
+    if isinstance(src, (bytes, bytearray)):
+        return src.count(bsub)
+
+    count = 0
+    overlap = len(bsub) - 1
+    with memoryview(src) as view:
+        for start in range(0, len(view), COUNT_CHUNK_SIZE):
+            count += view[start:start+COUNT_CHUNK_SIZE+overlap].tobytes().count(bsub)
+    return count
+
+
+class JSONBackend():
+    """
+    Base class for JSON backends.
+
+    Attributes:
+        name (str): The name by which the backend is selected
+        accelerated (bool): Whether the backend is a faster alternative to the
+            stdlib decoder, such that documents should be offered to it first
+    """
+    name = None
+    accelerated = False
+
+    def loads(self, src):
+        raise NotImplementedError
+
+    def dumps(self, obj, indent=None, default=None):
+        raise NotImplementedError
+
+    def has_unique_keys(self, src, decoded):
+        """
+        Returns True if no object in `src` contains a duplicate key, given the
+        result `decoded` of decoding `src` with :meth:`loads`.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}()"
+
+    def __reduce__(self):
+        """ Backends are pickled by name, for use by worker processes """
+        return get_backend, (self.name,)
+
+
+class StdlibBackend(JSONBackend):
+    name = "json"
+
+    def loads(self, src):
+        return json.loads(src)
+
+    def dumps(self, obj, indent=None, default=None):
+        return json.dumps(obj, indent=indent, default=default)
+
+
+class OrjsonBackend(JSONBackend):
+    name = "orjson"
+    accelerated = True
+
+    def __init__(self):
+        self.orjson = importlib.import_module("orjson")
+
+    def loads(self, src):
+        """
+        Decodes `src` directly from a str or any buffer, including memoryview
+        and mmap objects, without an intermediate copy.
+        """
+        if isinstance(src, (str, bytes, bytearray, memoryview)):
+            return self.orjson.loads(src)
+        with memoryview(src) as view:
+            return self.orjson.loads(view)
+
+    def dumps(self, obj, indent=None, default=None):
+        """
+        Encodes `obj`, using the stdlib encoder for indentation other than two
+        spaces, which orjson does not support, and for objects which orjson
+        cannot encode, such as integers beyond 64 bits.  Non-ASCII characters
+        are emitted unescaped.
+        """
+        if indent not in (None, 2):
+            return json.dumps(obj, indent=indent, default=default)
+        option = self.orjson.OPT_INDENT_2 if indent == 2 else 0
+        try:
+            return self.orjson.dumps(obj, default=default, option=option).decode()
+        except self.orjson.JSONEncodeError:
+            return json.dumps(obj, indent=indent, default=default)
+
+    def has_unique_keys(self, src, decoded):
+        """
+        orjson retains only the last of any duplicate keys, so these are
+        detected by comparing the ':' characters in the source with those in a
+        re-encoding of the decoded document.  Each object member contributes one,
+        as does each ':' within a string.  A dropped duplicate member removes at
+        least one from the re-encoding, while escaped colons are counted in the
+        source so that an unequal count can only err towards reporting
+        duplicates, which are then confirmed by the stdlib decoder.
+        """
+        expected = count_occurrences(src, ":")
+        for escape in ("\\u003a", "\\u003A"):
+            expected += count_occurrences(src, escape)
+        return expected == self.orjson.dumps(decoded).count(b":")
+
+
+BACKENDS = {
+    StdlibBackend.name: StdlibBackend,
+    OrjsonBackend.name: OrjsonBackend
+}
+
+_instances = {}
+
+
+def get_backend(name=None):
+    """
+    Returns an instance of the named JSON backend.
+
+    Args:
+        name (str | JSONBackend): The name of a backend, a backend instance which
+            is returned unchanged, or None or "auto" for the preferred backend
+            which is installed.
+
+    Raises:
+        ValueError: If `name` does not describe a backend, or the named backend
+            is not installed
+    """
+    if isinstance(name, JSONBackend):
+        return name
+
+    if name in (None, "auto"):
+        for candidate in PREFERENCE:
+            try:
+                return get_backend(candidate)
+            except ValueError:
+                continue
+
+    if name not in BACKENDS:
+        raise ValueError(f"No JSON backend named: {name}")
+
+    if name not in _instances:
+        try:
+            _instances[name] = BACKENDS[name]()
+        except ImportError:
+            raise ValueError(f"JSON backend '{name}' is not installed") from None
+
+    return _instances[name]
+
+
+def available_backends():
+    """
+    Returns:
+        names (List[str]): The names of each backend which is installed
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ValueError:
+            continue
+        names.append(name)
+    return names
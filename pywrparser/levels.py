@@ -0,0 +1,18 @@
+"""
+Levels of validation, from the cheapest.
+
+    structural      The document is a JSON object whose required sections are
+                    present and of the correct type, whose nodes and scenarios
+                    are named, and whose edges join two nodes. No components
+                    are created and no rules are applied.
+    standard        The rules of the ruleset are applied to every component.
+    exhaustive      As ``standard``, with the edge checks of ``structural``,
+                    and the rules of parameters and recorders are also applied
+                    to those defined inline by nodes. The numeric constraints of
+                    :mod:`pywrparser.constraints` are evaluated across all
+                    valid components.
+"""
+
+VALIDATION_LEVELS = ("structural", "standard", "exhaustive")
+
+DEFAULT_VALIDATION_LEVEL = "standard"
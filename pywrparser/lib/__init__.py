@@ -1 +1 @@
-from .jsontools import PywrTypeJSONEncoder, PywrNetworkJSONEncoder
+from .jsontools import PywrTypeJSONEncoder, PywrNetworkJSONEncoder, dumps
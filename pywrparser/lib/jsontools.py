@@ -1,5 +1,6 @@
 import json
 
+from pywrparser.jsonbackend import get_backend
 from pywrparser.types.base import PywrType
 from pywrparser.types.network import PywrNetwork
 
@@ -17,3 +18,25 @@ class PywrNetworkJSONEncoder(json.JSONEncoder):
             return inst.as_dict()
 
         return json.JSONEncoder.default(self, inst)
+
+
+def encode_default(inst):
+    """
+    Returns a serialisable representation of a :class:`PywrNetwork` or
+    :class:`PywrType` instance, for use as the `default` argument of any
+    JSON backend's `dumps`.
+    """
+    if isinstance(inst, PywrNetwork):
+        return inst.as_dict()
+    if isinstance(inst, PywrType):
+        return inst.data
+
+    raise TypeError(f"Object of type {inst.__class__.__name__} is not JSON serializable")
+
+
+def dumps(obj, indent=None, json_backend=None):
+    """
+    Encodes `obj`, which may contain :class:`PywrNetwork` and :class:`PywrType`
+    instances, with the named JSON backend, or the fastest installed backend.
+    """
+    return get_backend(json_backend).dumps(obj, indent=indent, default=encode_default)
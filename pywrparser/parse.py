@@ -1,24 +1,52 @@
 import argparse
 import os
 import sys
+import time
+
+from collections import Counter
 
 from pywrparser import (
     rules,
     __version__
 )
+from pywrparser.cache import DEFAULT_MAX_SIZE as DEFAULT_CACHE_SIZE
 from pywrparser.display import (
-    console,
+    count_errors_warnings,
+    get_console,
     results_as_json,
-    write_results
+    set_console_options,
+    source_name,
+    write_results,
+    write_rule_profile
+)
+from pywrparser.jsonbackend import (
+    BACKENDS,
+    get_backend
 )
-from pywrparser.types.network import PywrNetwork
+from pywrparser.levels import (
+    DEFAULT_VALIDATION_LEVEL,
+    VALIDATION_LEVELS
+)
+
+MIB = 1024 * 1024
+
+
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"invalid positive integer: '{text}'")
+    return value
 
 
 def configure_args(args):
     parser = argparse.ArgumentParser(
-        usage="%(prog)s [-f <filename> | -s | -l] [OPTIONS]",
+        usage="%(prog)s [-f <filename> | -b <path> [<path> ...] | -s | -l] [OPTIONS]",
         epilog="For further information, please visit https://pmslavin.github.io/pywrparser",
         description="A toolkit for parsing and validating Pywr models."
+        " Run `%(prog)s serve --help` for the validation service."
     )
 
     meg = parser.add_mutually_exclusive_group()
@@ -27,6 +55,13 @@ def configure_args(args):
         help="File containing a Pywr network in JSON format",
         type=str,
         default=None)
+    meg.add_argument("-b", "--batch",
+        metavar="<path>",
+        nargs="+",
+        default=None,
+        help="Validate many files, given as filenames, directories searched"
+        " for *.json files, or glob patterns"
+    )
     meg.add_argument("-s", "--stdin",
         action="store_true",
         default=False,
@@ -46,6 +81,38 @@ def configure_args(args):
         help="Apply the specified ruleset during parsing"
     )
 
+    validation.add_argument("--rule-file",
+        metavar="<path>",
+        action="append",
+        default=[],
+        help="Apply the rules declared in a TOML or JSON rule file in addition"
+        " to those of the ruleset. May be repeated"
+    )
+    validation.add_argument("--select",
+        metavar="<pattern>",
+        action="append",
+        default=None,
+        help="Apply only the rules and warnings whose names, such as"
+        " `warn_node_name_min_len` or `PywrNode.warn_node_name_min_len`,"
+        " match this glob pattern. May be repeated"
+    )
+    validation.add_argument("--ignore",
+        metavar="<pattern>",
+        action="append",
+        default=[],
+        help="Do not apply the rules and warnings whose names match this"
+        " glob pattern. May be repeated"
+    )
+    validation.add_argument("--level",
+        metavar="<level>",
+        choices=VALIDATION_LEVELS,
+        default=DEFAULT_VALIDATION_LEVEL,
+        help="Level of validation: one of %(choices)s. `structural` checks only"
+        " that required sections and names are present and that edges join nodes,"
+        " without applying rules. `exhaustive` also checks edges, applies rules"
+        " to parameters and recorders defined inline by nodes, and evaluates numeric"
+        " constraints. Defaults to %(default)s"
+    )
     validation.add_argument("--raise-on-warning",
         action="store_true",
         default=False,
@@ -67,6 +134,20 @@ def configure_args(args):
         default=False,
         help="Duplicate edges are treated as an error"
     )
+    validation.add_argument("--max-errors",
+        metavar="<N>",
+        type=positive_int,
+        default=None,
+        help="Stop validating once N errors have been found, reporting"
+        " the number of components left unchecked"
+    )
+    validation.add_argument("--max-warnings",
+        metavar="<N>",
+        type=positive_int,
+        default=None,
+        help="Stop validating once N warnings have been found, reporting"
+        " the number of components left unchecked"
+    )
 
     display = parser.add_argument_group("display options")
 
@@ -100,6 +181,49 @@ def configure_args(args):
 
     general = parser.add_argument_group("general options")
 
+    general.add_argument("--json-backend",
+        metavar="<backend>",
+        choices=("auto", *BACKENDS),
+        default="auto",
+        help="JSON library used to decode input and encode reports: one of"
+        " %(choices)s. The default selects the fastest installed library"
+    )
+
+    general.add_argument("-j", "--jobs",
+        metavar="<N>",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes used with `--batch`."
+        " Defaults to the number of CPUs"
+    )
+    general.add_argument("--component-jobs",
+        metavar="<N>",
+        type=positive_int,
+        default=1,
+        help="Number of worker processes across which the parameters, recorders"
+        " and nodes of each network are validated. Defaults to %(default)s"
+    )
+    general.add_argument("--cache-dir",
+        metavar="<directory>",
+        type=str,
+        default=None,
+        help="Reuse the results of unchanged files stored in this directory,"
+        " and store new results there"
+    )
+    general.add_argument("--cache-size",
+        metavar="<MiB>",
+        type=int,
+        default=DEFAULT_CACHE_SIZE // MIB,
+        help="Maximum size of the `--cache-dir` directory, beyond which"
+        " the least recently used results are evicted. Defaults to %(default)s MiB"
+    )
+    general.add_argument("--profile-rules",
+        action="store_true",
+        default=False,
+        help="Record the calls, outcomes and time of each rule, and display"
+        " them on stderr, slowest first, as a table or with `--json-output` as JSON."
+        " Validates in a single process without `--cache-dir`"
+    )
     general.add_argument("--no-digest",
         action="store_true",
         default=False,
@@ -120,7 +244,6 @@ def configure_args(args):
 
 def handle_args(args):
 
-    filename = args.filename
     raise_error = args.raise_on_error
     raise_warning = args.raise_on_warning
     useemoji = not args.no_emoji if not args.no_colour else False
@@ -136,64 +259,215 @@ def handle_args(args):
         sys.exit(0)
 
     if ruleset := args.use_ruleset:
-        rulesets = rules.get_rulesets()
-        if not ruleset in rulesets:
+        if not ruleset in rules.get_ruleset_keys():
             print(f"No ruleset with key: {ruleset}", file=sys.stderr)
             sys.exit(1)
 
+    if args.rule_file:
+        from pywrparser.rulefiles import load_rule_file
+        from pywrparser.types.exceptions import PywrParserException
+        try:
+            for path in args.rule_file:
+                load_rule_file(path)
+        except PywrParserException as err:
+            print(err, file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        json_backend = get_backend(args.json_backend)
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        sys.exit(1)
+
     if args.no_colour:
-        console.no_color = True
+        set_console_options(no_color=True)
+
+    options = {
+        "raise_on_parser_error": raise_error,
+        "raise_on_parser_warning": raise_warning,
+        "ignore_warnings": args.ignore_warnings,
+        "allow_duplicate_edges": allow_duplicate_edges,
+        "ruleset": ruleset,
+        "json_backend": json_backend,
+        "max_errors": args.max_errors,
+        "max_warnings": args.max_warnings,
+        "component_jobs": args.component_jobs,
+        "rule_files": args.rule_file,
+        "select": args.select,
+        "ignore": args.ignore,
+        "level": args.level
+    }
+
+    cache = None
+    if args.cache_dir:
+        from pywrparser.cache import ResultCache
+        cache = ResultCache(args.cache_dir, max_size=args.cache_size * MIB)
+
+    if args.profile_rules:
+        sys.exit(handle_profiled(args, options, include_digest, useemoji))
+
+    if args.batch:
+        sys.exit(handle_batch(args, options, cache, include_digest, useemoji))
+
+    handle_file(args, options, cache, include_digest, useemoji)
+
 
-    if args.stdin:
-        import io
-        include_digest = False
-        filename = io.StringIO(sys.stdin.read())
+def handle_file(args, options, cache=None, include_digest=True, useemoji=True):
+    """
+    Validates the file named by `--filename`, or stdin, and reports the result.
+    """
+    filename = sys.stdin.buffer if args.stdin else args.filename
+    json_backend, ruleset = options["json_backend"], options["ruleset"]
 
-    network, errors, warnings = PywrNetwork.from_file(filename,
-                                    raise_on_parser_error=raise_error,
-                                    raise_on_parser_warning=raise_warning,
-                                    ignore_warnings=args.ignore_warnings,
-                                    allow_duplicate_edges=allow_duplicate_edges,
-                                    ruleset=ruleset
-                                )
+    from pywrparser.batch import summarise_file
+    _, result, _ = summarise_file(filename, options, cache, digest=include_digest)
+    errors, warnings, source = result.errors, result.warnings, result.source
 
     if errors or warnings:
         if not errors and args.ignore_warnings:
             """ Do nothing """
             pass
         elif args.json_output:
-            print(results_as_json(filename, errors, warnings, include_digest=include_digest))
+            print(results_as_json(filename, errors, warnings, include_digest=include_digest,
+                                  json_backend=json_backend, source=source, ruleset=ruleset))
             return;
         else:
             write_results(filename, errors, warnings, use_emoji=useemoji)
 
-    if network:
-        network.add_parameter_references()
-        network.add_recorder_references()
-        network.promote_inline_parameters()
-        network.attach_reference_parameters()
+    if result.valid:
         if args.terse_report:
-            report = network.report()
-            console.print(report)
+            if result.report is not None:
+                get_console().print(result.report)
             return;
         if args.json_output:
-            report = results_as_json(filename, errors, warnings, include_digest=include_digest)
+            report = results_as_json(filename, errors, warnings, include_digest=include_digest,
+                                     json_backend=json_backend, source=source, ruleset=ruleset)
             print(report)
             return;
         else:
-            report = network.verbose_report()
-            file_txt = f"[green]File:[/green] [bold blue]{os.path.basename(args.filename)}[/bold blue]"
+            console = get_console()
+            file_txt = f"[green]File:[/green] [bold blue]{os.path.basename(source_name(filename))}[/bold blue]"
             console.print(file_txt)
             if include_digest:
-                from pywrparser.utils import sha256digest
-                digest_txt = f"[green]sha256:[/green] [blue]{sha256digest(args.filename)}[/blue]"
+                digest_txt = f"[green]sha256:[/green] [blue]{source.sha256}[/blue]"
                 console.print(digest_txt)
+            size_txt = f"[green]Size:[/green] [blue]{source.size} bytes read in {source.read_time:.3f}s[/blue]"
+            console.print(size_txt)
+            if source.compression:
+                content_txt = f"[green]Content:[/green] [blue]{source.content_size} bytes, {source.compression} compressed[/blue]"
+                console.print(content_txt)
+                if include_digest:
+                    console.print(f"[green]Content sha256:[/green] [blue]{source.content_sha256}[/blue]")
 
-            for prefix, txt in report.items():
+            if result.verbose_report is None:
+                """ No network is created by structural validation """
+                console.print(f"[green]Structure:[/green] [blue]valid[/blue]")
+                return
+            for prefix, txt in result.verbose_report.items():
                 console.print(f"[green]{prefix}:[/green] [blue]{txt}[/blue]")
 
 
+def handle_profiled(args, options, include_digest=True, use_emoji=True):
+    """
+    Validates the input as :func:`handle_file` or :func:`handle_batch` while
+    profiling rules, then writes the profile to stderr.  Rules are profiled
+    only in this process, so neither worker processes nor cached results are used.
+
+    Returns:
+        status (int): The status of :func:`handle_batch`, or 0
+    """
+    from pywrparser.utils import profile_rules
+
+    args.jobs = 1
+    options = {**options, "component_jobs": 1}
+    with profile_rules() as profile:
+        if args.batch:
+            status = handle_batch(args, options, None, include_digest, use_emoji)
+        else:
+            status = handle_file(args, options, None, include_digest, use_emoji) or 0
+
+    if args.json_output:
+        print(profile.as_json(), file=sys.stderr)
+    else:
+        write_rule_profile(profile)
+
+    return status
+
+
+def handle_batch(args, options, cache=None, include_digest=True, use_emoji=True):
+    """
+    Validates each file denoted by the `--batch` paths across a pool of
+    worker processes, reporting the result of each file as it is available
+    followed by a summary of all files.
+
+    Returns:
+        status (int): 0 if every file contains a valid network, otherwise 1
+    """
+    from pywrparser.batch import (
+        expand_paths,
+        summarise_files
+    )
+
+    filenames = expand_paths(args.batch)
+    if not filenames:
+        print("No input files found", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    totals = Counter()
+    console = None if args.json_output else get_console()
+    results = summarise_files(filenames, jobs=args.jobs, cache=cache, digest=include_digest, **options)
+    for filename, result, cached in results:
+        errors, warnings = result.errors, result.warnings
+        error_total, warning_total = count_errors_warnings(errors, warnings)
+        totals["valid" if result.valid else "invalid"] += 1
+        totals["cached"] += cached
+        totals["errors"] += error_total
+        totals["warnings"] += warning_total
+
+        if args.json_output:
+            """ One document per line """
+            print(results_as_json(filename, errors, warnings, include_digest=include_digest,
+                                  indent=None, json_backend=options["json_backend"],
+                                  source=result.source, ruleset=options["ruleset"]), flush=True)
+            continue
+
+        if not args.terse_report:
+            if errors or (warnings and not args.ignore_warnings):
+                write_results(filename, errors, warnings, use_emoji=use_emoji)
+
+        if result.valid:
+            status = "[bold green]VALID[/bold green]  "
+            if result.report is None:
+                detail = "structure only"
+            else:
+                detail = ", ".join(f"{count} {component}" for component, count in result.report.items())
+        else:
+            status = "[bold red]INVALID[/bold red]"
+            detail = f"{error_total} error{'' if error_total == 1 else 's'}"
+        if warning_total and not args.ignore_warnings:
+            detail += f", {warning_total} warning{'' if warning_total == 1 else 's'}"
+        console.print(f"{status} [bold blue]{filename}[/bold blue] ({detail})", highlight=False)
+
+    elapsed = time.perf_counter() - start
+    summary = (f"{len(filenames)} files: {totals['valid']} valid, {totals['invalid']} invalid,"
+               f" {totals['errors']} errors, {totals['warnings']} warnings in {elapsed:.2f}s")
+    if cache is not None:
+        summary += f" ({totals['cached']} cached)"
+    if args.json_output:
+        print(summary, file=sys.stderr)
+    else:
+        console.print(f"[green]Summary:[/green] [blue]{summary}[/blue]", highlight=False)
+
+    return 1 if totals["invalid"] else 0
+
+
 def run():
+    if sys.argv[1:2] == ["serve"]:
+        from pywrparser import server
+        server.run(sys.argv[2:])
+        return
+
     args = configure_args(sys.argv[1:])
     handle_args(args)
 
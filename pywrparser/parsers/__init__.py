@@ -1 +1,2 @@
 from .pywrjsonparser import PywrJSONParser
+from .pywrstreamparser import PywrJSONStreamParser, PywrComponentVisitor
@@ -0,0 +1,115 @@
+from collections import defaultdict
+
+SECTION_ITEMS = {
+    None: "section",
+    "scenarios": "scenario",
+    "tables": "table",
+    "parameters": "parameter",
+    "recorders": "recorder",
+    "nodes": "node"
+}
+
+
+class DuplicateKey():
+    """
+    A record of a name which occurs more than once in a section of a
+    network, or of a top-level section which occurs more than once.
+    """
+    __slots__ = ("section", "name", "positions")
+
+    def __init__(self, section, name, positions):
+        self.section = section
+        self.name = name
+        self.positions = tuple(positions)
+
+    @property
+    def count(self):
+        return len(self.positions)
+
+    @property
+    def paths(self):
+        """
+        The JSON path of each occurrence, as a tuple of keys and indices.
+        Occurrences of a duplicate object member share the same path.
+        """
+        if self.section is None:
+            return tuple((self.name,) for _ in self.positions)
+        if self.section in ("scenarios", "nodes"):
+            return tuple((self.section, pos) for pos in self.positions)
+        return tuple((self.section, self.name) for _ in self.positions)
+
+    @property
+    def message(self):
+        return f"Duplicate {SECTION_ITEMS[self.section]} name <{self.name}>"
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.section}, {self.name}, {self.positions})"
+
+    def as_dict(self):
+        return {
+            "section": self.section,
+            "name": self.name,
+            "positions": list(self.positions)
+        }
+
+
+class DuplicateKeyTracker():
+    """
+    Records duplicate names as a document is decoded.  Only the keys and
+    names which identify network components are tracked; the content of
+    each component is decoded without inspection.
+
+    Names are tracked per `section`, with a `section` of None denoting the
+    top-level keys of the document.
+
+    Where the members of an object section are decoded into a dict, a later
+    member replaces an earlier one of the same name.  The decoder may then
+    record every member of that section in :attr:`occurrences`, so that each
+    definition of a duplicated name remains available for validation.
+
+    Attributes:
+        occurrences (Dict[str, List[Tuple[str, Any]]]): The name and decoded
+            value of each member of a section with duplicate member names, in
+            document order, by section
+    """
+    def __init__(self):
+        self._first = defaultdict(dict)
+        self._repeats = {}
+        self.occurrences = {}
+
+    def track(self, section, name, position):
+        """
+        Records an occurrence of `name` at `position` within `section`.
+
+        Returns:
+            bool: True if `name` has already occurred in `section`
+        """
+        first = self._first[section].setdefault(name, position)
+        if first == position:
+            return False
+        self.repeat(section, name, first, position)
+        return True
+
+    def names(self, section):
+        """
+        Returns the mapping of each name seen in `section` to the position of
+        its first occurrence.  Callers which track many names in a loop may
+        update this directly, calling :meth:`repeat` when a name is repeated.
+        """
+        return self._first[section]
+
+    def repeat(self, section, name, first, position):
+        self._repeats.setdefault((section, name), [first]).append(position)
+
+    @property
+    def duplicates(self):
+        """
+        Returns:
+            duplicates (List[DuplicateKey]): A record of each duplicated name,
+                in the order in which each was first repeated
+        """
+        return [DuplicateKey(section, name, positions)
+                for (section, name), positions in self._repeats.items()]
+
+    def __len__(self):
+        return len(self._repeats)
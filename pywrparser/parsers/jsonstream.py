@@ -0,0 +1,284 @@
+import codecs
+import gc
+import json
+import re
+
+from contextlib import contextmanager
+from json.decoder import scanstring
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+""" Unescaped member names and delimiters, matched without leaving C """
+MEMBER_KEY = re.compile(r'[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*')
+MEMBER_END = re.compile(r"[ \t\n\r]*([,\]}])[ \t\n\r]*")
+
+
+def decode_error(msg, lineno, colno, pos):
+    """
+    Returns a :class:`json.JSONDecodeError` describing an error at an absolute
+    position in a document which is not held in memory in its entirety.
+    """
+    err = json.JSONDecodeError(msg, "", 0)
+    err.args = (f"{msg}: line {lineno} column {colno} (char {pos})",)
+    err.lineno, err.colno, err.pos = lineno, colno, pos
+    return err
+
+
+@contextmanager
+def gc_suspended():
+    """
+    Suspends the cyclic garbage collector within the context.  Decoded JSON
+    contains no reference cycles, so collections triggered by the many
+    containers allocated while decoding a large document are wasted work.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class JSONSectionReader():
+    """
+    Incrementally decodes a JSON document whose top-level value is an object,
+    reading from a file object only as much of the document as is required to
+    decode the next value.
+
+    The members of top-level sections named in `stream_keys` are decoded and
+    yielded one at a time, so that only a single component of such a section
+    is held in memory at once.  All other top-level sections are decoded and
+    yielded as a whole.
+    """
+    def __init__(self, fp, stream_keys=(), chunk_size=DEFAULT_CHUNK_SIZE,
+                 object_pairs_hook=None, tracker=None):
+        """
+        Args:
+            fp: A file object opened in either text or binary mode, or a str
+                holding the entire document. Binary input is decoded as UTF-8.
+            stream_keys (Iterable[str]): Top-level keys whose array elements or
+                object members are decoded individually
+            chunk_size (int): The minimum number of characters or bytes
+                requested in each read from `fp`
+            object_pairs_hook: Passed to the :class:`json.JSONDecoder` used to
+                decode individual values
+            tracker (DuplicateKeyTracker): If present, records each top-level key
+                and each member name of streamed object sections
+        """
+        self.fp = fp
+        self.stream_keys = frozenset(stream_keys)
+        self.chunk_size = int(chunk_size)
+        self.decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+        self.tracker = tracker
+        self.sections = []
+
+        self._textdecoder = None
+        self._buf = ""
+        self._pos = 0
+        self._offset = 0
+        self._lines = 0
+        self._line_start = 0
+        self._eof = False
+
+        if isinstance(fp, str):
+            self.fp = None
+            self._buf = fp
+            self._eof = True
+
+
+    def __iter__(self):
+        """
+        Yields a `(section, key, value)` tuple for each value decoded.
+
+        For streamed array sections `key` is the index of the element, for streamed
+        object sections `key` is the member name, and for sections decoded whole
+        `key` is None.  A top-level key which occurs more than once is decoded but
+        only its first occurrence is yielded.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            position = 0
+            while True:
+                section = self._read_key()
+                skip = section in self.sections
+                if not skip:
+                    self.sections.append(section)
+                if self.tracker is not None:
+                    self.tracker.track(None, section, position)
+                position += 1
+
+                opening = self._peek()
+                if section in self.stream_keys and opening in "[{":
+                    for key, value in self._iter_members(section):
+                        if not skip:
+                            yield section, key, value
+                else:
+                    value = self._read_value()
+                    if not skip:
+                        yield section, None, value
+
+                if self._next_member("}"):
+                    break
+
+        if self._peek():
+            raise self._error("Extra data", self._pos)
+
+
+    def _iter_members(self, section):
+        opening = self._peek()
+        closing = "]" if opening == "[" else "}"
+        self._pos += 1
+        if self._peek() == closing:
+            self._pos += 1
+            return
+
+        names = None
+        if self.tracker is not None and closing == "}":
+            names = self.tracker.names(section)
+        scan_once = self.decoder.scan_once
+        idx = 0
+        while True:
+            buf, pos = self._buf, self._pos
+            if closing == "]":
+                key = idx
+                pos = WHITESPACE.match(buf, pos).end()
+            elif (m := MEMBER_KEY.match(buf, pos)) and m.end() < len(buf):
+                key = m.group(1)
+                pos = m.end()
+            else:
+                key = self._read_key()
+                self._peek()
+                buf, pos = self._buf, self._pos
+            if names is not None and (first := names.setdefault(key, idx)) != idx:
+                self.tracker.repeat(section, key, first, idx)
+
+            value_pos = pos
+            try:
+                value, pos = scan_once(buf, pos)
+                if pos >= len(buf) and not self._eof:
+                    raise ValueError("Value may be truncated")
+            except (StopIteration, ValueError):
+                self._pos = value_pos
+                value = self._read_value()
+                buf, pos = self._buf, self._pos
+            yield key, value
+            idx += 1
+
+            m = MEMBER_END.match(buf, pos)
+            if m and m.end() < len(buf) and m.group(1) in (",", closing):
+                self._pos = m.end()
+                if m.group(1) == closing:
+                    return
+                continue
+            self._pos = pos
+            if self._next_member(closing):
+                return
+
+
+    def _next_member(self, closing):
+        """
+        Consumes the delimiter following a member, returning True if this closes
+        the enclosing container.
+        """
+        delim = self._peek()
+        if delim == ",":
+            self._pos += 1
+            return False
+        if delim == closing:
+            self._pos += 1
+            return True
+        raise self._error("Expecting ',' delimiter", self._pos)
+
+
+    def _read_key(self):
+        if self._peek() != '"':
+            raise self._error("Expecting property name enclosed in double quotes", self._pos)
+        key = self._scan(lambda buf, pos: scanstring(buf, pos + 1))
+        self._expect(":")
+        return key
+
+
+    def _read_value(self):
+        self._peek()
+        return self._scan(self.decoder.raw_decode)
+
+
+    def _scan(self, scan):
+        """
+        Applies `scan` at the current position, reading further input until the
+        buffer holds a complete value.  A value which ends at the end of the buffer
+        may be a truncated number, so is retried with more input.
+        """
+        while True:
+            try:
+                value, end = scan(self._buf, self._pos)
+            except json.JSONDecodeError as err:
+                if self._eof:
+                    raise self._error(err.msg, err.pos) from None
+                self._read()
+                continue
+            if end >= len(self._buf) and not self._eof:
+                self._read()
+                continue
+            self._pos = end
+            return value
+
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}' delimiter", self._pos)
+        self._pos += 1
+
+
+    def _peek(self):
+        """
+        Advances past any whitespace and returns the next character, or an
+        empty string at the end of the document.
+        """
+        while True:
+            self._pos = WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                return ""
+            self._read()
+
+
+    def _read(self):
+        """
+        Discards consumed input and appends the next chunk from the file.
+        Each read is at least as large as the unconsumed input, so that a
+        value spanning many chunks is rescanned a logarithmic number of times.
+        """
+        size = max(self.chunk_size, len(self._buf) - self._pos)
+        raw = self.fp.read(size)
+        if isinstance(raw, str):
+            chunk = raw
+        else:
+            if self._textdecoder is None:
+                self._textdecoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = self._textdecoder.decode(raw, final=not raw)
+        if not raw:
+            self._eof = True
+
+        newline = self._buf.rfind("\n", 0, self._pos)
+        if newline >= 0:
+            self._lines += self._buf.count("\n", 0, self._pos)
+            self._line_start = self._offset + newline + 1
+        self._offset += self._pos
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+
+    def _error(self, msg, pos):
+        lineno = self._lines + self._buf.count("\n", 0, pos) + 1
+        newline = self._buf.rfind("\n", 0, pos)
+        if newline >= 0:
+            colno = pos - newline
+        else:
+            colno = self._offset + pos - self._line_start + 1
+        return decode_error(msg, lineno, colno, self._offset + pos)
@@ -1,55 +1,293 @@
+import copy
 import json
-import re
 from collections import (
     defaultdict,
     Counter
 )
-from functools import partial
 
 from pywrparser import rules
-from pywrparser.types import (
-    PywrTimestepper,
-    PywrMetadata,
-    PywrScenario,
-    PywrScenarioCombination,
-    PywrTable,
-    PywrNode,
-    PywrEdge,
-    PywrParameter,
-    PywrRecorder,
+from pywrparser.constraints import (
+    constant_values,
+    constraint_findings
 )
 from pywrparser.types.exceptions import (
     PywrParserException,
-    PywrNetworkValidationError
+    PywrNetworkValidationError,
+    PywrValidationBudgetExhausted,
+    PywrValidationIncomplete
+)
+from pywrparser.parsers.duplicates import DuplicateKeyTracker
+from pywrparser.parsers.jsonstream import (
+    JSONSectionReader,
+    gc_suspended
+)
+from pywrparser.jsonbackend import get_backend
+from pywrparser.levels import (
+    DEFAULT_VALIDATION_LEVEL,
+    VALIDATION_LEVELS
+)
+from pywrparser.rulefiles import rule_file_types
+from pywrparser.selection import (
+    RuleSelection,
+    component_type,
+    metadata_suppressions,
+    selected_types
+)
+from pywrparser.source import as_json_text
+from pywrparser.utils import (
+    canonical_name,
+    findings_collected,
+    SectionCapture,
+    validation_suspended,
+    ValidationBudget
 )
-from pywrparser.utils import raiseorpush
 
-DUP_KEY_BASE = "__PywrParser_Duplicate_Key_{pattern}__"
-DUP_KEY_FLAG = DUP_KEY_BASE.format(pattern="{idx:03d}")
-DUP_KEY_RE   = r"{base}".format(base=DUP_KEY_BASE.format(pattern="[0-9]{3}"))
+""" Sections whose components are keyed by name """
+NAMED_SECTIONS = ("tables", "parameters", "recorders")
+
+""" Sections whose components may be validated across a pool of processes """
+PARALLEL_SECTIONS = ("parameters", "recorders", "nodes")
+
+""" Default number of components validated by a worker process at once """
+VALIDATION_CHUNK_SIZE = 2000
+
+""" Sections in the order in which their components are validated """
+VALIDATION_ORDER = ("metadata", "timestepper", "scenarios", "scenario_combinations",
+                    "tables", "parameters", "recorders", "nodes", "edges")
+
+""" Sections which every network defines """
+REQUIRED_SECTIONS = ("metadata", "timestepper", "nodes", "edges")
+
+""" Sections which are JSON objects, all others being arrays """
+OBJECT_SECTIONS = ("metadata", "timestepper", *NAMED_SECTIONS)
+
+
+def component_name(data):
+    """
+    Returns the name of a node or scenario from its decoded `data`, cast to
+    str as by :class:`PywrNode`, or None if the component has no usable name.
+    """
+    name = data.get("name") if isinstance(data, dict) else None
+    if isinstance(name, (list, dict)):
+        return None
+    return name if isinstance(name, str) or not name else str(name)
+
+
+def resolve_ruleset(ruleset):
+    """
+    Returns:
+        ruleset (Ruleset): The shared :class:`pywrparser.rules.Ruleset` denoted
+            by `ruleset`, which may be a key, a Ruleset, or None for the default rules
+
+    Raises:
+        PywrParserException: If there is no ruleset with the key `ruleset`
+    """
+    try:
+        return rules.get_ruleset(ruleset)
+    except KeyError:
+        raise PywrParserException(f"No ruleset with key: {ruleset}") from None
+
+
+def section_types(ruleset, rule_files=None, selection=None):
+    """
+    Returns:
+        types (Dict[str, type]): The type of the components of each section
+            under `ruleset`, extended by the rules of any `rule_files`, with
+            only the rules applied by the :class:`RuleSelection` `selection`
+    """
+    types = ruleset.types
+    if rule_files:
+        types = {**types, **rule_file_types(rule_files, types.__getitem__)}
+    return selected_types(types, selection)
+
+
+def suppression_name(section, data, name=None):
+    """
+    Returns the name by which rules are suppressed for the component of
+    `section` with `data`, and `name` for sections keyed by name.
+    """
+    if name is not None:
+        return name
+    if section in ("scenarios", "nodes"):
+        return component_name(data)
+    return None
+
+
+def check_component(ctype, data, name=None):
+    """
+    Validates a component by creating an instance of `ctype` from its `data`
+    and `name`, without retaining the instance.
+
+    Returns:
+        (errors, warnings): The errors of an invalid component and None, or None
+            and the warnings of a valid component with warnings. None is
+            returned for a valid component without warnings.
+    """
+    with findings_collected():
+        inst = ctype(data) if name is None else ctype(name, data)
+    if inst.errors:
+        return inst.errors, None
+    if inst.has_warnings:
+        return None, inst.warnings
+    return None
+
+
+""" The components being validated, inherited by forked worker processes """
+_worker_items = None
+""" The type of the components of each section in a worker process """
+_worker_types = None
+""" The rules suppressed for individual components in a worker process """
+_worker_suppressions = {}
+
+
+def init_validation_worker(ruleset, rule_files=None, selection=None, suppressions=None):
+    """
+    Resolves the types of each section under `ruleset`, any `rule_files` and
+    `selection` in a worker process which validates components, with the
+    `suppressions` of individual components.
+    """
+    global _worker_types, _worker_suppressions
+    _worker_types = section_types(resolve_ruleset(ruleset), rule_files, selection)
+    _worker_suppressions = suppressions or {}
+
+
+def validate_chunk(section, start, stop, items=None):
+    """
+    Validates the components of `section` from `start` to `stop` in a worker
+    process.  The `(name, data)` pair of each component is taken from `items`
+    if given, and otherwise from those inherited from the parent process.
+
+    Returns:
+        results (List[Tuple[int, List, List]]): The offset in the chunk, errors
+            and warnings of each component with errors or warnings, in order
+    """
+    if items is None:
+        items = _worker_items[section][start:stop]
+
+    results = []
+    for offset, (name, data) in enumerate(items):
+        ctype = component_type(_worker_types, _worker_suppressions, section,
+                               suppression_name(section, data, name))
+        if (outcome := check_component(ctype, data, name)) is not None:
+            results.append((offset, *outcome))
+
+    return results
+
+
+def structure_errors(src):
+    """
+    Returns the messages describing the structural faults of the decoded
+    document `src`: required sections which are absent, sections of the wrong
+    JSON type, nodes and scenarios without names, and edges which do not
+    join two vertices.  No components are created and no rules are applied.
+    """
+    messages = []
+    for section in VALIDATION_ORDER:
+        if section not in src:
+            if section in REQUIRED_SECTIONS:
+                messages.append(f"Network contains no {section}")
+            continue
+        container = dict if section in OBJECT_SECTIONS else list
+        if not isinstance(src[section], container):
+            kind = "an object" if container is dict else "an array"
+            messages.append(f"Network section '{section}' is not {kind}")
+
+    for section, label in (("scenarios", "Scenario"), ("nodes", "Node")):
+        components = src.get(section)
+        if not isinstance(components, list):
+            continue
+        for idx, data in enumerate(components):
+            if component_name(data) in (None, ""):
+                messages.append(f"{label} at index {idx} has no name")
+
+    if isinstance(edges := src.get("edges"), list):
+        for idx, edge in enumerate(edges):
+            if not isinstance(edge, list) or len(edge) < 2:
+                messages.append(f"Edge at index {idx} does not join two vertices")
+
+    return messages
+
+
+def reference_errors(src, allow_duplicate_edges=True):
+    """
+    Returns the messages describing edges of the decoded document `src`
+    whose source or target is not the name of a node, and if not
+    `allow_duplicate_edges`, duplicate edges.  Edges which do not join two
+    vertices are disregarded.
+    """
+    nodes = src.get("nodes")
+    edges = src.get("edges")
+    if not isinstance(nodes, list) or not isinstance(edges, list):
+        return []
+
+    names = {name for data in nodes if (name := component_name(data)) not in (None, "")}
+    messages = []
+    counts = Counter()
+    for edge in edges:
+        if not isinstance(edge, list) or len(edge) < 2:
+            continue
+        source, target = str(edge[0]), str(edge[1])
+        counts[(source, target)] += 1
+        for vertex in (source, target):
+            if vertex not in names:
+                messages.append(f"Edge <{source}, {target}> refers to unknown node <{vertex}>")
+
+    if not allow_duplicate_edges:
+        messages.extend(f"Duplicate edge <{edge}>" for edge, count in counts.items() if count > 1)
+
+    return messages
 
 
 class PywrJSONParser():
-    def __init__(self, json_src, ruleset=None):
+    level = DEFAULT_VALIDATION_LEVEL
+
+    def __init__(self, json_src, ruleset=None, json_backend=None, rule_files=None,
+                 select=None, ignore=None):
         """
         Creates an instance of a parser in which the specified `json_src` is
         validated against the specified `ruleset`.
 
         Args:
-            json_src (str): A JSON encoded representation of a Pywr network
-            ruleset (str): The key of a ruleset whose rules are to be applied
+            json_src (str | bytes | bytearray | memoryview | mmap.mmap): A JSON
+                encoded representation of a Pywr network
+            ruleset (str | Ruleset): The key of a ruleset whose rules are to be
+                applied, or a :class:`pywrparser.rules.Ruleset`. The ruleset applies
+                only to this parser, so that parsers with different rulesets may
+                be used at once.
+            json_backend (str): The name of the JSON backend used to decode
+                `json_src`.  By default the fastest installed backend is used.
+            rule_files (Iterable[str]): Paths of TOML or JSON rule files whose
+                rules are applied in addition to those of `ruleset`
+            select (Iterable[str]): Glob patterns of the names of the rules and
+                warnings applied, as described in :mod:`pywrparser.selection`.
+                If None, all are applied.
+            ignore (Iterable[str]): Glob patterns of the names of rules and
+                warnings which are not applied
         """
         self.errors = defaultdict(list)
         self.warnings = defaultdict(list)
+        self.tracker = DuplicateKeyTracker()
+        self.json_backend = get_backend(json_backend)
+        self.rule_files = tuple(rule_files or ())
+        self.selection = RuleSelection(select, ignore)
+        self.suppressions = {}
 
-        if ruleset:
-            self.set_parser_ruleset(ruleset)
+        self.set_parser_ruleset(ruleset)
 
         try:
-            self.src = json.loads(json_src, object_pairs_hook=self.__class__.enforce_unique)
-        except json.decoder.JSONDecodeError as err:
+            self.src = self.decode(json_src)
+        except (json.decoder.JSONDecodeError, UnicodeDecodeError) as err:
             raise PywrParserException(f"Invalid JSON document: {str(err)}")
 
+        self.init_components()
+
+
+    def init_components(self):
+        """
+        Creates the empty stores into which parsed components are placed.
+        """
+        self.metadata = None
+        self.timestepper = None
         self.nodes = {}
         self.edges = []
         self.parameters = {}
@@ -59,58 +297,207 @@ class PywrJSONParser():
         self.tables = {}
 
 
-    @staticmethod
-    def enforce_unique(ordered_pairs):
-        d = {}
-        sep = ':'
-        idx = 1
-        for k, v in ordered_pairs:
-            if k in d:
-                key = DUP_KEY_FLAG.format(idx=idx) + sep + k
-                d[key] = v
-                idx += 1
-            else:
-                d[k] = v
-        return d
+    def decode(self, json_src):
+        """
+        Decodes the top-level sections of `json_src`, recording in the parser's
+        `tracker` any duplicate section keys, names of components in
+        :const:`NAMED_SECTIONS`, and names of nodes and scenarios.
+
+        The content of each component is decoded without inspection, so that
+        duplicate keys nested within a component take the last value given, as
+        for :func:`json.loads`.
+
+        An accelerated JSON backend is offered the document first.  Documents
+        which it cannot decode, or which contain any duplicate keys, are
+        decoded again by the stdlib decoder, so that error messages and
+        duplicate reports are independent of the backend.
+
+        Args:
+            json_src (str | bytes | bytearray | memoryview | mmap.mmap): A JSON
+                document
+
+        Returns:
+            src (dict): The decoded document
+        """
+        src = self.decode_accelerated(json_src) if self.json_backend.accelerated else None
+        if src is None:
+            src = self.decode_sections(as_json_text(json_src))
+
+        for section in ("scenarios", "nodes"):
+            components = src.get(section)
+            if not isinstance(components, list):
+                continue
+            names = self.tracker.names(section)
+            for idx, component in enumerate(components):
+                name = component.get("name") if isinstance(component, dict) else None
+                if not isinstance(name, str) and (name := component_name(component)) is None:
+                    continue
+                if (first := names.setdefault(name, idx)) != idx:
+                    self.tracker.repeat(section, name, first, idx)
+
+        return src
+
+
+    def decode_accelerated(self, json_src):
+        """
+        Decodes `json_src` in its entirety with the parser's accelerated backend.
+
+        Returns:
+            src (dict): The decoded document, or None if the document is invalid,
+                is not an object, or contains duplicate keys
+        """
+        try:
+            with gc_suspended():
+                src = self.json_backend.loads(json_src)
+        except ValueError:
+            return None
+
+        if not isinstance(src, dict) or not self.json_backend.has_unique_keys(json_src, src):
+            return None
+
+        return src
+
+
+    def decode_sections(self, json_text):
+        """
+        Decodes `json_text` section by section with the stdlib decoder, tracking
+        the names of components as these are read.  Every member of a named
+        section containing a duplicate name is recorded in the `occurrences`
+        of the tracker, as only the last of each name is retained in `src`.
+
+        Args:
+            json_text (str | bytes | bytearray): A JSON document
+
+        Returns:
+            src (dict): The decoded document
+        """
+        if not isinstance(json_text, str):
+            json_text = json_text.decode(json.detect_encoding(json_text), "surrogatepass")
+
+        reader = JSONSectionReader(json_text, stream_keys=NAMED_SECTIONS, tracker=self.tracker)
+        src = {}
+        current = None
+        with gc_suspended():
+            for section, key, value in reader:
+                if key is None:
+                    src[section] = value
+                    continue
+                if section != current:
+                    current = section
+                    members = src[section] = [] if isinstance(key, int) else {}
+                    occurrences = None
+                if isinstance(members, list):
+                    members.append(value)
+                    continue
+                if occurrences is None and key in members:
+                    occurrences = self.tracker.occurrences[section] = list(members.items())
+                if occurrences is not None:
+                    occurrences.append((key, value))
+                members[key] = value
+
+        return src
+
 
     def set_parser_ruleset(self, ruleset):
         """
-        Applies the specified `ruleset` to the parser.
+        Applies the specified `ruleset` to the parser, together with the
+        parser's `rule_files` and `selection`.
 
         Args:
-            ruleset (str): The key of a ruleset whose rules are to be applied
-        """
-        rulesets = rules.get_rulesets()
-        if ruleset not in rulesets:
-            raise PywrParserException(f"No ruleset with key: {ruleset}")
-
-        import importlib
-        import pywrparser.types
-        rules.set_active_ruleset(ruleset)
-        importlib.reload(pywrparser.types)
-        from pywrparser.types import (
-            PywrTimestepper,
-            PywrMetadata,
-            PywrScenario,
-            PywrTable,
-            PywrNode,
-            PywrEdge,
-            PywrParameter,
-            PywrRecorder,
-        )
-        globals()["PywrTimestepper"] = PywrTimestepper
-        globals()["PywrMetadata"] = PywrMetadata
-        globals()["PywrScenario"] = PywrScenario
-        globals()["PywrTable"] = PywrTable
-        globals()["PywrNode"] = PywrNode
-        globals()["PywrEdge"] = PywrEdge
-        globals()["PywrParameter"] = PywrParameter
-        globals()["PywrRecorder"] = PywrRecorder
+            ruleset (str | Ruleset): The key of a ruleset whose rules are to be
+                applied, a :class:`pywrparser.rules.Ruleset`, or None for the
+                default rules
 
+        Raises:
+            PywrParserException: If there is no such ruleset, or a rule file
+                cannot be read or is invalid
+        """
+        self.ruleset = resolve_ruleset(ruleset)
+        self.types = section_types(self.ruleset, self.rule_files, self.selection)
+
+
+    def component_type(self, section, name=None):
+        """
+        Returns:
+            ctype (type): The type of the components of `section` under the
+                parser's ruleset, rule files and selection, without any rules
+                suppressed for the component `name`
+        """
+        return component_type(self.types, self.suppressions, section, name)
+
+
+    def set_suppressions(self, metadata):
+        """
+        Applies the suppressions of rules for individual components declared
+        in the decoded `metadata`.  Invalid suppressions are reported as a
+        network error and otherwise disregarded.
+        """
+        try:
+            self.suppressions = metadata_suppressions(metadata)
+        except ValueError as err:
+            self.suppressions = {}
+            self.errors["network"].append(PywrNetworkValidationError(f"Invalid rule suppressions: {err}"))
+
+
+    def with_ruleset(self, ruleset):
+        """
+        Returns an unparsed parser of the parser's decoded document which
+        applies `ruleset`, together with the parser's rule files and selection,
+        so that a document is decoded only once for several rulesets.  The
+        parsers share the decoded document, so any change to the data of a
+        component of one is seen by the others.
+
+        Args:
+            ruleset (str | Ruleset): The key of a ruleset, a
+                :class:`pywrparser.rules.Ruleset`, or None for the default rules
+
+        Raises:
+            PywrParserException: If there is no such ruleset
+        """
+        parser = copy.copy(self)
+        parser.errors = defaultdict(list)
+        parser.warnings = defaultdict(list)
+        parser.suppressions = {}
+        parser.set_parser_ruleset(ruleset)
+        parser.init_components()
+        return parser
+
+
+    def parse_rulesets(self, rulesets, **kwargs):
+        """
+        Parses the parser's decoded document against each of `rulesets` in
+        turn, as :meth:`parse`.  The parser itself is left unparsed.
+
+        Args:
+            rulesets (Iterable[str | Ruleset]): The keys of rulesets, or
+                :class:`pywrparser.rules.Ruleset` instances, where None denotes
+                the default rules
+            kwargs: Further arguments, as for :meth:`parse`, applied to each ruleset
+
+        Returns:
+            parsers (Dict[str, PywrJSONParser]): A parsed parser for each
+                ruleset, by ruleset key, in the order given
+
+        Raises:
+            PywrParserException: If there is no ruleset with a key of `rulesets`,
+                before any is applied
+        """
+        parsers = {}
+        for ruleset in rulesets:
+            ruleset = resolve_ruleset(ruleset)
+            if ruleset.key not in parsers:
+                parsers[ruleset.key] = self.with_ruleset(ruleset)
+
+        for parser in parsers.values():
+            parser.parse(**kwargs)
+
+        return parsers
 
 
     def parse(self, raise_on_error=False, raise_on_warning=False,
-              ignore_warnings=False, allow_duplicate_edges=True):
+              ignore_warnings=False, allow_duplicate_edges=True,
+              max_errors=None, max_warnings=None, jobs=1,
+              chunk_size=VALIDATION_CHUNK_SIZE, level=DEFAULT_VALIDATION_LEVEL):
         """
         Parse the Pywr model definition that was passed to the parser on instantiation.
         Following this action, the :py:attr:`parser.errors` and :py:attr:`parser.warnings`
@@ -125,92 +512,322 @@ class PywrJSONParser():
                 in the `warnings` return value.
             allow_duplicate_edges (bool): Specifies whether duplicate edges are
                 considered as errors or are permitted in a valid networks.
+            max_errors (int): If given, validation stops once this many errors
+                have been collected.
+            max_warnings (int): If given, validation stops once this many warnings
+                have been collected.
+            jobs (int): The number of worker processes across which the components
+                of :const:`PARALLEL_SECTIONS` are validated, in chunks of `chunk_size`
+                components. If 1, or there are no more than `chunk_size` such
+                components, all components are validated in the calling process.
+                Errors and warnings are identical, and identically ordered, in
+                either case.
+            chunk_size (int): The number of components validated by a worker at once
+            level (str): One of the levels of :mod:`pywrparser.levels`. At the
+                ``structural`` level no components are created, so no network
+                may then be created from the parser.
+
+        If validation stops early, a :class:`PywrValidationIncomplete` error is
+        added to the network errors, recording the number of components of each
+        section which were not checked, and the network is therefore invalid.
         """
-        seen_nodes = set()
-
-        """
-        Only component varies between invocations, create partial
-        for fixed arguments to context manager.
-        """
-        component_exc_capture = partial(raiseorpush,
-                                  raise_error=raise_on_error,
-                                  raise_warning=raise_on_warning,
-                                  ignore_warnings=ignore_warnings,
-                                  dest=self)
-
-        with component_exc_capture("metadata") as cc:
-            self.metadata = PywrMetadata(self.src["metadata"])
-            cc.capture_warnings(self.metadata)
-
-        with component_exc_capture("timestepper") as cc:
-            self.timestepper = PywrTimestepper(self.src["timestepper"])
-            cc.capture_warnings(self.timestepper)
-
-        for scenario in self.src.get("scenarios", []):
-            with component_exc_capture("scenarios") as cc:
-                scen = PywrScenario(scenario)
-                cc.capture_warnings(scen)
-                self.scenarios.append(scen)
-
-        for combination in self.src.get("scenario_combinations", []):
-            with component_exc_capture("scenario_combinations") as cc:
-                comb = PywrScenarioCombination(combination)
-                cc.capture_warnings(comb)
-                self.scenario_combinations.append(comb)
-
-        for table_name, table_data in self.src.get("tables", {}).items():
-            with component_exc_capture("tables") as cc:
-                t = PywrTable(table_name, table_data)
-                cc.capture_warnings(t)
-                self.tables[t.name] = t
-
-        for param_name, param_data in self.src.get("parameters", {}).items():
-            if m := re.search(DUP_KEY_RE, param_name):
-                span_end = m.span()[1]
-                raw_name = param_name[span_end+1:]
-                self.errors["network"].append(PywrNetworkValidationError(f"Duplicate parameter name <{raw_name}>"))
-            with component_exc_capture("parameters") as cc:
-                p = PywrParameter(param_name, param_data)
-                cc.capture_warnings(p)
-                self.parameters[p.name] = p
-
-        for rec_name, rec_data in self.src.get("recorders", {}).items():
-            if m := re.search(DUP_KEY_RE, rec_name):
-                span_end = m.span()[1]
-                raw_name = rec_name[span_end+1:]
-                self.errors["network"].append(PywrNetworkValidationError(f"Duplicate recorder name <{raw_name}>"))
-            with component_exc_capture("recorders") as cc:
-                r = PywrRecorder(rec_name, rec_data)
-                cc.capture_warnings(r)
-                self.recorders[r.name] = r
+        if jobs < 1:
+            raise ValueError(f"Invalid number of jobs: {jobs}")
+        if level not in VALIDATION_LEVELS:
+            raise ValueError(f"Invalid validation level: {level}")
+        self.level = level
+
+        budget = self.budget = None
+        if max_errors is not None or max_warnings is not None:
+            budget = self.budget = ValidationBudget(max_errors, max_warnings)
+
+        capture = SectionCapture(raise_error=raise_on_error,
+                                 raise_warning=raise_on_warning,
+                                 ignore_warnings=ignore_warnings,
+                                 dest=self,
+                                 budget=budget)
+
+        for duplicate in self.duplicates:
+            for _ in range(duplicate.count - 1):
+                self.errors["network"].append(PywrNetworkValidationError(duplicate.message))
+
+        if level == "structural":
+            for message in structure_errors(self.src) + reference_errors(self.src, allow_duplicate_edges):
+                self.errors["network"].append(PywrNetworkValidationError(message))
+            return
+
+        self.set_suppressions(self.src.get("metadata"))
 
         try:
-            for node in self.src["nodes"]:
-                with component_exc_capture("nodes") as cc:
-                    n = PywrNode(node)
-                    cc.capture_warnings(n)
+            if budget is not None:
+                """ Network errors found so far are charged singly, as those of components """
+                network_errors = self.errors.get("network", [])
+                for count in range(len(network_errors)):
+                    try:
+                        budget.spend_error()
+                    except PywrValidationBudgetExhausted:
+                        del network_errors[count+1:]
+                        raise
+            self.validate_components(capture, jobs, chunk_size)
+            if level == "exhaustive":
+                self.validate_inline_components(capture)
+                self.validate_constraints(capture)
+
+            if not allow_duplicate_edges and self.has_duplicate_edges:
+                for edge in self.duplicate_edges:
+                    capture.capture_network_error(PywrNetworkValidationError(f"Duplicate edge <{edge}>"))
+
+            if level == "exhaustive":
+                for message in reference_errors(self.src):
+                    capture.capture_network_error(PywrNetworkValidationError(message))
+        except PywrValidationBudgetExhausted as exhausted:
+            self.errors["network"].append(self.incomplete_error(exhausted, budget))
+
+
+    def validate_components(self, capture, jobs=1, chunk_size=VALIDATION_CHUNK_SIZE):
+        """
+        Validates the components of the network a section at a time in the
+        order of :const:`VALIDATION_ORDER`, capturing their errors and warnings
+        in `capture`.  The components of :const:`PARALLEL_SECTIONS` may be
+        validated across `jobs` worker processes, as for :meth:`parse`.
+        """
+        for section in ("metadata", "timestepper"):
+            if section in self.src:
+                capture.validate(section, [(None, self.src[section])], self.build_component,
+                                 self.store_component)
+            else:
+                capture.capture_network_error(PywrNetworkValidationError(f"Network contains no {section}"))
+
+        for section in ("scenarios", "scenario_combinations", "tables"):
+            capture.validate(section, self.section_items(section), self.build_component,
+                             self.store_component)
+
+        parallel_items = {section: self.section_items(section) for section in PARALLEL_SECTIONS}
+        if jobs > 1 and sum(len(items) for items in parallel_items.values()) > chunk_size:
+            self.validate_parallel(capture, parallel_items, jobs, chunk_size)
+        else:
+            for section, items in parallel_items.items():
+                capture.validate(section, items, self.build_component, self.store_component)
+
+        if "nodes" not in self.src:
+            capture.capture_network_error(PywrNetworkValidationError(f"Network contains no nodes"))
 
-                    if n.name in seen_nodes:
-                        self.errors["network"].append(PywrNetworkValidationError(f"Duplicate node name <{n.name}>"))
-                    else:
-                        self.nodes[n.name] = n
-                        seen_nodes.add(n.name)
-        except KeyError:
-            self.errors["network"].append(PywrNetworkValidationError(f"Network contains no nodes"))
+        if "edges" in self.src:
+            capture.validate("edges", self.section_items("edges"), self.build_component,
+                             self.store_component)
+        else:
+            capture.capture_network_error(PywrNetworkValidationError(f"Network contains no edges"))
 
 
+    def validate_inline_components(self, capture):
+        """
+        Applies the rules of parameters and recorders to those defined inline
+        by the attributes of each valid node, which are otherwise validated
+        only as part of the node.  Inline components are named as by
+        :meth:`PywrNetwork.promote_inline_parameters`, and are not stored.
+        """
+        inline = {"parameters": [], "recorders": []}
+        for node in self.nodes.values():
+            for attr, value in node.data.items():
+                if not isinstance(value, dict) or not isinstance(type_key := value.get("type"), str):
+                    continue
+                section = "recorders" if "recorder" in type_key.lower() else "parameters"
+                inline[section].append((value.get("name") or canonical_name(node.name, attr), value))
+
+        for section, items in inline.items():
+            capture.validate(section, items, self.build_component)
+
+
+    def validate_constraints(self, capture):
+        """
+        Evaluates the numeric constraints of the types of :const:`PARALLEL_SECTIONS`
+        across all valid components of each section at once, as described by
+        :mod:`pywrparser.constraints`.  The findings of each component are
+        captured in the order of the section, omitting any constraints
+        suppressed for that component.
+        """
+        constants = constant_values(self.parameters)
+        for section in PARALLEL_SECTIONS:
+            if not (constraints := self.types[section].constraints):
+                continue
+            components = list(getattr(self, section).values())
+            findings = []
+            for idx, component_findings in sorted(constraint_findings(constraints, components,
+                                                                      constants).items()):
+                inst = components[idx]
+                ctype = self.component_type(section, suppression_name(section, inst.data, inst.name))
+                if ctype.constraints is not constraints:
+                    applied = {constraint.name for constraint in ctype.constraints}
+                    component_findings = [f for f in component_findings if f.rule in applied]
+                findings += component_findings
+            capture.capture_findings(section, findings)
+
+
+    def validate_parallel(self, capture, section_items, jobs, chunk_size):
+        """
+        Validates the components given by `section_items`, a mapping from each
+        section to its `(name, data)` pairs, in chunks of `chunk_size` across
+        a pool of `jobs` processes.
+
+        Workers return only the errors and warnings of each component, and
+        valid components are then created in this process without applying
+        their rules again.  The results of each chunk are captured in order,
+        exactly as if each component had been validated in this process, so
+        that errors, warnings and any budget apply identically.  Where workers
+        are forked, they inherit the components rather than receiving them.
+        """
+        global _worker_items
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        inherit = multiprocessing.get_start_method() == "fork"
+        chunks = []
+        for section, items in section_items.items():
+            for start in range(0, len(items), chunk_size):
+                stop = start + chunk_size
+                chunks.append((section, start, stop, None if inherit else items[start:stop]))
+
+        _worker_items = section_items if inherit else None
         try:
-            for edge in self.src["edges"]:
-                with component_exc_capture("edges") as cc:
-                    e = PywrEdge(edge)
-                    cc.capture_warnings(e)
-                    self.edges.append(e)
-        except KeyError:
-            self.errors["network"].append(PywrNetworkValidationError(f"Network contains no edges"))
-
-        if not allow_duplicate_edges and self.has_duplicate_edges:
-            for edge in self.duplicate_edges:
-                self.errors["network"].append(PywrNetworkValidationError(f"Duplicate edge <{edge}>"))
+            with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)),
+                                     initializer=init_validation_worker,
+                                     initargs=(self.ruleset.key, self.rule_files,
+                                               self.selection, self.suppressions)) as executor:
+                futures = [executor.submit(validate_chunk, *chunk) for chunk in chunks]
+                try:
+                    for (section, start, stop, _), future in zip(chunks, futures):
+                        self.capture_chunk(capture, section,
+                                           section_items[section][start:stop], future.result())
+                finally:
+                    """ Discard chunks not yet started if validation stops early """
+                    for future in futures:
+                        future.cancel()
+        finally:
+            _worker_items = None
+
+
+    def capture_chunk(self, capture, section, items, results):
+        """
+        Captures the `results` of :func:`validate_chunk` for the `(name, data)`
+        `items` of `section`, creating and storing each valid component.
+        """
+        with validation_suspended():
+            capture.capture(section, self.chunk_components(section, items, results),
+                            self.store_component)
+
+
+    def chunk_components(self, section, items, results):
+        """
+        Yields each component of the `(name, data)` `items` of `section` with
+        its errors given by the `results` of :func:`validate_chunk`.  Valid
+        components are created without applying their rules again.
+        """
+        outcomes = {offset: (errors, warnings) for offset, errors, warnings in results}
+        for offset, (name, data) in enumerate(items):
+            errors, warnings = outcomes.get(offset, ((), []))
+            if errors:
+                yield None, errors
+                continue
+            ctype = self.component_type(section, suppression_name(section, data, name))
+            inst = ctype(data) if name is None else ctype(name, data)
+            inst.warnings = warnings
+            yield inst, ()
+
+
+    def section_items(self, section):
+        """
+        Returns:
+            items (List[Tuple[str, Any]]): The name, for sections in which
+                components are keyed by name, otherwise None, and the data
+                of each component of `section`, including each definition of
+                a duplicated name
+        """
+        if section in NAMED_SECTIONS:
+            if occurrences := self.tracker.occurrences.get(section):
+                return list(occurrences)
+            return list(self.src.get(section, {}).items())
+        return [(None, data) for data in self.src.get(section, [])]
+
+
+    def store_component(self, section, inst):
+        """
+        Adds the valid component `inst` to the store of its `section`.
+        """
+        if section in ("metadata", "timestepper"):
+            setattr(self, section, inst)
+        elif section == "nodes":
+            # Duplicate node names are reported by the tracker
+            if inst.name not in self.nodes:
+                self.nodes[inst.name] = inst
+        elif section in NAMED_SECTIONS:
+            getattr(self, section)[inst.name] = inst
+        else:
+            getattr(self, section).append(inst)
+
+
+    def incomplete_error(self, exhausted, budget):
+        """
+        Returns:
+            error (PywrValidationIncomplete): An error describing the components
+                left unchecked when validation stopped on exhausting a `budget`
+        """
+        unchecked = {}
+        total = 0
+        for section in VALIDATION_ORDER:
+            components = self.src.get(section)
+            if section in ("metadata", "timestepper"):
+                count = int(section in self.src)
+            elif isinstance(components, (list, dict)):
+                """ Each definition of a duplicated name is validated, as by :meth:`section_items` """
+                count = len(self.tracker.occurrences.get(section) or components)
+            else:
+                count = 0
+            total += count
+            """ Inline components are also counted as checked in their section """
+            if (remaining := count - budget.checked[section]) > 0:
+                unchecked[section] = remaining
+
+        total_unchecked = sum(unchecked.values())
+        detail = ", ".join(f"{section}: {count}" for section, count in unchecked.items())
+        message = (f"Validation stopped on reaching the limit of {exhausted.limit} {exhausted.kind}:"
+                   f" {total_unchecked} of {total} components were not checked")
+        if detail:
+            message += f" ({detail})"
+
+        return PywrValidationIncomplete(message, unchecked)
+
+
+    def build_component(self, section, data, name=None):
+        """
+        Creates an instance of the type used for components of the specified
+        `section`, thereby applying the rules of the parser to `data`.
+
+        Args:
+            section (str): The network section to which the component belongs,
+                e.g. "nodes" or "parameters"
+            data: The decoded JSON definition of the component
+            name (str): The name of the component, for sections in which components
+                are keyed by name
+
+        Returns:
+            component (PywrType): The component, which holds the findings of
+                any failed rules in its `errors` if created within
+                :func:`findings_collected`
+        """
+        ctype = self.component_type(section, suppression_name(section, data, name))
+        return ctype(data) if name is None else ctype(name, data)
+
+
+    @property
+    def duplicates(self):
+        """
+        The names which are duplicated within a section of the network, and
+        any top-level sections which are duplicated.
+
+        Returns:
+            duplicates (List[DuplicateKey]): A record of each duplicated name
+        """
+        return self.tracker.duplicates
 
 
     @property
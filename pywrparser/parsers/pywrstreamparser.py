@@ -0,0 +1,237 @@
+import json
+
+from collections import (
+    defaultdict,
+    Counter
+)
+
+from pywrparser.parsers.duplicates import DuplicateKeyTracker
+from pywrparser.parsers.jsonstream import (
+    DEFAULT_CHUNK_SIZE,
+    JSONSectionReader
+)
+from pywrparser.parsers.pywrjsonparser import (
+    NAMED_SECTIONS,
+    REQUIRED_SECTIONS,
+    PywrJSONParser,
+    component_name
+)
+from pywrparser.selection import RuleSelection
+from pywrparser.types.exceptions import (
+    PywrParserException,
+    PywrNetworkValidationError
+)
+from pywrparser.utils import SectionCapture
+
+STREAMED_SECTIONS = (
+    "scenarios",
+    "scenario_combinations",
+    "tables",
+    "parameters",
+    "recorders",
+    "nodes",
+    "edges"
+)
+
+VISIT_METHODS = {
+    "metadata": "visit_metadata",
+    "timestepper": "visit_timestepper",
+    "scenarios": "visit_scenario",
+    "scenario_combinations": "visit_scenario_combination",
+    "tables": "visit_table",
+    "parameters": "visit_parameter",
+    "recorders": "visit_recorder",
+    "nodes": "visit_node",
+    "edges": "visit_edge"
+}
+
+
+class PywrComponentVisitor():
+    """
+    Base class for visitors which receive each valid component of a network
+    as it is parsed by a :class:`PywrJSONStreamParser`.
+
+    Subclasses override the ``visit_`` methods for the components they
+    inspect; the default implementation of each method does nothing.
+    """
+    def visit(self, section, component):
+        getattr(self, VISIT_METHODS[section])(component)
+
+    def visit_metadata(self, metadata):
+        pass
+
+    def visit_timestepper(self, timestepper):
+        pass
+
+    def visit_scenario(self, scenario):
+        pass
+
+    def visit_scenario_combination(self, combination):
+        pass
+
+    def visit_table(self, table):
+        pass
+
+    def visit_parameter(self, parameter):
+        pass
+
+    def visit_recorder(self, recorder):
+        pass
+
+    def visit_node(self, node):
+        pass
+
+    def visit_edge(self, edge):
+        pass
+
+
+class PywrJSONStreamParser(PywrJSONParser):
+    def __init__(self, fp, ruleset=None, chunk_size=DEFAULT_CHUNK_SIZE, rule_files=None,
+                 select=None, ignore=None):
+        """
+        Creates an instance of a parser which incrementally reads a JSON
+        representation of a Pywr network from the file object `fp`, validating
+        each component as it is decoded.
+
+        Unlike :class:`PywrJSONParser`, the document is not read until
+        :meth:`parse` is called, and no complete decoded copy of the document
+        is held in memory.  Rules suppressed for individual components in the
+        metadata apply only to components which follow the metadata.
+
+        Args:
+            fp: A file object in text or binary mode from which the network is read
+            ruleset (str | Ruleset): The key of a ruleset whose rules are to be
+                applied, or a :class:`pywrparser.rules.Ruleset`
+            chunk_size (int): The minimum size of each read from `fp`
+            rule_files (Iterable[str]): Paths of TOML or JSON rule files whose
+                rules are applied in addition to those of `ruleset`
+            select (Iterable[str]): Glob patterns of the names of the rules and
+                warnings applied. If None, all are applied.
+            ignore (Iterable[str]): Glob patterns of the names of rules and
+                warnings which are not applied
+        """
+        self.errors = defaultdict(list)
+        self.warnings = defaultdict(list)
+        self.tracker = DuplicateKeyTracker()
+
+        self.rule_files = tuple(rule_files or ())
+        self.selection = RuleSelection(select, ignore)
+        self.suppressions = {}
+        self.set_parser_ruleset(ruleset)
+
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.edge_counts = Counter()
+        self.init_components()
+
+
+    def parse(self, raise_on_error=False, raise_on_warning=False,
+              ignore_warnings=False, allow_duplicate_edges=True,
+              visitor=None, retain_components=True):
+        """
+        Parse the Pywr model definition from the parser's file object. Each
+        component is validated as soon as it has been decoded and, if valid,
+        is passed to the `visitor`.
+
+        Args:
+            raise_on_error (bool): Specifies whether parsing errors should
+                be raised immediately as exceptions or collected in the `errors`
+                attribute.
+            raise_on_warning (bool): Specifies whether warnings encountered
+                during parsing should be raised immediately as exceptions or collected
+                in the `warnings` attribute.
+            allow_duplicate_edges (bool): Specifies whether duplicate edges are
+                considered as errors or are permitted in a valid networks.
+            visitor: Either a :class:`PywrComponentVisitor` or a callable accepting
+                `(section, component)` arguments, which is invoked for each
+                valid component.
+            retain_components (bool): If False, components are discarded once
+                validated and visited, so that memory use is bounded by the size
+                of the largest single component.  A :class:`PywrNetwork` cannot
+                then be created from the parser.
+
+        Raises:
+            PywrParserException: If the input is not a valid JSON document
+        """
+        if isinstance(visitor, PywrComponentVisitor):
+            visitor = visitor.visit
+
+        capture = SectionCapture(raise_error=raise_on_error,
+                                 raise_warning=raise_on_warning,
+                                 ignore_warnings=ignore_warnings,
+                                 dest=self)
+
+        reader = JSONSectionReader(self.fp,
+                                   stream_keys=STREAMED_SECTIONS,
+                                   chunk_size=self.chunk_size,
+                                   tracker=self.tracker)
+
+        try:
+            for section, key, data in reader:
+                if section not in VISIT_METHODS:
+                    continue
+                if key is None and section in STREAMED_SECTIONS:
+                    # A streamed section which is not a container
+                    continue
+
+                if section == "metadata":
+                    self.set_suppressions(data)
+
+                name = key if section in NAMED_SECTIONS else None
+                is_duplicate = False
+                if section in ("scenarios", "nodes"):
+                    if (cname := component_name(data)) is not None:
+                        is_duplicate = self.tracker.track(section, cname, key)
+
+                """ Components are captured as they are decoded, so one at a time """
+                components = capture.validate(section, [(name, data)], self.build_component)
+                if not components or (is_duplicate and section == "nodes"):
+                    continue
+                inst, = components
+
+                if section == "edges":
+                    self.edge_counts[(inst[0], inst[1])] += 1
+
+                if retain_components:
+                    self.store_component(section, inst)
+                if visitor:
+                    visitor(section, inst)
+        except (json.JSONDecodeError, UnicodeDecodeError) as err:
+            raise PywrParserException(f"Invalid JSON document: {str(err)}")
+
+        for duplicate in self.duplicates:
+            for _ in range(duplicate.count - 1):
+                self.errors["network"].append(PywrNetworkValidationError(duplicate.message))
+
+        for section in REQUIRED_SECTIONS:
+            if section not in reader.sections:
+                self.errors["network"].append(PywrNetworkValidationError(f"Network contains no {section}"))
+
+        if not allow_duplicate_edges and self.has_duplicate_edges:
+            for edge in self.duplicate_edges:
+                self.errors["network"].append(PywrNetworkValidationError(f"Duplicate edge <{edge}>"))
+
+
+    def store_component(self, section, inst):
+        if section in ("metadata", "timestepper"):
+            setattr(self, section, inst)
+        elif section == "nodes":
+            self.nodes[inst.name] = inst
+        elif section in ("tables", "parameters", "recorders"):
+            getattr(self, section)[inst.name] = inst
+        else:
+            getattr(self, section).append(inst)
+
+
+    @property
+    def duplicate_edges(self):
+        """
+        Return a dict of "duplicate" edges, as for :class:`PywrJSONParser`.
+        Edges are counted as they are parsed, so this is available whether or
+        not components are retained.
+
+        Returns:
+            duplicate_edges (Dict[Tuple[str, str], Int]): A mapping from each duplicate
+                edge to its multiplicity in the network
+        """
+        return {edge: count for edge, count in self.edge_counts.items() if count > 1}
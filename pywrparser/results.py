@@ -0,0 +1,47 @@
+class ValidationResult():
+    """
+    The outcome of validating a network, comprising its errors, warnings
+    and reports but not the network itself, such that it may be cheaply
+    stored and transferred between processes.
+
+    Attributes:
+        errors (Dict): The errors of an invalid network, otherwise None
+        warnings (Dict): Any warnings generated during parsing, otherwise None
+        report (Dict): The :meth:`PywrNetwork.report` of a valid network
+        verbose_report (Dict): The :meth:`PywrNetwork.verbose_report` of a valid network
+        source (Source): A description of the read of the network file, with
+            its content released, or None if the file was not read
+    """
+    __slots__ = ("errors", "warnings", "report", "verbose_report", "source")
+
+    def __init__(self, errors=None, warnings=None, report=None, verbose_report=None,
+                 source=None):
+        self.errors = errors
+        self.warnings = warnings
+        self.report = report
+        self.verbose_report = verbose_report
+        self.source = source
+
+    @classmethod
+    def from_parse(cls, network, errors, warnings, source=None):
+        """
+        Returns the result of the `network`, `errors`, and `warnings` returned by
+        a :class:`PywrNetwork` factory method.  The references of a valid `network`
+        are resolved before it is reported.
+        """
+        if not network:
+            return cls(errors, warnings, source=source)
+
+        network.add_parameter_references()
+        network.add_recorder_references()
+        network.promote_inline_parameters()
+        network.attach_reference_parameters()
+
+        return cls(errors, warnings, network.report(), network.verbose_report(), source)
+
+    @property
+    def valid(self):
+        return self.errors is None
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(valid={self.valid})"
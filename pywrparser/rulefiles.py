@@ -0,0 +1,266 @@
+"""
+Rules declared in TOML or JSON files rather than Python modules.
+
+A rule file declares a list of rules for each of the ``nodes``, ``parameters``
+and ``recorders`` sections, for example::
+
+    name = "House Rules"
+    version = "0.1.0"
+
+    [[nodes]]
+    type = "storage"
+    required = ["max_volume", "initial_volume"]
+    value_types = { max_volume = ["number", "string"] }
+
+    [[parameters]]
+    name_pattern = "^[a-z][a-z0-9_]*$"
+    level = "warning"
+
+Each rule may give:
+
+    id              The name of the rule in reports. Defaults to one derived
+                    from its section, type and position.
+    type            The component type to which the rule applies, as for
+                    :func:`pywrparser.utils.match`. If absent, the rule applies
+                    to every component of its section.
+    fuzzy           Whether `type` matches any type containing it
+    required        Keys which each component must define
+    forbidden       Keys which no component may define
+    name_pattern    A regular expression which each component name must match
+    value_types     A table from keys to the JSON type, or list of types, of
+                    their values: one of ``string``, ``number``, ``integer``,
+                    ``boolean``, ``array``, ``object`` or ``null``
+    level           ``error``, the default, or ``warning``
+    message         A message reported in place of that describing the failure
+
+Each rule is compiled once into a single checker which applies all of its
+tests to a component, and is attached to a subclass of the component type
+of its section, so that it is indexed by type as any other rule.
+"""
+import functools
+import json
+import os
+import re
+
+from pywrparser.types.exceptions import PywrParserException
+from pywrparser.utils import match
+
+""" Component sections for which rules may be declared """
+RULE_SECTIONS = ("nodes", "parameters", "recorders")
+
+""" Types of values by the JSON type names used in rule files """
+VALUE_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),)
+}
+
+RULE_KEYS = ("id", "type", "fuzzy", "required", "forbidden", "name_pattern",
+             "value_types", "level", "message")
+
+LEVELS = {"error": "rule", "warning": "warn"}
+
+
+def read_rule_file(path):
+    """
+    Returns:
+        declaration (dict): The decoded content of the TOML or JSON rule file at `path`
+
+    Raises:
+        PywrParserException: If the file cannot be read or decoded
+    """
+    path = os.fspath(path)
+    try:
+        with open(path, "rb") as fp:
+            content = fp.read()
+    except OSError as err:
+        raise PywrParserException(f"Unable to read rule file: {err}") from None
+
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise PywrParserException("TOML rule files require Python 3.11 or the tomli package") from None
+        try:
+            return tomllib.loads(content.decode())
+        except (tomllib.TOMLDecodeError, UnicodeDecodeError) as err:
+            raise PywrParserException(f"Invalid rule file {path}: {err}") from None
+
+    try:
+        declaration = json.loads(content)
+    except ValueError as err:
+        raise PywrParserException(f"Invalid rule file {path}: {err}") from None
+    if not isinstance(declaration, dict):
+        raise PywrParserException(f"Invalid rule file {path}: not an object")
+    return declaration
+
+
+def compile_checker(section, decl, index, path):
+    """
+    Compiles the rule `decl` declared at `index` in `section` into a checker,
+    a function which applies each test of the rule to a component.
+
+    Returns:
+        (name, checker): The method name and function of the checker
+    """
+    def invalid(reason):
+        return PywrParserException(f"Invalid rule file {path}: {section}[{index}] {reason}")
+
+    if not isinstance(decl, dict):
+        raise invalid("is not a table")
+    if unknown := set(decl) - set(RULE_KEYS):
+        raise invalid(f"has unknown keys: {', '.join(sorted(unknown))}")
+
+    level = decl.get("level", "error")
+    if level not in LEVELS:
+        raise invalid(f"has invalid level: {level}")
+
+    typename = decl.get("type")
+    rule_id = decl.get("id") or f"{section}_{typename or 'all'}_{index}"
+    rule_id = re.sub(r"\W", "_", str(rule_id)).lower()
+    name = f"{LEVELS[level]}_{rule_id}"
+
+    for key, kind in (("required", list), ("forbidden", list), ("value_types", dict)):
+        if not isinstance(decl.get(key, kind()), kind):
+            raise invalid(f"has invalid {key}")
+
+    required = tuple(decl.get("required", ()))
+    forbidden = frozenset(decl.get("forbidden", ()))
+    try:
+        pattern = re.compile(decl["name_pattern"]) if "name_pattern" in decl else None
+    except re.error as err:
+        raise invalid(f"has invalid name_pattern: {err}")
+    value_types = {}
+    for key, types in decl.get("value_types", {}).items():
+        types = [types] if isinstance(types, str) else types
+        if unknown := [t for t in types if t not in VALUE_TYPES]:
+            raise invalid(f"has unknown value types: {', '.join(unknown)}")
+        value_types[key] = (tuple(cls for t in types for cls in VALUE_TYPES[t]), " or ".join(types))
+    message = decl.get("message")
+    label = section[:-1].capitalize()
+
+    def checker(self):
+        data = self.data
+        failures = []
+        if missing := [key for key in required if key not in data]:
+            failures.append("does not define " + ", ".join(f"'{key}'" for key in missing))
+        if present := forbidden.intersection(data):
+            failures.append("defines forbidden " + ", ".join(f"'{key}'" for key in sorted(present)))
+        if pattern and not (isinstance(self.name, str) and pattern.fullmatch(self.name)):
+            failures.append(f"name does not match '{pattern.pattern}'")
+        for key, (classes, description) in value_types.items():
+            if key not in data:
+                continue
+            value = data[key]
+            """ bool is a subclass of int but not a JSON number """
+            if not isinstance(value, classes) or (isinstance(value, bool) and bool not in classes):
+                failures.append(f"'{key}' is not of type {description}")
+
+        assert not failures, message or f"{label} <{self.name}> " + "; ".join(failures)
+
+    checker.__name__ = checker.__qualname__ = name
+    if typename:
+        checker = match(typename, fuzzy=bool(decl.get("fuzzy", False)))(checker)
+
+    return name, checker
+
+
+class RuleFile():
+    """
+    The rules declared in a TOML or JSON rule file.
+
+    Attributes:
+        path (str): The path of the file
+        name (str): The name given by the file, otherwise its filename
+        version (str): The version given by the file, if any
+        checkers (Dict[str, Dict[str, Callable]]): The compiled checkers of each
+            section by method name
+    """
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        declaration = read_rule_file(self.path)
+        self.name = declaration.get("name", os.path.basename(self.path))
+        self.version = declaration.get("version")
+        self.checkers = {}
+
+        if unknown := set(declaration) - {"name", "version", "description", "key", *RULE_SECTIONS}:
+            raise PywrParserException(f"Invalid rule file {self.path}: unknown sections:"
+                                      f" {', '.join(sorted(unknown))}")
+
+        for section in RULE_SECTIONS:
+            decls = declaration.get(section, [])
+            if not isinstance(decls, list):
+                raise PywrParserException(f"Invalid rule file {self.path}: {section} is not a list")
+            checkers = self.checkers[section] = {}
+            for index, decl in enumerate(decls):
+                name, checker = compile_checker(section, decl, index, self.path)
+                if name in checkers:
+                    raise PywrParserException(f"Invalid rule file {self.path}: duplicate rule {name}")
+                checkers[name] = checker
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.path})"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_rule_file(path, mtime_ns, size):
+    return RuleFile(path)
+
+
+def load_rule_file(path):
+    """
+    Returns the :class:`RuleFile` at `path`, which is compiled only once
+    unless the file is modified.
+    """
+    path = os.path.abspath(os.fspath(path))
+    try:
+        stat = os.stat(path)
+    except OSError as err:
+        raise PywrParserException(f"Unable to read rule file: {err}") from None
+    return _load_rule_file(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def derive_type(base, section, rule_files):
+    """
+    Returns a subclass of `base` to which the checkers of `section` in each
+    of `rule_files` are added, or `base` itself if there are none.  Types
+    are derived once for each combination of arguments.
+    """
+    checkers = {}
+    for rule_file in rule_files:
+        checkers.update(rule_file.checkers[section])
+    if not checkers:
+        return base
+    return type(base.__name__, (base,), {"__module__": base.__module__, **checkers})
+
+
+def rule_file_types(rule_files, component_type):
+    """
+    Returns the types of each section whose components are validated by the
+    rules of `rule_files` in addition to those of its existing type.
+
+    Args:
+        rule_files (Iterable[str]): Paths of rule files, whose rules are applied
+            in the order given, so that a rule with the id of an earlier rule
+            replaces it
+        component_type (Callable[[str], type]): Returns the existing type of
+            the components of a section
+
+    Returns:
+        types (Dict[str, type]): A type for each section with declared rules
+    """
+    rule_files = tuple(load_rule_file(path) for path in rule_files)
+    types = {}
+    for section in RULE_SECTIONS:
+        base = component_type(section)
+        if (derived := derive_type(base, section, rule_files)) is not base:
+            types[section] = derived
+    return types
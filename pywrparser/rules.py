@@ -1,35 +1,143 @@
+import functools
 import importlib
-import inspect
+import threading
 
 RULESET_BASE = "pywrparser.rulesets"
+""" The entry point group under which installed packages register rulesets """
+RULESET_ENTRY_POINT_GROUP = "pywrparser.rulesets"
+""" The ruleset named in reports which are not given a ruleset explicitly """
 ACTIVE_RULESET_KEY = None
 
+""" The name of the base type of the components of each network section """
+SECTION_TYPES = {
+    "metadata": "PywrMetadata",
+    "timestepper": "PywrTimestepper",
+    "scenarios": "PywrScenario",
+    "scenario_combinations": "PywrScenarioCombination",
+    "tables": "PywrTable",
+    "parameters": "PywrParameter",
+    "recorders": "PywrRecorder",
+    "nodes": "PywrNode",
+    "edges": "PywrEdge"
+}
+
+_rulesets = {}
+_rulesets_lock = threading.Lock()
 
-def get_rulesets():
-    mods = get_ruleset_modules()
-    modules = {}
-    for mod in mods:
-        modules[mod[1].__key__] = {
-            "name": mod[1].__ruleset_name__,
-            "modpath": mod[0],
-            "version": mod[1].__version__,
-            "description": mod[1].__description__
-        }
 
-    return modules
+def ruleset_entry_points():
+    """
+    Returns:
+        entry_points (List[EntryPoint]): The entry points of installed packages
+            in the :const:`RULESET_ENTRY_POINT_GROUP` group
+    """
+    from importlib import metadata
+    try:
+        return list(metadata.entry_points(group=RULESET_ENTRY_POINT_GROUP))
+    except TypeError:
+        """ Python < 3.10 """
+        return list(metadata.entry_points().get(RULESET_ENTRY_POINT_GROUP, ()))
 
 
-def get_ruleset_modules(base=RULESET_BASE):
-    importlib.invalidate_caches()
+@functools.lru_cache(maxsize=None)
+def ruleset_loaders():
+    """
+    Discovers the available rulesets without importing them: the modules of
+    the :mod:`pywrparser.rulesets` package, keyed by module name, and those
+    registered by installed packages in the ``pywrparser.rulesets`` entry point
+    group, keyed by entry point name.  Each module must declare the same key
+    as its ``__key__``, which is verified when the module is imported.  A
+    registered ruleset does not replace a built-in ruleset of the same key.
+    Discovery takes place once per process unless :func:`refresh_rulesets`
+    is called.
+
+    Returns:
+        loaders (Dict[str, Callable[[], module]]): A function which imports
+            the module of each ruleset, by key
+    """
+    import pkgutil
+
     base = importlib.import_module(RULESET_BASE)
-    return inspect.getmembers(base, inspect.ismodule)
+    loaders = {}
+    for info in pkgutil.iter_modules(base.__path__):
+        if not info.name.startswith("_"):
+            loaders[info.name] = functools.partial(importlib.import_module,
+                                                   f"{RULESET_BASE}.{info.name}")
+    for entry_point in ruleset_entry_points():
+        loaders.setdefault(entry_point.name, entry_point.load)
+
+    return loaders
+
+
+def refresh_rulesets():
+    """
+    Discards all discovered and resolved rulesets, so that rulesets installed
+    since they were discovered become available.
+    """
+    importlib.invalidate_caches()
+    with _rulesets_lock:
+        ruleset_loaders.cache_clear()
+        get_ruleset_module.cache_clear()
+        describe_ruleset_modules.cache_clear()
+        _rulesets.clear()
+
+
+def get_ruleset_keys():
+    """
+    Returns:
+        keys (List[str]): The key of each available ruleset, without importing
+            any ruleset module
+    """
+    return list(ruleset_loaders())
+
+
+@functools.lru_cache(maxsize=None)
+def describe_ruleset_modules():
+    return {module.__key__: {
+        "name": module.__ruleset_name__,
+        "modpath": module.__name__,
+        "version": module.__version__,
+        "description": module.__description__
+    } for _, module in get_ruleset_modules()}
+
+
+def get_rulesets():
+    """
+    Returns:
+        rulesets (Dict[str, Dict]): The name, module path, version and
+            description of each available ruleset, by key. Each ruleset module
+            is imported on the first call only.
+    """
+    return {key: dict(desc) for key, desc in describe_ruleset_modules().items()}
+
+
+def get_ruleset_modules():
+    """
+    Returns:
+        modules (List[Tuple[str, module]]): The key and module of each available
+            ruleset, importing any not yet imported
+    """
+    return [(key, get_ruleset_module(key)) for key in ruleset_loaders()]
 
 
+@functools.lru_cache(maxsize=None)
 def get_ruleset_module(key):
-    modules = (m for _, m in get_ruleset_modules())
-    for module in modules:
-        if module.__key__ == key:
-            return module
+    """
+    Returns:
+        module (module): The module of the ruleset with `key`, imported on first
+            use, or None if there is no such ruleset
+
+    Raises:
+        PywrParserException: If the ``__key__`` of the module is not `key`
+    """
+    if (loader := ruleset_loaders().get(key)) is None:
+        return None
+    module = loader()
+    if getattr(module, "__key__", None) != key:
+        from pywrparser.types.exceptions import PywrParserException
+        raise PywrParserException(f"Ruleset module {module.__name__} is registered with key "
+                                  f"'{key}' but declares __key__ {getattr(module, '__key__', None)!r}")
+    return module
 
 
 def describe_rulesets():
@@ -69,6 +177,7 @@ def identify_types(module):
     if not module:
         return typemap
 
+    import inspect
     classes = inspect.getmembers(module, inspect.isclass)
     for cls in classes:
         for t in base_types:
@@ -84,6 +193,65 @@ def set_active_ruleset(key):
 
 
 class Ruleset():
-    def __init__(self):
-        module = get_ruleset_module(ACTIVE_RULESET_KEY)
+    """
+    The component types of a ruleset, resolved once and shared by every
+    parser and network to which the ruleset is applied.  Rulesets are
+    obtained with :func:`get_ruleset` rather than created directly, so that
+    each is resolved only once in a process.
+
+    Attributes:
+        key (str): The key of the ruleset, or None for the default rules
+        name (str): The name of the ruleset, as shown in reports
+        version (str): The version of the ruleset, or None for the default rules
+        typemap (Dict[str, type]): The type used for each base type, by name
+        types (Dict[str, type]): The type of the components of each network section
+    """
+    def __init__(self, key=None):
+        """
+        Args:
+            key (str): The key of a ruleset module, or None for the default rules
+
+        Raises:
+            KeyError: If there is no ruleset with `key`
+            PywrParserException: If the module of the ruleset declares a
+                different key
+        """
+        module = None
+        if key:
+            if (module := get_ruleset_module(key)) is None:
+                raise KeyError(key)
+        self.key = key
+        self.name = module.__ruleset_name__ if module else "Default"
+        self.version = module.__version__ if module else None
         self.typemap = identify_types(module)
+        self.types = {section: self.typemap[name] for section, name in SECTION_TYPES.items()}
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.key!r})"
+
+    def __reduce__(self):
+        """ Rulesets are pickled by key and resolved again by each process """
+        return get_ruleset, (self.key,)
+
+
+def get_ruleset(ruleset=None):
+    """
+    Returns the shared :class:`Ruleset` with the key `ruleset`, resolving it on
+    first use.
+
+    Args:
+        ruleset (str | Ruleset): The key of a ruleset, None for the default
+            rules, or a :class:`Ruleset`, which is returned unchanged
+
+    Raises:
+        KeyError: If there is no ruleset with the key `ruleset`
+    """
+    if isinstance(ruleset, Ruleset):
+        return ruleset
+
+    key = ruleset or None
+    if (resolved := _rulesets.get(key)) is None:
+        with _rulesets_lock:
+            if (resolved := _rulesets.get(key)) is None:
+                resolved = _rulesets[key] = Ruleset(key)
+    return resolved
@@ -1,2 +0,0 @@
-from . import pywrmaster
-from . import strict
@@ -0,0 +1,162 @@
+"""
+Selection of the rules and warnings applied by a parser.
+
+Rules and warnings are identified by their method names, such as
+``rule_type_required`` or ``warn_node_name_min_len``, or by these names
+qualified by their class, such as ``PywrNode.warn_node_name_min_len``.  The
+`select` and `ignore` options of a parser each take glob patterns which are
+matched against either form, and a rule is applied only if it matches some
+pattern of `select`, where given, and no pattern of `ignore`.
+
+Deselected rules are removed from the types used by the parser, so are never
+invoked.  The numeric constraints of types, see :mod:`pywrparser.constraints`,
+are selected by name in the same way.
+
+Rules may also be suppressed for individual components by their name, in
+the ``pywrparser`` member of the network's metadata::
+
+    "metadata": {
+        "title": "...",
+        "pywrparser": {
+            "ignore": {
+                "nodes": {"Reservoir": ["warn_*"]},
+                "parameters": {"legacy_demand": ["rule_*_has_value"]}
+            }
+        }
+    }
+
+Components may be suppressed in the sections :const:`SUPPRESSIBLE_SECTIONS`.
+"""
+import functools
+
+from fnmatch import fnmatchcase
+
+from pywrparser.utils import RuleTable
+
+""" The member of the metadata in which suppressions are declared """
+METADATA_KEY = "pywrparser"
+
+""" Sections whose components are identified by name and may be suppressed """
+SUPPRESSIBLE_SECTIONS = ("scenarios", "tables", "parameters", "recorders", "nodes")
+
+
+class RuleSelection():
+    """
+    The `select` and `ignore` patterns of a parser.  Selections are immutable
+    and hashable, so that the types derived for each are created only once.
+    """
+    __slots__ = ("select", "ignore")
+
+    def __init__(self, select=None, ignore=None):
+        """
+        Args:
+            select (Iterable[str]): Glob patterns of the rules applied. If None,
+                all rules not ignored are applied.
+            ignore (Iterable[str]): Glob patterns of rules which are not applied
+        """
+        if isinstance(select, str) or isinstance(ignore, str):
+            raise TypeError("select and ignore must be iterables of patterns")
+        self.select = tuple(select) if select is not None else None
+        self.ignore = tuple(ignore or ())
+
+    def __bool__(self):
+        """ A selection is empty if it applies every rule """
+        return self.select is not None or bool(self.ignore)
+
+    def __eq__(self, other):
+        return (isinstance(other, RuleSelection)
+                and (self.select, self.ignore) == (other.select, other.ignore))
+
+    def __hash__(self):
+        return hash((self.select, self.ignore))
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(select={self.select}, ignore={self.ignore})"
+
+    def __reduce__(self):
+        return self.__class__, (self.select, self.ignore)
+
+    def selects(self, cls, name):
+        """
+        Returns:
+            bool: Whether the rule or warning `name` of the class `cls` is applied
+        """
+        names = (name, f"{cls.__qualname__}.{name}")
+        if self.select is not None and not any(fnmatchcase(n, p) for p in self.select for n in names):
+            return False
+        return not any(fnmatchcase(n, p) for p in self.ignore for n in names)
+
+
+@functools.lru_cache(maxsize=None)
+def select_type(base, selection):
+    """
+    Returns a subclass of `base` without the rules and warnings which
+    `selection` does not apply, or `base` itself if it applies all of them.
+    Types are derived once for each combination of arguments.
+    """
+    removed = {name: None for name in RuleTable.for_class(base).names()
+               if not selection.selects(base, name)}
+    constraints = tuple(constraint for constraint in base.constraints
+                        if selection.selects(base, constraint.name))
+    if len(constraints) < len(base.constraints):
+        removed["constraints"] = constraints
+    if not removed:
+        return base
+    return type(base.__name__, (base,), {"__module__": base.__module__, **removed})
+
+
+def selected_types(types, selection):
+    """
+    Returns:
+        types (Dict[str, type]): The type of each section of `types` with
+            only the rules and warnings applied by `selection`
+    """
+    if not selection:
+        return types
+    return {section: select_type(ctype, selection) for section, ctype in types.items()}
+
+
+def metadata_suppressions(metadata):
+    """
+    Returns the rules suppressed for individual components by the ``pywrparser``
+    member of the decoded network `metadata`.
+
+    Returns:
+        suppressions (Dict[str, Dict[str, RuleSelection]]): The selection
+            applied to each component with suppressed rules, by section and
+            component name
+
+    Raises:
+        ValueError: If the suppressions are not of the form described above
+    """
+    declared = metadata.get(METADATA_KEY) if isinstance(metadata, dict) else None
+    if declared is None:
+        return {}
+    if not isinstance(declared, dict) or not isinstance(declared.get("ignore", {}), dict):
+        raise ValueError(f"metadata '{METADATA_KEY}' must be an object with an 'ignore' object")
+
+    suppressions = {}
+    for section, components in declared.get("ignore", {}).items():
+        if section not in SUPPRESSIBLE_SECTIONS:
+            raise ValueError(f"rules of {section} cannot be suppressed by name")
+        if not isinstance(components, dict):
+            raise ValueError(f"suppressions of {section} must be an object")
+        for name, patterns in components.items():
+            if (not isinstance(patterns, list)
+                    or not all(isinstance(pattern, str) for pattern in patterns)):
+                raise ValueError(f"suppressions of {section} <{name}> must be a list of patterns")
+            suppressions.setdefault(section, {})[name] = RuleSelection(ignore=patterns)
+
+    return suppressions
+
+
+def component_type(types, suppressions, section, name):
+    """
+    Returns:
+        ctype (type): The type of the component `name` of `section` among
+            `types`, without any rules suppressed for it by `suppressions`
+    """
+    ctype = types[section]
+    if name is None or (selection := suppressions.get(section, {}).get(name)) is None:
+        return ctype
+    return select_type(ctype, selection)
@@ -0,0 +1,409 @@
+"""
+A long-running validation service.
+
+Networks are submitted over HTTP, either on a localhost TCP port or on a Unix
+domain socket, and validated in a pool of worker processes which remain warm
+between requests.  A single pool serves every ruleset, as the ruleset of each
+request is passed to its parser rather than applied to the process.  Each
+ruleset is loaded once by each worker, when the worker starts for those
+preloaded and otherwise on its first request, so that requests pay neither
+interpreter startup nor ruleset loading.
+
+Requests:
+    POST /validate   The body is a Pywr network, optionally compressed. The
+                     response is the report of :func:`display.results_as_dict`.
+                     Query parameters: ``ruleset``, ``name``,
+                     ``allow_duplicate_edges``, ``ignore_warnings``, ``digest``,
+                     ``max_errors``, ``max_warnings``
+    GET /rulesets    The rulesets available, as :func:`rules.get_rulesets`
+    GET /health      The status of the service
+"""
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socketserver
+import sys
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer
+)
+from urllib.parse import (
+    parse_qs,
+    urlsplit
+)
+
+from pywrparser import (
+    rules,
+    __version__
+)
+from pywrparser.levels import VALIDATION_LEVELS
+from pywrparser.source import ContentSizeExceeded
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8470
+""" Largest request body accepted, in bytes, both as received and decompressed """
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+""" Requests admitted at once, whether validating or waiting for a worker """
+DEFAULT_MAX_PENDING = 64
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def warm_worker(rulesets):
+    """
+    Initialises a worker process by validating an empty network against each
+    of `rulesets`, so that the rulesets and the modules used by each request
+    are loaded before the first request.
+    """
+    for ruleset in rulesets:
+        validate_request(b"{}", "warm", {"ruleset": ruleset}, include_digest=True)
+
+
+def validate_request(body, name, options, include_digest=True, max_size=None):
+    """
+    Validates the network in the request `body` with the :meth:`PywrNetwork.from_file`
+    `options`, which include the key of the ruleset applied.
+
+    Returns:
+        results (Dict): The report of :func:`results_as_dict`
+
+    Raises:
+        ContentSizeExceeded: If the content of the body, once decompressed,
+            exceeds `max_size` bytes
+    """
+    from pywrparser.display import results_as_dict
+    from pywrparser.source import (
+        ContentSizeExceeded,
+        Source
+    )
+    from pywrparser.types.network import PywrNetwork
+
+    try:
+        source = Source.read(io.BytesIO(body), digest=include_digest, max_size=max_size)
+    except ContentSizeExceeded:
+        raise
+    except OSError as err:
+        from pywrparser.types.exceptions import PywrParserException
+        errors = {"network": [PywrParserException(f"Unable to read input file: {err}")]}
+        return results_as_dict(name, errors, None, include_digest=False,
+                               ruleset=options.get("ruleset"))
+
+    source.name = name
+    network, errors, warnings = PywrNetwork.from_file(source, **options)
+    return results_as_dict(name, errors, warnings, include_digest, source=source,
+                           ruleset=options.get("ruleset"))
+
+
+class ValidationService():
+    """
+    A pool of warm worker processes shared by all requests, whatever their
+    ruleset.  The rulesets named in `preload` are loaded by each worker as
+    it starts.
+
+    Workers are spawned rather than forked, as a process which forks while
+    other threads are running may inherit locks held by those threads.
+    """
+    def __init__(self, jobs=None, max_pending=DEFAULT_MAX_PENDING, preload=(None,)):
+        """
+        Args:
+            jobs (int): The number of worker processes. If None, one per CPU.
+            max_pending (int): The maximum number of requests admitted at once.
+                Further requests are refused until one completes.
+            preload (Iterable[str]): The keys of rulesets loaded by each
+                worker as it starts, where None denotes the default rules
+
+        Raises:
+            KeyError: If there is no ruleset with a key of `preload`
+        """
+        self.jobs = int(jobs) if jobs else os.cpu_count() or 1
+        self.max_pending = int(max_pending)
+        self.pending = threading.BoundedSemaphore(self.max_pending)
+        self.rulesets = rules.get_rulesets()
+        self.preload = tuple(dict.fromkeys(preload))
+        for ruleset in self.preload:
+            if ruleset is not None and ruleset not in self.rulesets:
+                raise KeyError(ruleset)
+
+        log.info(f"Starting {self.jobs} workers for rulesets: "
+                 + ", ".join(ruleset or "Default" for ruleset in self.preload))
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs,
+                                        mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=warm_worker,
+                                        initargs=(self.preload,))
+        """ Start each worker now, rather than on its first request """
+        for future in [self.pool.submit(os.getpid) for _ in range(self.jobs)]:
+            future.result()
+
+    def admit(self):
+        """
+        Returns True if a request may proceed, in which case :meth:`release`
+        must be called once it completes.
+        """
+        return self.pending.acquire(blocking=False)
+
+    def release(self):
+        self.pending.release()
+
+    def validate(self, body, name, ruleset=None, include_digest=True, max_size=None, **options):
+        """
+        Raises:
+            KeyError: If there is no such ruleset
+            ContentSizeExceeded: If the decompressed body exceeds `max_size` bytes
+        """
+        if ruleset is not None and ruleset not in self.rulesets:
+            raise KeyError(ruleset)
+        options["ruleset"] = ruleset
+        return self.pool.submit(validate_request, body, name, options, include_digest,
+                                max_size).result()
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    server_version = f"pywrparser/{__version__}"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/health":
+            service = self.server.service
+            self.send_json(HTTPStatus.OK, {
+                "status": "ok",
+                "version": __version__,
+                "rulesets": [key or "default" for key in service.preload],
+                "jobs": service.jobs,
+                "max_pending": service.max_pending
+            })
+        elif path == "/rulesets":
+            self.send_json(HTTPStatus.OK, self.server.service.rulesets)
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No such resource: {path}")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/validate":
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No such resource: {url.path}")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            self.send_error_json(HTTPStatus.LENGTH_REQUIRED, "Content-Length is required")
+            return
+        if length > self.server.max_size:
+            self.send_error_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                 f"Request exceeds {self.server.max_size} bytes")
+            return
+
+        body = self.rfile.read(length)
+        repeated = parse_qs(url.query)
+        query = {key: values[-1] for key, values in repeated.items()}
+        options = {
+            "ruleset": query.get("ruleset") or None,
+            "include_digest": query.get("digest", "true").lower() in TRUE_VALUES,
+            "allow_duplicate_edges": query.get("allow_duplicate_edges", "true").lower() in TRUE_VALUES,
+            "ignore_warnings": query.get("ignore_warnings", "false").lower() in TRUE_VALUES
+        }
+        try:
+            for budget in ("max_errors", "max_warnings"):
+                if budget in query:
+                    options[budget] = int(query[budget])
+                    if options[budget] < 1:
+                        raise ValueError
+        except ValueError:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f"Invalid {budget}: {query[budget]}")
+            return
+        if "level" in query:
+            if query["level"] not in VALIDATION_LEVELS:
+                self.send_error_json(HTTPStatus.BAD_REQUEST, f"Invalid level: {query['level']}")
+                return
+            options["level"] = query["level"]
+        if "select" in repeated:
+            options["select"] = repeated["select"]
+        if "ignore" in repeated:
+            options["ignore"] = repeated["ignore"]
+        name = query.get("name", "request")
+
+        service = self.server.service
+        if options["ruleset"] and options["ruleset"] not in service.rulesets:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f"No ruleset with key: {options['ruleset']}")
+            return
+        if not service.admit():
+            self.send_error_json(HTTPStatus.SERVICE_UNAVAILABLE,
+                                 "Too many pending requests", headers={"Retry-After": "1"})
+            return
+        try:
+            results = service.validate(body, name, max_size=self.server.max_size, **options)
+        except ContentSizeExceeded:
+            self.send_error_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                 f"Request content exceeds {self.server.max_size} bytes")
+            return
+        except Exception as err:
+            log.exception("Validation failed")
+            self.send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, f"Validation failed: {err}")
+            return
+        finally:
+            service.release()
+
+        self.send_json(HTTPStatus.OK, results)
+
+    def send_json(self, status, obj, headers=None):
+        payload = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status, message, headers=None):
+        self.send_json(status, {"error": message}, headers)
+        if self.command == "POST":
+            """ An unread request body cannot be skipped on a persistent connection """
+            self.close_connection = True
+
+    def address_string(self):
+        """ Clients of a Unix socket have no address """
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        log.info(f"{self.address_string()} {format % args}")
+
+
+class ValidationServerMixin():
+    """ Attributes of the server shared by each request handler """
+    daemon_threads = True
+
+    def configure(self, service, max_size=DEFAULT_MAX_SIZE):
+        self.service = service
+        self.max_size = int(max_size)
+        return self
+
+
+class ValidationHTTPServer(ValidationServerMixin, ThreadingHTTPServer):
+    pass
+
+
+class ValidationUnixServer(ValidationServerMixin, socketserver.ThreadingMixIn,
+                           socketserver.UnixStreamServer):
+    pass
+
+
+def create_server(service, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                  max_size=DEFAULT_MAX_SIZE):
+    """
+    Returns a server which handles requests with `service`, listening on the
+    Unix socket `socket_path` if given, otherwise on `host` and `port`.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ValidationUnixServer(socket_path, ValidationRequestHandler)
+    else:
+        server = ValidationHTTPServer((host, port), ValidationRequestHandler)
+
+    return server.configure(service, max_size=max_size)
+
+
+def configure_args(args):
+    parser = argparse.ArgumentParser(
+        prog="pywrparser serve",
+        description="Validate Pywr networks submitted over HTTP by warm worker processes."
+    )
+
+    listen = parser.add_mutually_exclusive_group()
+    listen.add_argument("--socket",
+        metavar="<path>",
+        default=None,
+        help="Listen on a Unix domain socket at this path"
+    )
+    listen.add_argument("--port",
+        metavar="<port>",
+        type=int,
+        default=DEFAULT_PORT,
+        help="Listen on this TCP port. Defaults to %(default)s"
+    )
+    parser.add_argument("--host",
+        metavar="<host>",
+        default=DEFAULT_HOST,
+        help="Address on which to listen for TCP connections. Defaults to %(default)s"
+    )
+    parser.add_argument("-j", "--jobs",
+        metavar="<N>",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs"
+    )
+    parser.add_argument("--max-pending",
+        metavar="<N>",
+        type=int,
+        default=DEFAULT_MAX_PENDING,
+        help="Number of requests admitted at once, beyond which requests are"
+        " refused with status 503. Defaults to %(default)s"
+    )
+    parser.add_argument("--max-size",
+        metavar="<bytes>",
+        type=int,
+        default=DEFAULT_MAX_SIZE,
+        help="Largest request accepted, in bytes, both as received and once"
+        " decompressed. Defaults to %(default)s"
+    )
+    parser.add_argument("--preload",
+        metavar="<ruleset>",
+        action="append",
+        default=[],
+        help="Load this ruleset in each worker as it starts. May be repeated"
+    )
+    parser.add_argument("--quiet",
+        action="store_true",
+        default=False,
+        help="Do not log each request"
+    )
+
+    return parser.parse_args(args)
+
+
+def serve(args):
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(message)s")
+
+    rulesets = rules.get_ruleset_keys()
+    for ruleset in args.preload:
+        if ruleset not in rulesets:
+            print(f"No ruleset with key: {ruleset}", file=sys.stderr)
+            sys.exit(1)
+
+    service = ValidationService(jobs=args.jobs, max_pending=args.max_pending,
+                                preload=(None, *args.preload))
+    server = create_server(service, socket_path=args.socket, host=args.host,
+                           port=args.port, max_size=args.max_size)
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    log.warning(f"pywrparser {__version__} serving on {address}")
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+def run(args=None):
+    serve(configure_args(sys.argv[2:] if args is None else args))
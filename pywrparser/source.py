@@ -0,0 +1,329 @@
+import hashlib
+import itertools
+import json
+import mmap
+import os
+import time
+
+MMAP_THRESHOLD = 32 * 1024 * 1024
+
+""" Size of each read from a file object """
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def source_name(filename):
+    """
+    Returns the name by which the input `filename` is reported, where this
+    may be either a filename, a file object, or a :class:`Source`.
+    """
+    if isinstance(filename, Source):
+        return filename.name
+    if not hasattr(filename, "read"):
+        return os.fspath(filename)
+    name = getattr(filename, "name", None)
+    if isinstance(name, str) and not name.startswith("<"):
+        return name
+    return "stdin"
+
+
+""" Leading bytes which identify each supported compression format """
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz"
+}
+MAGIC_SIZE = max(len(magic) for magic in COMPRESSION_MAGIC)
+
+
+def detect_compression(head):
+    """
+    Returns the name of the compression format of content beginning with the
+    bytes `head`, or None if the content is not compressed.
+    """
+    if not isinstance(head, (bytes, bytearray)):
+        return None
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+
+
+def decompressor(compression):
+    """
+    Returns a new incremental decompressor for the named `compression` format,
+    and the exception type it raises on invalid input.
+    """
+    if compression == "gzip":
+        import zlib
+        return zlib.decompressobj(zlib.MAX_WBITS | 16), zlib.error
+    if compression == "bz2":
+        import bz2
+        return bz2.BZ2Decompressor(), OSError
+    if compression == "xz":
+        import lzma
+        return lzma.LZMADecompressor(), lzma.LZMAError
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class ContentSizeExceeded(OSError):
+    """ Raised when the content of a source exceeds the size permitted """
+
+
+def decompress_bounded(stream, data, size):
+    """
+    Yields the output of decompressing `data` with the decompressor `stream`
+    in pieces of at most `size` bytes, until all of `data` is consumed or the
+    end of the stream is reached.  No more than `size` bytes of output are
+    held at once, however far the data expands.
+    """
+    if hasattr(stream, "unconsumed_tail"):
+        """ zlib, which holds back the input not yet decompressed """
+        while True:
+            output = stream.decompress(data, size)
+            data = stream.unconsumed_tail
+            yield output
+            if stream.eof or (not data and len(output) < size):
+                return
+    else:
+        """ bz2 and lzma, which buffer the input not yet decompressed """
+        yield stream.decompress(data, size)
+        while not stream.eof and not stream.needs_input:
+            yield stream.decompress(b"", size)
+
+
+def decompress_chunks(chunks, compression, size=READ_CHUNK_SIZE):
+    """
+    Yields the decompressed content of the compressed `chunks` in pieces of
+    at most `size` bytes.  Concatenated compressed streams, as written by
+    appending to a compressed file, are decompressed in turn.
+
+    Raises:
+        OSError: If the compressed content is invalid or truncated
+    """
+    stream, error = None, Exception
+    try:
+        for chunk in chunks:
+            while chunk:
+                if stream is None:
+                    stream, error = decompressor(compression)
+                yield from decompress_bounded(stream, chunk, size)
+                chunk = b""
+                if stream.eof:
+                    chunk, stream = stream.unused_data, None
+    except error as err:
+        raise OSError(f"Invalid {compression} input: {err}") from None
+
+    if stream is not None and not stream.eof:
+        raise OSError(f"Invalid {compression} input: content ends before the end-of-stream marker")
+
+
+def iter_chunks(fp, size=READ_CHUNK_SIZE):
+    while chunk := fp.read(size):
+        yield chunk
+
+
+def join_chunks(chunks, empty=b""):
+    """
+    Returns the concatenation of `chunks`.  Bytes are accumulated into a
+    single `bytearray` as each chunk arrives, so that the chunks are not all
+    held alongside their concatenation.
+    """
+    chunks = iter(chunks)
+    head = next(chunks, None)
+    if head is None:
+        return empty
+    if isinstance(head, str):
+        return head + "".join(chunks)
+    content = bytearray(head)
+    for chunk in chunks:
+        content += chunk
+    return content
+
+
+class ChunkDigest():
+    """
+    The running sha256 digest and size in bytes of content which is read
+    in chunks.  Text is digested as UTF-8.
+    """
+    __slots__ = ("sha256", "size")
+
+    def __init__(self, digest=True):
+        self.sha256 = hashlib.sha256() if digest else None
+        self.size = 0
+
+    def update(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8", "surrogatepass")
+        self.size += len(data)
+        if self.sha256:
+            self.sha256.update(data)
+
+    def digest_chunks(self, chunks, max_size=None):
+        """
+        Yields each of `chunks` once it has been digested.
+
+        Raises:
+            ContentSizeExceeded: Once the size of the chunks exceeds `max_size`
+                bytes, if given
+        """
+        for chunk in chunks:
+            self.update(chunk)
+            if max_size is not None and self.size > max_size:
+                raise ContentSizeExceeded(f"Content exceeds {max_size} bytes")
+            yield chunk
+
+    def hexdigest(self):
+        return self.sha256.hexdigest() if self.sha256 else None
+
+
+class Source():
+    """
+    The content of an input file, read exactly once, together with the
+    sha256 digest and size of the bytes read and the time taken to read them.
+
+    Compressed input is decompressed as it is read, in which case the digest
+    and size of both the compressed bytes read and the decompressed content
+    are recorded.  For uncompressed input, these are the same.
+
+    Attributes:
+        name (str): The name by which the input is reported
+        content (str | bytes | bytearray | mmap.mmap): The undecoded, decompressed content
+            of the file, or None once released
+        sha256 (str): The hex digest of the bytes read, or None if not computed
+        size (int): The number of bytes read
+        read_time (float): The time taken to read, decompress and digest the
+            content, in seconds
+        compression (str): The compression format of the input, if any
+        content_sha256 (str): The hex digest of the decompressed content, or None
+            if not computed
+        content_size (int): The size in bytes of the decompressed content
+    """
+    __slots__ = ("name", "content", "sha256", "size", "read_time",
+                 "compression", "content_sha256", "content_size")
+
+    def __init__(self, name, content=None, sha256=None, size=None, read_time=None,
+                 compression=None, content_sha256=None, content_size=None):
+        self.name = name
+        self.content = content
+        self.sha256 = sha256
+        self.size = size
+        self.read_time = read_time
+        self.compression = compression
+        self.content_sha256 = content_sha256 if compression else sha256
+        self.content_size = content_size if compression else size
+
+    @classmethod
+    def read(cls, filename, mmap_threshold=MMAP_THRESHOLD, digest=True, max_size=None):
+        """
+        Reads the content of `filename` without any intermediate text decoding.
+        Files of at least `mmap_threshold` bytes are memory-mapped, so that their
+        content is shared through the page cache rather than copied into the
+        process.  The content should be released by the caller once parsed.
+
+        Input compressed with gzip, bz2 or xz is identified by its leading bytes,
+        whatever its filename, and is decompressed in chunks as it is read.
+
+        Args:
+            filename (str | PathLike | file object): The file to be read. File
+                objects, including stdin, are read in their entirety in chunks
+                which are digested as each is read.
+            mmap_threshold (int): The minimum size in bytes of an uncompressed file
+                which is memory-mapped.  If None, files are never memory-mapped.
+            digest (bool): Whether the sha256 digest of the content is computed
+            max_size (int): The largest size in bytes of the decompressed content
+                which is read.  Reading stops once this is exceeded, however
+                small the compressed input.  If None, content of any size is read.
+
+        Returns:
+            source (Source): The content read from `filename`
+
+        Raises:
+            ContentSizeExceeded: If the content exceeds `max_size`
+            OSError: If the file cannot be read, or its compressed content is invalid
+        """
+        start = time.perf_counter()
+        raw = ChunkDigest(digest)
+
+        if hasattr(filename, "read"):
+            chunks = iter_chunks(filename)
+            head = next(chunks, None)
+            if head is None:
+                return cls(source_name(filename), filename.read(), raw.hexdigest(), 0,
+                           read_time=time.perf_counter() - start)
+            chunks = itertools.chain((head,), chunks)
+            compression = detect_compression(head)
+            if compression:
+                return cls.read_compressed(filename, chunks, compression, raw, start, max_size)
+            content = join_chunks(raw.digest_chunks(chunks, max_size))
+        else:
+            with open(filename, "rb") as fp:
+                if compression := detect_compression(fp.read(MAGIC_SIZE)):
+                    fp.seek(0)
+                    return cls.read_compressed(filename, iter_chunks(fp), compression, raw,
+                                               start, max_size)
+                fp.seek(0)
+                size = os.fstat(fp.fileno()).st_size
+                if max_size is not None and size > max_size:
+                    raise ContentSizeExceeded(f"Content exceeds {max_size} bytes")
+                if mmap_threshold is not None and 0 < size and mmap_threshold <= size:
+                    content = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    content = fp.read()
+            raw.update(content)
+
+        return cls(source_name(filename), content, raw.hexdigest(), raw.size,
+                   read_time=time.perf_counter() - start)
+
+    @classmethod
+    def read_compressed(cls, filename, chunks, compression, raw, start, max_size=None):
+        logical = ChunkDigest(raw.sha256 is not None)
+        decompressed = decompress_chunks(raw.digest_chunks(chunks), compression)
+        content = join_chunks(logical.digest_chunks(decompressed, max_size))
+
+        return cls(source_name(filename), content, raw.hexdigest(), raw.size,
+                   read_time=time.perf_counter() - start,
+                   compression=compression,
+                   content_sha256=logical.hexdigest(),
+                   content_size=logical.size)
+
+    def release(self):
+        """
+        Releases the content of the source, and any resources it holds,
+        retaining its description.
+        """
+        if isinstance(self.content, mmap.mmap):
+            self.content.close()
+        self.content = None
+
+    def as_dict(self):
+        source = {
+            "name": self.name,
+            "sha256": self.sha256,
+            "size": self.size,
+            "read_time": self.read_time
+        }
+        if self.compression:
+            source["compression"] = self.compression
+            source["content_sha256"] = self.content_sha256
+            source["content_size"] = self.content_size
+
+        return source
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.name}, {self.size})"
+
+
+def as_json_text(json_src):
+    """
+    Returns `json_src` in a form accepted by :func:`json.loads`.
+
+    Values of `str`, `bytes` and `bytearray` are returned unchanged.  Other
+    objects supporting the buffer protocol, such as `memoryview` and `mmap`,
+    are decoded directly from their buffer, using the same encoding detection
+    as :func:`json.loads`, without an intermediate `bytes` copy.
+    """
+    if isinstance(json_src, (str, bytes, bytearray)):
+        return json_src
+
+    with memoryview(json_src) as view:
+        encoding = json.detect_encoding(bytes(view[:4]))
+        return str(view, encoding, "surrogatepass")
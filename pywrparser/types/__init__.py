@@ -1,13 +1,11 @@
 from pywrparser import rules
 
-rs = rules.Ruleset()
 
-PywrTimestepper = rs.typemap["PywrTimestepper"]
-PywrMetadata = rs.typemap["PywrMetadata"]
-PywrScenario = rs.typemap["PywrScenario"]
-PywrScenarioCombination = rs.typemap["PywrScenarioCombination"]
-PywrTable = rs.typemap["PywrTable"]
-PywrParameter = rs.typemap["PywrParameter"]
-PywrRecorder = rs.typemap["PywrRecorder"]
-PywrNode = rs.typemap["PywrNode"]
-PywrEdge = rs.typemap["PywrEdge"]
+def __getattr__(name):
+    """
+    The default component types, resolved on first use so that importing a
+    module of this package does not import every component type.
+    """
+    if name in rules.SECTION_TYPES.values():
+        return rules.get_ruleset().typemap[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,12 +3,24 @@ import json
 from abc import ABC
 from typing import Dict
 
-from pywrparser.utils import PywrTypeValidator
+from pywrparser.utils import (
+    PywrTypeValidator,
+    RuleTable
+)
 
 
 class PywrType(ABC):
 
     data = PywrTypeValidator()
+    """ The failures of the rules of a component created while findings are collected """
+    errors = ()
+    """ The numeric constraints evaluated across all components of the type at once """
+    constraints = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """ Collect the rules of each class once, when it is defined """
+        super().__init_subclass__(**kwargs)
+        RuleTable.for_class(cls)
 
     def as_dict(self) -> Dict[str, Dict]:
         return self.data
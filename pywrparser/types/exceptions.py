@@ -11,6 +11,12 @@ class PywrParserException(Exception):
     def __repr__(self):
         return f"{self.__class__.__qualname__}({self.message})"
 
+    def as_dict(self):
+        return {
+            "component": "network",
+            "message": self.message
+        }
+
 
 class PywrTypeValidationError(PywrParserException):
     desc_text = "[FAILURE]"
@@ -19,7 +25,16 @@ class PywrTypeValidationError(PywrParserException):
         self.component = component
         self.rule = rule
         self.exc = exc
-        self.valuetext = valuetext
+        self._valuetext = valuetext
+
+    @property
+    def valuetext(self):
+        """ The value text may be rendered lazily, see :class:`utils.ValueText` """
+        return str(self._valuetext)
+
+    def __reduce__(self):
+        """ Pickle the rendered value text rather than the value itself """
+        return self.__class__, (self.component, self.rule, self.exc, self.valuetext)
 
     def __str__(self):
         return f"{self.desc_text} {self.component} '{self.rule}' -> {self.exc}:\n          {self.valuetext}"
@@ -61,3 +76,32 @@ class PywrNetworkValidationError(PywrParserException):
             "component": self.component,
             "message": self.message
         }
+
+
+class PywrValidationIncomplete(PywrNetworkValidationError):
+    """
+    Validation of a network stopped once its budget of errors or warnings
+    was exhausted, leaving the components counted in `unchecked` unvalidated.
+    """
+    def __init__(self, message, unchecked):
+        super().__init__(message)
+        self.unchecked = unchecked
+
+    def as_dict(self):
+        return {
+            "component": self.component,
+            "message": self.message,
+            "unchecked": self.unchecked
+        }
+
+
+class PywrValidationBudgetExhausted(Exception):
+    """
+    Raised within a parser when the number of errors or warnings collected
+    reaches the limit given for that `kind`.  This is not a validation
+    failure and is always handled by the parser.
+    """
+    def __init__(self, kind, limit):
+        super().__init__(kind, limit)
+        self.kind = kind
+        self.limit = limit
@@ -0,0 +1,89 @@
+"""
+Compact records of the failures of rules and warnings.
+
+A parser may collect many thousands of failures, so each is recorded as a
+:class:`PywrValidationFinding` rather than as an exception.  A finding
+retains only the message of the failed assertion, not the assertion itself
+and its traceback, and is converted to the equivalent
+:class:`PywrTypeValidationError` or :class:`PywrTypeValidationWarning` by
+:meth:`PywrValidationFinding.exception` only when it is to be raised.
+
+Findings are reported identically to those exceptions.
+"""
+from .exceptions import PywrTypeValidationError
+from .warnings import PywrTypeValidationWarning
+
+
+class PywrValidationFinding():
+    __slots__ = ("component", "rule", "message", "_valuetext")
+
+    desc_text = None
+    exception_type = None
+
+    def __init__(self, component, rule, message, valuetext):
+        """
+        Args:
+            component (str): The name of the class of the component
+            rule (str): The name of the rule or warning which failed
+            message (str): The message of the failed assertion
+            valuetext: The value of the component, or a :class:`utils.ValueText`
+                which renders it
+        """
+        self.component = component
+        self.rule = rule
+        self.message = message
+        self._valuetext = valuetext
+
+    @property
+    def exc(self):
+        """ The message of the failure, as shown in place of its exception """
+        return self.message
+
+    @property
+    def valuetext(self):
+        """ The value text may be rendered lazily, see :class:`utils.ValueText` """
+        return str(self._valuetext)
+
+    def __reduce__(self):
+        """ Pickle the rendered value text rather than the value itself """
+        return self.__class__, (self.component, self.rule, self.message, self.valuetext)
+
+    def __str__(self):
+        return f"{self.desc_text} {self.component} '{self.rule}' -> {self.message}:\n          {self.valuetext}"
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.component}, {self.rule}, {self.message})"
+
+    def as_dict(self):
+        return {
+            "component": self.component,
+            "rule": self.rule,
+            "exception": self.message,
+            "value": self.valuetext
+        }
+
+    def exception(self):
+        """
+        Returns:
+            exc: The exception equivalent to the finding, for raising
+        """
+        return self.exception_type(self.component, self.rule, AssertionError(self.message), self._valuetext)
+
+
+class PywrErrorFinding(PywrValidationFinding):
+    __slots__ = ()
+
+    desc_text = PywrTypeValidationError.desc_text
+    exception_type = PywrTypeValidationError
+
+
+class PywrWarningFinding(PywrValidationFinding):
+    __slots__ = ()
+
+    desc_text = PywrTypeValidationWarning.desc_text
+    exception_type = PywrTypeValidationWarning
+
+    @property
+    def warning(self):
+        """ The name of the warning, as for :class:`PywrTypeValidationWarning` """
+        return self.rule
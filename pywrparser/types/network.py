@@ -1,16 +1,23 @@
-import io
 import logging
 
 from collections import Counter, defaultdict
 from functools import partialmethod
 
-from pywrparser.parsers import PywrJSONParser
-
-from pywrparser.types import (
-    PywrParameter,
-    PywrRecorder
+from pywrparser.parsers import (
+    PywrJSONParser,
+    PywrJSONStreamParser
 )
+from pywrparser.parsers.pywrjsonparser import resolve_ruleset
+
+from pywrparser.types.parameter import PywrParameter
+from pywrparser.types.recorder import PywrRecorder
+from pywrparser.jsonbackend import get_backend
+from pywrparser.levels import DEFAULT_VALIDATION_LEVEL
 from pywrparser.types.exceptions import PywrParserException
+from pywrparser.source import (
+    MMAP_THRESHOLD,
+    Source
+)
 
 from pywrparser.utils import (
     canonical_name,
@@ -26,6 +33,8 @@ class PywrNetwork():
     """
 
     def __init__(self, parser):
+        self.ruleset = parser.ruleset
+        self.types = parser.types
         self.metadata = parser.metadata
         self.timestepper = parser.timestepper
         self.scenarios = parser.scenarios
@@ -39,7 +48,11 @@ class PywrNetwork():
     @classmethod
     def from_file(cls, filename, raise_on_parser_error=False,
                   raise_on_parser_warning=False, ignore_warnings=False,
-                  allow_duplicate_edges=True, ruleset=None):
+                  allow_duplicate_edges=True, ruleset=None,
+                  mmap_threshold=MMAP_THRESHOLD, json_backend=None,
+                  max_errors=None, max_warnings=None, component_jobs=1,
+                  rule_files=None, select=None, ignore=None,
+                  level=DEFAULT_VALIDATION_LEVEL):
         """
         Returns either the valid PywrNetwork contained in the file denoted
         by the `filename` argument, or corresponding errors encountered during
@@ -47,7 +60,9 @@ class PywrNetwork():
 
         Args:
             filename (str): The filename of a file containing a JSON definition
-                of a Pywr network.
+                of a Pywr network, a file object in text or binary mode from
+                which the definition is read, or a :class:`pywrparser.source.Source`
+                which has already been read, whose content is released once parsed.
             raise_on_parser_error (bool): Specifies whether parsing errors should
                 be raised immediately as exceptions or collected in the `errors` return
                 value.
@@ -56,21 +71,50 @@ class PywrNetwork():
                 in the `warnings` return value.
             allow_duplicate_edges (bool): Specifies whether duplicate edges are
                 considered as errors or are permitted in a valid networks.
-            ruleset (str): The `key` of a valid ruleset. This ruleset will then be
-                applied during parsing.
+            ruleset (str | Ruleset): The `key` of a valid ruleset, or a
+                :class:`pywrparser.rules.Ruleset`. This ruleset will then be applied
+                during parsing, and to any components created by the network.
+                A list of rulesets may instead be given, against each of which
+                the network is validated, decoding the file only once.
+            mmap_threshold (int): Files of at least this many bytes are memory-mapped
+                rather than read. If None, files are always read.
+            json_backend (str): The name of the JSON backend used to decode the
+                file. By default the fastest installed backend is used.
+            max_errors (int): If given, validation stops once this many errors
+                have been collected, and the components left unchecked are reported
+                by a :class:`PywrValidationIncomplete` network error.
+            max_warnings (int): If given, validation stops once this many warnings
+                have been collected, as for `max_errors`.
+            component_jobs (int): The number of worker processes across which the
+                parameters, recorders and nodes of a large network are validated.
+                By default, all components are validated in the calling process.
+            rule_files (Iterable[str]): Paths of TOML or JSON rule files whose
+                rules are applied in addition to those of `ruleset`.
+            select (Iterable[str]): Glob patterns of the names of the rules and
+                warnings applied, as described in :mod:`pywrparser.selection`.
+                If None, all are applied.
+            ignore (Iterable[str]): Glob patterns of the names of rules and
+                warnings which are not applied.
+            level (str): The level of validation: ``structural``, ``standard``
+                or ``exhaustive``, as for :meth:`PywrJSONParser.parse`. At the
+                ``structural`` level no network is created, so a structurally
+                valid network returns None for both `network` and `errors`.
 
         Returns:
             network, errors, warnings (:class:`Tuple[PywrNetwork, Dict, Dict]`):
                 in which either one of `network` or `errors` is not None. `warnings` may
                 be present in either case.
+            If a list of rulesets is given, a dict of these tuples by ruleset key,
+                in which the default rules have the key None. The networks of
+                each share the decoded data of their components.
 
         """
+        rulesets = ruleset if isinstance(ruleset, (list, tuple)) else None
         try:
-            if isinstance(filename, io.StringIO):
-                json_src = filename.read()
+            if isinstance(filename, Source):
+                source = filename
             else:
-                with open(filename, 'r') as fp:
-                    json_src = fp.read()
+                source = Source.read(filename, mmap_threshold=mmap_threshold, digest=False)
         except OSError as err:
             err_txt = f"Unable to read input file: {err}"
             log.error(err_txt)
@@ -78,38 +122,118 @@ class PywrNetwork():
             if raise_on_parser_error:
                 raise exc from None
             else:
-                return None, {"network": [exc]}, None
+                return cls.failure(exc, rulesets)
 
         try:
-            parser = PywrJSONParser(json_src, ruleset)
+            if rulesets:
+                rulesets = [resolve_ruleset(ruleset) for ruleset in rulesets]
+            parser = PywrJSONParser(source.content, rulesets[0] if rulesets else ruleset,
+                                    json_backend=json_backend, rule_files=rule_files,
+                                    select=select, ignore=ignore)
         except PywrParserException as exc:
             if raise_on_parser_error:
                 raise exc from None
             else:
-                return None, {"network": [exc]}, None
+                return cls.failure(exc, rulesets)
+        finally:
+            source.release()
+
+        return cls.parse_results(parser, rulesets,
+                                 raise_on_error=raise_on_parser_error,
+                                 raise_on_warning=raise_on_parser_warning,
+                                 ignore_warnings=ignore_warnings,
+                                 allow_duplicate_edges=allow_duplicate_edges,
+                                 max_errors=max_errors,
+                                 max_warnings=max_warnings,
+                                 jobs=component_jobs,
+                                 level=level)
+
+    @classmethod
+    def parse_results(cls, parser, rulesets=None, **kwargs):
+        """
+        Parses the document of `parser` with the :meth:`PywrJSONParser.parse`
+        arguments `kwargs`, against its own ruleset or, if given, each of
+        `rulesets`.
 
-        parser.parse(raise_on_error=raise_on_parser_error,
-                     raise_on_warning=raise_on_parser_warning,
-                     ignore_warnings=ignore_warnings,
-                     allow_duplicate_edges=allow_duplicate_edges)
+        Returns:
+            results: The result of :meth:`from_file`
+        """
+        if rulesets is None:
+            parser.parse(**kwargs)
+            return cls.from_parser(parser)
+
+        return {key: cls.from_parser(parsed)
+                for key, parsed in parser.parse_rulesets(rulesets, **kwargs).items()}
+
+    @classmethod
+    def from_parser(cls, parser):
+        """
+        Returns:
+            network, errors, warnings (:class:`Tuple[PywrNetwork, Dict, Dict]`):
+                The result of the parsed `parser`, as for :meth:`from_file`
+        """
         ret_warnings = parser.warnings if parser.has_warnings else None
         if parser.has_errors:
             return None, parser.errors, ret_warnings
+        if parser.level == "structural":
+            return None, None, ret_warnings
 
         return cls(parser), None, parser.warnings
 
+    @staticmethod
+    def failure(exc, rulesets=None):
+        """
+        Returns:
+            The result of :meth:`from_file` for a network which could not be
+            read or decoded, as reported by `exc`, for each of any `rulesets`
+        """
+        if rulesets is None:
+            return None, {"network": [exc]}, None
+        keys = (getattr(ruleset, "key", ruleset) for ruleset in rulesets)
+        return {key: (None, {"network": [exc]}, None) for key in keys}
+
+    @classmethod
+    def from_files(cls, filenames, jobs=None, **kwargs):
+        """
+        Parses each of several files, distributing these across a pool of
+        worker processes, and yields the result for each file in the order
+        given as it becomes available.
+
+        Args:
+            filenames (Iterable[str]): The filenames of files containing JSON
+                definitions of Pywr networks. Directories and glob patterns may
+                be expanded into filenames with :func:`pywrparser.batch.expand_paths`.
+            jobs (int): The number of worker processes. If None, one process per
+                CPU is used. If 1, files are parsed in the calling process.
+            kwargs: Further arguments, as for :meth:`from_file`, applied to each
+                file, save that only a single `ruleset` may be given
+
+        Returns:
+            results (Iterator[Tuple[str, PywrNetwork, Dict, Dict]]): A `filename`,
+                `network`, `errors`, and `warnings` tuple for each file, in which
+                the latter three are as returned by :meth:`from_file`.
+
+        Raises:
+            ValueError: If a list of rulesets is given
+        """
+        from pywrparser.batch import validate_files
+        return validate_files(filenames, jobs=jobs, **kwargs)
+
     @classmethod
     def from_json(cls, json_src, raise_on_parser_error=False,
                   raise_on_parser_warning=False, ignore_warnings=False,
-                  allow_duplicate_edges=True, ruleset=None):
+                  allow_duplicate_edges=True, ruleset=None, json_backend=None,
+                  max_errors=None, max_warnings=None, component_jobs=1,
+                  rule_files=None, select=None, ignore=None,
+                  level=DEFAULT_VALIDATION_LEVEL):
         """
         Returns either the valid PywrNetwork represented by the JSON encoded string
         contained in the `json_src` argument, or corresponding errors encountered
         during parsing.
 
         Args:
-            json_src (str): A string containing a JSON encoded representation of
-                a Pywr network.
+            json_src (str | bytes | bytearray | memoryview | mmap.mmap): A string
+                or buffer containing a JSON encoded representation of a Pywr network.
             raise_on_parser_error (bool): Specifies whether parsing errors should
                 be raised immediately as exceptions or collected in the `errors` return
                 value.
@@ -118,25 +242,114 @@ class PywrNetwork():
                 in the `warnings` return value.
             allow_duplicate_edges (bool): Specifies whether duplicate edges are
                 considered as errors or are permitted in a valid networks.
-            ruleset (str): The `key` of a valid ruleset. This ruleset will then be
-                applied during parsing.
+            ruleset (str | Ruleset): The `key` of a valid ruleset, or a
+                :class:`pywrparser.rules.Ruleset`. This ruleset will then be applied
+                during parsing, and to any components created by the network.
+                A list of rulesets may instead be given, against each of which
+                the network is validated, decoding the file only once.
+            json_backend (str): The name of the JSON backend used to decode
+                `json_src`. By default the fastest installed backend is used.
+            max_errors (int): If given, validation stops once this many errors
+                have been collected, and the components left unchecked are reported
+                by a :class:`PywrValidationIncomplete` network error.
+            max_warnings (int): If given, validation stops once this many warnings
+                have been collected, as for `max_errors`.
+            component_jobs (int): The number of worker processes across which the
+                parameters, recorders and nodes of a large network are validated.
+                By default, all components are validated in the calling process.
+            rule_files (Iterable[str]): Paths of TOML or JSON rule files whose
+                rules are applied in addition to those of `ruleset`.
+            select (Iterable[str]): Glob patterns of the names of the rules and
+                warnings applied, as described in :mod:`pywrparser.selection`.
+                If None, all are applied.
+            ignore (Iterable[str]): Glob patterns of the names of rules and
+                warnings which are not applied.
+            level (str): The level of validation: ``structural``, ``standard``
+                or ``exhaustive``, as for :meth:`PywrJSONParser.parse`. At the
+                ``structural`` level no network is created, so a structurally
+                valid network returns None for both `network` and `errors`.
 
         Returns:
             network, errors, warnings (:class:`Tuple[PywrNetwork, Dict, Dict]`):
                 in which either one of `network` or `errors` is not None. `warnings` may
                 be present in either case.
+            If a list of rulesets is given, a dict of these tuples by ruleset key,
+                in which the default rules have the key None. The networks of
+                each share the decoded data of their components.
 
         """
-        parser = PywrJSONParser(json_src, ruleset=ruleset)
-        parser.parse(raise_on_error=raise_on_parser_error,
-                     raise_on_warning=raise_on_parser_warning,
-                     ignore_warnings=ignore_warnings,
-                     allow_duplicate_edges=allow_duplicate_edges)
-        ret_warnings = parser.warnings if parser.has_warnings else None
-        if parser.has_errors:
-            return None, parser.errors, ret_warnings
+        rulesets = ruleset if isinstance(ruleset, (list, tuple)) else None
+        parser = PywrJSONParser(json_src, rulesets[0] if rulesets else ruleset,
+                                json_backend=json_backend, rule_files=rule_files,
+                                select=select, ignore=ignore)
+        return cls.parse_results(parser, rulesets,
+                                 raise_on_error=raise_on_parser_error,
+                                 raise_on_warning=raise_on_parser_warning,
+                                 ignore_warnings=ignore_warnings,
+                                 allow_duplicate_edges=allow_duplicate_edges,
+                                 max_errors=max_errors,
+                                 max_warnings=max_warnings,
+                                 jobs=component_jobs,
+                                 level=level)
 
-        return cls(parser), None, parser.warnings
+
+    @classmethod
+    def from_stream(cls, fp, raise_on_parser_error=False,
+                    raise_on_parser_warning=False, ignore_warnings=False,
+                    allow_duplicate_edges=True, ruleset=None, visitor=None,
+                    rule_files=None, select=None, ignore=None):
+        """
+        Returns either the valid PywrNetwork read incrementally from the file
+        object `fp`, or corresponding errors encountered during parsing.
+
+        Each component is validated as it is decoded, so that a complete decoded
+        copy of the document is never held in memory alongside the network.
+
+        Args:
+            fp: A file object, in text or binary mode, containing a JSON encoded
+                representation of a Pywr network.
+            raise_on_parser_error (bool): Specifies whether parsing errors should
+                be raised immediately as exceptions or collected in the `errors` return
+                value.
+            raise_on_parser_warning (bool): Specifies whether warnings encountered
+                during parsing should be raised immediately as exceptions or collected
+                in the `warnings` return value.
+            allow_duplicate_edges (bool): Specifies whether duplicate edges are
+                considered as errors or are permitted in a valid networks.
+            ruleset (str | Ruleset): The `key` of a valid ruleset, or a
+                :class:`pywrparser.rules.Ruleset`. This ruleset will then be applied
+                during parsing, and to any components created by the network.
+            visitor: An optional :class:`PywrComponentVisitor` or callable which is
+                passed each valid component as it is parsed.
+            rule_files (Iterable[str]): Paths of TOML or JSON rule files whose
+                rules are applied in addition to those of `ruleset`.
+            select (Iterable[str]): Glob patterns of the names of the rules and
+                warnings applied, as described in :mod:`pywrparser.selection`.
+                If None, all are applied.
+            ignore (Iterable[str]): Glob patterns of the names of rules and
+                warnings which are not applied.
+
+        Returns:
+            network, errors, warnings (:class:`Tuple[PywrNetwork, Dict, Dict]`):
+                in which either one of `network` or `errors` is not None. `warnings` may
+                be present in either case.
+
+        """
+        parser = PywrJSONStreamParser(fp, ruleset=ruleset, rule_files=rule_files,
+                                      select=select, ignore=ignore)
+        try:
+            parser.parse(raise_on_error=raise_on_parser_error,
+                         raise_on_warning=raise_on_parser_warning,
+                         ignore_warnings=ignore_warnings,
+                         allow_duplicate_edges=allow_duplicate_edges,
+                         visitor=visitor)
+        except PywrParserException as exc:
+            if raise_on_parser_error or raise_on_parser_warning:
+                raise exc from None
+            else:
+                return None, {"network": [exc]}, None
+
+        return cls.from_parser(parser)
 
 
     def as_dict(self):
@@ -169,14 +382,17 @@ class PywrNetwork():
         return network
 
 
-    def as_json(self):
+    def as_json(self, json_backend=None):
         """
+        Args:
+            json_backend (str): The name of the JSON backend used for encoding.
+                By default the fastest installed backend is used.
+
         Returns:
             network (str): A JSON encoded representation of the :class:`PywrNetwork`
                 instance.
         """
-        import json
-        return json.dumps(self.as_dict(), indent=2)
+        return get_backend(json_backend).dumps(self.as_dict(), indent=2)
 
 
     def validate(self):
@@ -212,7 +428,7 @@ class PywrNetwork():
                     if param_name in self.parameters:
                         # Node inline param has same name as global param
                         raise ValueError("inline dups global param")
-                    param = PywrParameter(param_name, value)
+                    param = self.types["parameters"](param_name, value)
                     node.data[attr] = param
 
     def promote_inline_recorders(self):
@@ -238,7 +454,7 @@ class PywrNetwork():
                     if rec_name in self.recorders:
                         # Node inline recorder has same name as global recorder
                         raise ValueError("inline dups global recorder")
-                    recorder = PywrRecorder(rec_name, value)
+                    recorder = self.types["recorders"](rec_name, value)
                     node.data[attr] = recorder
 
     def attach_reference_parameters(self):
@@ -267,7 +483,7 @@ class PywrNetwork():
                     node.data[attr] = param
                     attached_parameters.append(value)
 
-        for attached_parameter in attached_parameters:
+        for attached_parameter in set(attached_parameters):
             del(self.parameters[attached_parameter])
 
     def attach_reference_recorders(self):
@@ -296,7 +512,7 @@ class PywrNetwork():
                     node.data[attr] = recorder
                     attached_recorders.append(value)
 
-        for attached_recorder in attached_recorders:
+        for attached_recorder in set(attached_recorders):
             del(self.recorders[attached_recorder])
 
 
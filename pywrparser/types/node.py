@@ -1,6 +1,7 @@
 import copy
 
 from .base import PywrType
+from pywrparser.constraints import Constraint
 from pywrparser.utils import match
 
 
@@ -63,3 +64,22 @@ class PywrNode(PywrType):
     @match("storage")
     def warn_storage_has_max_volume(self):
         assert "max_volume" in self.data, "<storage> node does not define 'max_volume'"
+
+    """ Numeric constraints """
+
+    constraints = (
+        Constraint("rule_node_max_flow_non_negative", ["max_flow"],
+                   lambda max_flow: max_flow >= 0,
+                   "Node <{name}> has negative 'max_flow' {0:g}"),
+        Constraint("warn_node_cost_non_negative", ["cost"],
+                   lambda cost: cost >= 0,
+                   "Node <{name}> has negative 'cost' {0:g}"),
+        Constraint("rule_storage_max_volume_non_negative", ["max_volume"],
+                   lambda max_volume: max_volume >= 0,
+                   "<{type}> node <{name}> has negative 'max_volume' {0:g}",
+                   typename="storage", fuzzy=True),
+        Constraint("rule_storage_initial_volume_within_max", ["initial_volume", "max_volume"],
+                   lambda initial, maximum: initial <= maximum,
+                   "<{type}> node <{name}> 'initial_volume' {0:g} exceeds 'max_volume' {1:g}",
+                   typename="storage", fuzzy=True)
+    )
@@ -1,4 +1,5 @@
 from .base import PywrType
+from pywrparser.constraints import Constraint
 from pywrparser.utils import match
 
 
@@ -59,3 +60,20 @@ class PywrParameter(PywrType):
     @match("dataframe", fuzzy=True)
     def warn_outdated_pandas(self):
         assert "pandas_kwargs" not in self.data, f"Dataframe <{self.name}> uses outdated 'pandas_kwargs' key"
+
+    """ Numeric constraints """
+
+    constraints = (
+        Constraint("rule_monthlyprofile_within_lower_bounds", [("values", "min"), "lower_bounds"],
+                   lambda least, lower: least >= lower,
+                   "MonthlyProfileParameter <{name}> value {0:g} is below 'lower_bounds' {1:g}",
+                   typename="monthlyprofileparameter"),
+        Constraint("rule_monthlyprofile_within_upper_bounds", [("values", "max"), "upper_bounds"],
+                   lambda greatest, upper: greatest <= upper,
+                   "MonthlyProfileParameter <{name}> value {0:g} is above 'upper_bounds' {1:g}",
+                   typename="monthlyprofileparameter"),
+        Constraint("warn_controlcurves_ordered", [("control_curves", "rise")],
+                   lambda rise: rise <= 0,
+                   "<{type}> parameter <{name}> has 'control_curves' not in descending order",
+                   typename="controlcurve", fuzzy=True)
+    )
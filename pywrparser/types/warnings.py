@@ -17,7 +17,16 @@ class PywrTypeValidationWarning(PywrParserWarning):
         self.component = component
         self.warning = warning
         self.exc = exc
-        self.valuetext = valuetext
+        self._valuetext = valuetext
+
+    @property
+    def valuetext(self):
+        """ The value text may be rendered lazily, see :class:`utils.ValueText` """
+        return str(self._valuetext)
+
+    def __reduce__(self):
+        """ Pickle the rendered value text rather than the value itself """
+        return self.__class__, (self.component, self.warning, self.exc, self.valuetext)
 
     def __str__(self):
         return f"{self.desc_text} {self.component} '{self.warning}' -> {self.exc}:\n          {self.valuetext}"
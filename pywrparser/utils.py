@@ -1,57 +1,225 @@
 from __future__ import annotations
+import contextlib
+import contextvars
 import functools
 import inspect
 import json
 import re
+import time
 
+from collections import Counter
 from typing import Tuple
 
 from pywrparser.types.exceptions import (
-    PywrTypeValidationError,
-    PywrTypeValidationErrorBundle
+    PywrTypeValidationErrorBundle,
+    PywrValidationBudgetExhausted
 )
-from pywrparser.types.warnings import PywrTypeValidationWarning
+from pywrparser.types.findings import (
+    PywrErrorFinding,
+    PywrWarningFinding
+)
+
+""" Set while creating components which have already been validated elsewhere """
+_validation_suspended = contextvars.ContextVar("validation_suspended", default=False)
+""" Set while the errors of components are collected rather than raised """
+_findings_collected = contextvars.ContextVar("findings_collected", default=False)
+""" The RuleProfile which records rules applied in the current context, if any """
+_rule_profile = contextvars.ContextVar("rule_profile", default=None)
 
 
-class raiseorpush():
+class SectionCapture():
     """
-    Context manager to allow capture and aggregation of
-    errors and warnings when parsing components
+    Validates the components of a section of a network in one call, and
+    aggregates their errors and warnings into a destination in bulk.
+    Errors and warnings are either raised or pushed exactly as if each
+    component had been captured individually, in order.
     """
-    def __init__(self, component, raise_error, raise_warning, dest, ignore_warnings=False):
-        self.component = component
+    def __init__(self, raise_error, raise_warning, dest, ignore_warnings=False,
+                 budget=None):
+        """
+        Args:
+            raise_error (bool): Whether the first error is raised rather than pushed
+            raise_warning (bool): Whether the first error or warning is raised
+                rather than pushed
+            dest: An object with `errors` and `warnings` mappings of lists,
+                keyed by section
+            ignore_warnings (bool): Whether warnings are neither raised nor pushed
+            budget (ValidationBudget): The budget which is spent by each error
+                and warning pushed, if any
+        """
+        self.budget = budget
         self.raise_error = raise_error
         self.raise_warning = raise_warning if not ignore_warnings else False
         self.ignore_warnings = ignore_warnings
         self.dest = dest
-        self.error_set = (PywrTypeValidationErrorBundle, )
-        if not raise_error:
-            self.error_set = (PywrTypeValidationError, PywrTypeValidationErrorBundle)
 
-    def __enter__(self):
-        return self
+    def validate(self, section, items, build, store=None):
+        """
+        Creates and captures a component of `section` for each of `items`.
+
+        Args:
+            section (str): The network section to which the components belong
+            items (Iterable[Tuple[str, Any]]): The name, or None, and data of
+                each component
+            build (Callable): Creates the component of `(section, data, name)`
+            store (Callable): Invoked with `(section, component)` for each
+                valid component as it is captured, if given
+
+        Returns:
+            components (List[PywrType]): The valid components, in order
+        """
+        with findings_collected():
+            return self.capture(section, self.built(section, items, build), store)
 
-    def __exit__(self, exc_type, exc_obj, exc_tb):
-        if isinstance(exc_obj, PywrTypeValidationErrorBundle):
-            for error in exc_obj.errors:
-                #  Raise on warning implies raise on error
-                if self.raise_warning or self.raise_error:
-                    raise error from None
-                self.dest.errors[self.component].append(error)
+    def built(self, section, items, build):
+        """
+        Yields each component created from `items` by `build` with its
+        errors.  A component which cannot be created is skipped, unless
+        raising on warnings.
+        """
+        for name, data in items:
+            try:
+                inst = build(section, data, name)
+            except Exception:
+                if self.raise_warning:
+                    raise
+                yield None, ()
+                continue
+            yield (None, inst.errors) if inst.errors else (inst, ())
 
-        return not self.raise_warning
+    def capture(self, section, components, store=None):
+        """
+        Either raises the first error or warning of the `components` of
+        `section`, or pushes all of them to the destination.  Valid components
+        are stored as they are captured, so remain stored should validation
+        stop on exhausting the budget.
+
+        Args:
+            section (str): The network section to which the components belong
+            components (Iterable[Tuple[PywrType, List[PywrErrorFinding]]]):
+                Each component, or None if it is invalid, and its errors
+            store (Callable): Invoked with `(section, component)` for each
+                valid component, if given
+
+        Returns:
+            components (List[PywrType]): The valid components, in order
+        """
+        budget = self.budget
+        valid = []
+        errors = []
+        warnings = []
+        try:
+            for inst, inst_errors in components:
+                if budget is not None:
+                    budget.checked[section] += 1
+                if inst_errors:
+                    #  Raise on warning implies raise on error
+                    if self.raise_warning or self.raise_error:
+                        raise inst_errors[0].exception() from None
+                    if budget is None:
+                        errors.extend(inst_errors)
+                    else:
+                        for error in inst_errors:
+                            errors.append(error)
+                            budget.spend_error()
+                    continue
+                if inst is None:
+                    continue
+                if inst.has_warnings and not self.ignore_warnings:
+                    if self.raise_warning:
+                        raise inst.warnings[0].exception() from None
+                    if budget is None:
+                        warnings.extend(inst.warnings)
+                    else:
+                        for warning in inst.warnings:
+                            warnings.append(warning)
+                            budget.spend_warning()
+                valid.append(inst)
+                if store is not None:
+                    store(section, inst)
+        finally:
+            if errors:
+                self.dest.errors[section].extend(errors)
+            if warnings:
+                self.dest.warnings[section].extend(warnings)
+
+        return valid
+
+    def capture_network_error(self, error):
+        """
+        Pushes the network `error` to the destination, charging it to the
+        budget as the errors of components are.
+        """
+        self.dest.errors["network"].append(error)
+        if self.budget is not None:
+            self.budget.spend_error()
 
-    def capture_warnings(self, inst):
+    def capture_findings(self, section, findings):
         """
-        If a successfully created instance has warnings, either raise
-        or push to the destination as appropriate
+        Either raises the first of `findings`, the errors and warnings of
+        components of `section` which have already been captured, or pushes
+        them to the destination.
         """
-        if inst.has_warnings and not self.ignore_warnings:
-            for warning in inst.warnings:
-                if self.raise_warning:
-                    raise warning from None
+        budget = self.budget
+        errors = []
+        warnings = []
+        try:
+            for finding in findings:
+                if isinstance(finding, PywrWarningFinding):
+                    if self.ignore_warnings:
+                        continue
+                    if self.raise_warning:
+                        raise finding.exception() from None
+                    warnings.append(finding)
+                    if budget is not None:
+                        budget.spend_warning()
                 else:
-                    self.dest.warnings[self.component].append(warning)
+                    #  Raise on warning implies raise on error
+                    if self.raise_warning or self.raise_error:
+                        raise finding.exception() from None
+                    errors.append(finding)
+                    if budget is not None:
+                        budget.spend_error()
+        finally:
+            if errors:
+                self.dest.errors[section].extend(errors)
+            if warnings:
+                self.dest.warnings[section].extend(warnings)
+
+
+class ValidationBudget():
+    """
+    Limits on the number of errors and warnings collected by a parser,
+    beyond which validation stops.  The budget also counts the components
+    of each section which have been validated, so that those left unchecked
+    may be reported.
+    """
+    def __init__(self, max_errors=None, max_warnings=None):
+        """
+        Args:
+            max_errors (int): The number of errors after which validation
+                stops, or None for no limit
+            max_warnings (int): The number of warnings after which validation
+                stops, or None for no limit
+        """
+        for limit in (max_errors, max_warnings):
+            if limit is not None and limit < 1:
+                raise ValueError(f"Invalid validation budget: {limit}")
+        self.max_errors = max_errors
+        self.max_warnings = max_warnings
+        self.errors = 0
+        self.warnings = 0
+        self.checked = Counter()
+
+    def spend_error(self):
+        self.errors += 1
+        if self.max_errors is not None and self.errors >= self.max_errors:
+            raise PywrValidationBudgetExhausted("errors", self.max_errors)
+
+    def spend_warning(self):
+        self.warnings += 1
+        if self.max_warnings is not None and self.warnings >= self.max_warnings:
+            raise PywrValidationBudgetExhausted("warnings", self.max_warnings)
 
 
 def canonical_name(nodename: str, attr: str) -> str:
@@ -89,50 +257,368 @@ class PywrTypeValidator():
 
     def __set__(self, inst: PywrType, value: dict):
         setattr(inst, self.instattr, value)
-        self.validate(inst, value)
+        if not _validation_suspended.get():
+            self.validate(inst, value)
 
 
     def validate(self, inst: PywrType, value: dict):
-        ifuncs = inspect.getmembers(inst, inspect.ismethod)
-        irules = {n: f for n, f in ifuncs if n.startswith("rule")}
-        iwarns = {n: f for n, f in ifuncs if n.startswith("warn")}
+        iwarns, irules = RuleTable.for_class(type(inst)).resolve(inst)
+        if (profile := _rule_profile.get()) is not None:
+            profile.add_component(type(inst))
 
         rules_passed = []
         exc_bundle = []
         warn_bundle = []
 
-        for w, f in iwarns.items():
+        for w, f in iwarns:
             try:
-                f()
+                if profile is None:
+                    f(inst)
+                else:
+                    profile.call(type(inst), w, f, inst)
             except AssertionError as e:
                 value_text = self.trim_value(value)
-                warn_bundle.append(PywrTypeValidationWarning(inst.__class__.__qualname__, w, e, value_text))
+                warn_bundle.append(PywrWarningFinding(inst.__class__.__qualname__, w, str(e), value_text))
 
-        for r, f in irules.items():
+        for r, f in irules:
             try:
-                rules_passed.append(f"[PASSED] {r} -> {f()}")
+                result = f(inst) if profile is None else profile.call(type(inst), r, f, inst)
+                rules_passed.append(f"[PASSED] {r} -> {result}")
             except AssertionError as e:
                 value_text = self.trim_value(value)
-                exc_bundle.append(PywrTypeValidationError(inst.__class__.__qualname__, r, e, value_text))
+                exc_bundle.append(PywrErrorFinding(inst.__class__.__qualname__, r, str(e), value_text))
 
         if self.store_passed_rules:
             inst.rules_passed = rules_passed
 
         if len(exc_bundle) > 0:
-            pveb = PywrTypeValidationErrorBundle(f"{inst.__class__.__qualname__} rule failures", exc_bundle)
+            if _findings_collected.get():
+                inst.errors = exc_bundle
+                return
+            pveb = PywrTypeValidationErrorBundle(f"{inst.__class__.__qualname__} rule failures",
+                                                 [error.exception() for error in exc_bundle])
             raise pveb
 
         inst.warnings = warn_bundle
 
 
     def trim_value(self, value):
-        value_text = json.dumps(value)
-        remainder = len(value_text) - self.max_value_len
-        if remainder > 0:
-            s = "s" if remainder > 1 else ""
-            value_text = value_text[:self.max_value_len] + f"...[+{remainder} char{s}]"
+        """
+        Returns the text of `value` shown with a failed rule or warning,
+        which is rendered only if it is shown.
+        """
+        return ValueText(value, self.max_value_len)
+
 
-        return value_text
+class RuleProfile():
+    """
+    Statistics of each rule and warning applied to components, recorded by
+    :class:`PywrTypeValidator` within :func:`profile_rules`.
+
+    For each rule of each component class, the profile records the number of
+    components to which the rule was applied, the number which passed and
+    failed, the number skipped as the rule does not apply to their type,
+    and the cumulative time taken by the rule.
+    """
+    def __init__(self):
+        """ Components validated by each class """
+        self.components = Counter()
+        """ [calls, passed, failed, time_ns] by (class, rule name) """
+        self.stats = {}
+
+    def add_component(self, cls):
+        self.components[cls] += 1
+
+    def call(self, cls, name, func, inst):
+        """
+        Returns the result of applying the rule `func` with `name` to `inst`,
+        recording its outcome and the time taken.
+        """
+        if (stats := self.stats.get((cls, name))) is None:
+            stats = self.stats[(cls, name)] = [0, 0, 0, 0]
+        stats[0] += 1
+        start = time.perf_counter_ns()
+        try:
+            result = func(inst)
+        except AssertionError:
+            stats[2] += 1
+            raise
+        else:
+            stats[1] += 1
+            return result
+        finally:
+            stats[3] += time.perf_counter_ns() - start
+
+    def rows(self):
+        """
+        Returns:
+            rows (List[Dict]): The statistics of each rule and warning of each
+                class which validated a component, the slowest first
+        """
+        rows = []
+        for cls, components in self.components.items():
+            for name in RuleTable.for_class(cls).names():
+                calls, passed, failed, elapsed = self.stats.get((cls, name), (0, 0, 0, 0))
+                rows.append({
+                    "class": cls.__qualname__,
+                    "rule": name,
+                    "calls": calls,
+                    "passed": passed,
+                    "failed": failed,
+                    "skipped": components - calls,
+                    "time": elapsed / 1e9,
+                    "mean": elapsed / calls / 1e9 if calls else 0.0
+                })
+        return sorted(rows, key=lambda row: (-row["time"], row["class"], row["rule"]))
+
+    def as_dict(self):
+        return {
+            "components": sum(self.components.values()),
+            "rules": self.rows()
+        }
+
+    def as_json(self, indent=2):
+        return json.dumps(self.as_dict(), indent=indent)
+
+
+@contextlib.contextmanager
+def profile_rules(profile=None):
+    """
+    Context in which the rules applied to each component created are
+    profiled, for example::
+
+        with profile_rules() as profile:
+            PywrNetwork.from_file("model.json", component_jobs=1)
+        print(profile.as_json())
+
+    Only components validated in the current process are profiled, not
+    those validated by worker processes.
+
+    Args:
+        profile (RuleProfile): The profile in which statistics are recorded.
+            If None, a new profile is created.
+
+    Yields:
+        profile (RuleProfile): The profile
+    """
+    profile = profile if profile is not None else RuleProfile()
+    token = _rule_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _rule_profile.reset(token)
+
+
+@contextlib.contextmanager
+def findings_collected():
+    """
+    Context in which a component whose rules fail is created regardless,
+    with the :class:`PywrErrorFinding` of each failure in its `errors`
+    attribute, rather than raising a :class:`PywrTypeValidationErrorBundle`.
+    The `warnings` of such a component are not set.
+    """
+    token = _findings_collected.set(True)
+    try:
+        yield
+    finally:
+        _findings_collected.reset(token)
+
+
+@contextlib.contextmanager
+def validation_suspended():
+    """
+    Context in which components are created without applying their rules,
+    for components whose data has already been validated, such as by a
+    worker process.  The `warnings` of each such component are not set.
+    """
+    token = _validation_suspended.set(True)
+    try:
+        yield
+    finally:
+        _validation_suspended.reset(token)
+
+
+class ValueText():
+    """
+    A reference to the value of a component which is rendered as JSON text
+    of at most `max_len` characters when first converted to str, after which
+    the reference is released.  Values are frequently large and their errors
+    and warnings are often never shown, so rendering is deferred and stops
+    once the limit is reached rather than encoding the whole value.
+    """
+    __slots__ = ("value", "max_len", "text")
+
+    def __init__(self, value, max_len):
+        self.value = value
+        self.max_len = int(max_len)
+        self.text = None
+
+    def __str__(self):
+        if self.text is None:
+            self.text = trim_json(self.value, self.max_len)
+            self.value = None
+        return self.text
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({str(self)!r})"
+
+
+def encode_component(inst):
+    """
+    Encodes those components which replace values of their parent after
+    validation, such as inline parameters, as their data.
+    """
+    if hasattr(inst, "data"):
+        return inst.data
+    return repr(inst)
+
+
+def trim_json(value, max_len):
+    """
+    Returns the JSON text of `value`, truncated to `max_len` characters and
+    followed by the number of characters omitted.  Encoding stops once the
+    limit is exceeded, and the length of the whole text is then found by the
+    C encoder of :func:`json.dumps`, which is much faster than continuing.
+    """
+    encoder = json.JSONEncoder(default=encode_component)
+    chunks = []
+    length = 0
+    for chunk in encoder.iterencode(value):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length > max_len:
+            break
+    else:
+        return "".join(chunks)
+
+    remainder = len(json.dumps(value, default=encode_component)) - max_len
+    s = "s" if remainder > 1 else ""
+    return "".join(chunks)[:max_len] + f"...[+{remainder} char{s}]"
+
+
+class RuleTable():
+    """
+    The rules and warnings of a :class:`PywrType` class, collected once per
+    class rather than by inspecting each instance.
+
+    Rules and warnings which apply to every component are run in name order,
+    as are those restricted to particular types by :func:`match`.  The latter
+    are indexed by the type names they accept, and the rules which apply to
+    each distinct value of a component's 'type' are resolved when that value
+    is first seen, so that each component runs only the rules which apply to it.
+
+    Tables are built when a class is defined, so rules added to a class after
+    its definition are not applied.
+    """
+    __slots__ = ("warnings", "rules", "exact", "fuzzy", "dispatch")
+
+    def __init__(self, cls):
+        self.warnings = []
+        self.rules = []
+        """ Type-specific rules and warnings by the lowercase type they match """
+        self.exact = {}
+        """ (typename, kind, name, func) of each fuzzy rule or warning """
+        self.fuzzy = []
+        self.dispatch = {}
+
+        for name in sorted(dir(cls)):
+            if name.startswith("rule"):
+                kind = "rules"
+            elif name.startswith("warn"):
+                kind = "warnings"
+            else:
+                continue
+
+            func = getattr(cls, name)
+            if not inspect.isfunction(func):
+                continue
+
+            spec = getattr(func, "__match__", None)
+            if spec is None:
+                getattr(self, kind).append((name, func))
+                continue
+
+            typename, fuzzy = spec
+            func = func.__wrapped__
+            if fuzzy:
+                self.fuzzy.append((typename, kind, name, func))
+                continue
+            for dtype in match_types(typename):
+                self.exact.setdefault(dtype, []).append((kind, name, func))
+
+
+    @classmethod
+    def for_class(cls, dtype):
+        """
+        Returns the table of the class `dtype`, building it if the class
+        does not have its own.
+        """
+        if (table := dtype.__dict__.get("__rule_table__")) is None:
+            table = cls(dtype)
+            setattr(dtype, "__rule_table__", table)
+        return table
+
+
+    def names(self):
+        """
+        Returns:
+            names (List[str]): The name of every rule and warning of the class,
+                whether or not restricted to particular types
+        """
+        names = {name for name, _ in self.warnings + self.rules}
+        names.update(name for entries in self.exact.values() for _, name, _ in entries)
+        names.update(name for _, _, name, _ in self.fuzzy)
+        return sorted(names)
+
+
+    def resolve(self, inst):
+        """
+        Returns:
+            (warnings, rules): The `(name, function)` of each warning and
+                rule which applies to `inst`, in name order, where each
+                function takes the instance as its only argument
+        """
+        dtype = getattr(inst, "type", None)
+        if not (dtype and isinstance(dtype, str)):
+            return self.warnings, self.rules
+
+        if (resolved := self.dispatch.get(dtype)) is None:
+            resolved = self.dispatch[dtype] = self.resolve_type(dtype)
+        return resolved
+
+
+    def resolve_type(self, dtype):
+        dtype = dtype.lower()
+        typed = list(self.exact.get(dtype, ()))
+        typed.extend((kind, name, func) for typename, kind, name, func in self.fuzzy
+                     if typename in dtype)
+        if not typed:
+            return self.warnings, self.rules
+
+        resolved = {
+            "warnings": list(self.warnings),
+            "rules": list(self.rules)
+        }
+        for kind, name, func in typed:
+            resolved[kind].append((name, func))
+
+        return (sorted(resolved["warnings"], key=lambda entry: entry[0]),
+                sorted(resolved["rules"], key=lambda entry: entry[0]))
+
+
+def match_types(typename):
+    """
+    Returns the lowercase component types which are exactly matched by
+    the :func:`match` argument `typename`: the typename itself and, for
+    parameters, the typename without its 'parameter' suffix.
+    """
+    typename = typename.lower()
+    types = [typename]
+    if typename.endswith("parameter"):
+        base = typename[:-9]
+        if base and not base.endswith("parameter"):
+            types.append(base)
+    return types
 
 
 def match(typename, fuzzy=False):
@@ -146,27 +632,26 @@ def match(typename, fuzzy=False):
     The 'fuzzy' Boolean argument matches any type which contains the
     typename argument, irrespective of position.
 
+    Decorated functions are indexed by :class:`RuleTable` and are
+    invoked by the validator only for components of matching type.
     """
+    typename = typename.lower()
+    exact = match_types(typename)
+
     def type_wrapper(func):
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             if not (hasattr(self, "type") and self.type):
                 return
             if fuzzy:
-                is_match = typename.lower() in self.type.lower()
-            elif not self.type.lower().endswith("parameter"):
-                if typename.lower().endswith("parameter"):
-                    basematch = typename.lower()[:-9]
-                else:
-                    basematch = typename.lower()
-
-                is_match = basematch == self.type.lower()
+                is_match = typename in self.type.lower()
             else:
-                is_match = typename.lower() == self.type.lower()
+                is_match = self.type.lower() in exact
 
             if is_match:
                 return func(self, *args, **kwargs)
 
+        wrapper.__match__ = (typename, fuzzy)
         return wrapper
     return type_wrapper
 
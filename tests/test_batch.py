@@ -0,0 +1,113 @@
+import json
+import os
+import pytest
+import shutil
+
+from pywrparser import parse
+from pywrparser.batch import (
+    expand_paths,
+    summarise_files
+)
+from pywrparser.types.network import PywrNetwork
+
+
+@pytest.fixture
+def network_dir(tmp_path, valid_network_file, invalid_network_file):
+    """
+    A directory containing valid and invalid networks, one in a subdirectory
+    """
+    (tmp_path / "sub").mkdir()
+    shutil.copy(valid_network_file, tmp_path / "a.json")
+    shutil.copy(invalid_network_file, tmp_path / "sub" / "b.json")
+    shutil.copy(valid_network_file, tmp_path / "sub" / "c.json")
+    (tmp_path / "notes.txt").write_text("Not a network")
+    return tmp_path
+
+
+def test_expand_paths(network_dir):
+    """
+    Directories are searched recursively, globs are expanded, and repeated
+    files are included once
+    """
+    a, b, c = (str(network_dir / p) for p in ("a.json", "sub/b.json", "sub/c.json"))
+    assert expand_paths([network_dir]) == [a, b, c]
+    assert expand_paths([os.path.join(network_dir, "**", "c.json"), a, c]) == [c, a]
+    assert expand_paths([os.path.join(network_dir, "*.txt")]) == [str(network_dir / "notes.txt")]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_from_files(network_dir, jobs):
+    """
+    Results are returned in the order given and are as for :meth:`from_file`
+    """
+    filenames = expand_paths([network_dir])
+    results = list(PywrNetwork.from_files(filenames, jobs=jobs))
+    assert [r[0] for r in results] == filenames
+    for filename, network, errors, warnings in results:
+        ref_network, ref_errors, _ = PywrNetwork.from_file(filename)
+        if ref_network:
+            assert network.as_dict() == ref_network.as_dict()
+        else:
+            assert network is None
+            assert {c: [repr(e) for e in errs] for c, errs in errors.items()} == \
+                   {c: [repr(e) for e in errs] for c, errs in ref_errors.items()}
+
+
+def test_from_files_unreadable(tmp_path):
+    """ Unreadable files are reported as errors of that file only """
+    filenames = [str(tmp_path / "missing.json")]
+    (filename, network, errors, warnings), = PywrNetwork.from_files(filenames, jobs=2)
+    assert network is None
+    assert "Unable to read input file" in str(errors["network"][0])
+
+
+def test_from_files_rulesets(valid_network_file):
+    """ Several rulesets are refused rather than reported as a single result """
+    with pytest.raises(ValueError, match="single ruleset"):
+        PywrNetwork.from_files([valid_network_file], jobs=1, ruleset=["strict", None])
+    with pytest.raises(ValueError, match="single ruleset"):
+        summarise_files([valid_network_file], jobs=1, ruleset=["strict", None])
+
+
+def test_cli_batch(network_dir, capsys):
+    """ Batch mode streams a JSON report per file and fails if any file is invalid """
+    args = parse.configure_args(["-b", str(network_dir), "-j", "2", "--json-output"])
+    with pytest.raises(SystemExit) as exc:
+        parse.handle_args(args)
+    assert exc.value.code == 1
+    captured = capsys.readouterr()
+    reports = [json.loads(line)["parse_results"] for line in captured.out.splitlines()]
+    assert [r["file"]["name"] for r in reports] == ["a.json", "b.json", "c.json"]
+    assert [r["errors"] > 0 for r in reports] == [False, True, False]
+    assert captured.err.startswith("3 files: 2 valid, 1 invalid")
+
+
+def test_cli_batch_unreadable(valid_network_file, tmp_path, capsys):
+    """ Unreadable files are reported without a digest and the batch continues """
+    missing = str(tmp_path / "missing.json")
+    args = parse.configure_args(["-b", missing, valid_network_file, "--json-output"])
+    with pytest.raises(SystemExit) as exc:
+        parse.handle_args(args)
+    assert exc.value.code == 1
+    captured = capsys.readouterr()
+    reports = [json.loads(line)["parse_results"] for line in captured.out.splitlines()]
+    assert [r["file"]["name"] for r in reports] == ["missing.json", os.path.basename(valid_network_file)]
+    assert reports[0]["errors"] > 0 and "sha256" not in reports[0]["file"]
+    assert reports[1]["errors"] == 0 and "sha256" in reports[1]["file"]
+
+
+def test_cli_batch_valid(valid_network_file, capsys):
+    args = parse.configure_args(["-b", valid_network_file, "--terse-report"])
+    with pytest.raises(SystemExit) as exc:
+        parse.handle_args(args)
+    assert exc.value.code == 0
+    assert "1 files: 1 valid, 0 invalid" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2", "two"])
+def test_cli_batch_invalid_jobs(valid_network_file, jobs, capsys):
+    """ An invalid number of jobs is a usage error """
+    with pytest.raises(SystemExit) as exc:
+        parse.configure_args(["-b", valid_network_file, "-j", jobs])
+    assert exc.value.code == 2
+    assert f"invalid positive integer: '{jobs}'" in capsys.readouterr().err
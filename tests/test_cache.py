@@ -0,0 +1,99 @@
+import os
+import pytest
+import shutil
+import threading
+
+from pywrparser import parse
+from pywrparser.batch import summarise_file
+from pywrparser.cache import ResultCache
+from pywrparser.results import ValidationResult
+from pywrparser.utils import sha256digest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "cache")
+
+
+def test_cache_hit(cache, valid_network_file):
+    """ The result of an unchanged file is reused """
+    _, result, cached = summarise_file(valid_network_file, {}, cache)
+    assert not cached and result.valid
+
+    _, cached_result, cached = summarise_file(valid_network_file, {}, cache)
+    assert cached
+    assert cached_result.report == result.report
+    assert cached_result.verbose_report == result.verbose_report
+
+
+def test_cache_errors(cache, invalid_network_file):
+    """ Errors are stored and restored """
+    _, result, _ = summarise_file(invalid_network_file, {}, cache)
+    _, cached_result, cached = summarise_file(invalid_network_file, {}, cache)
+    assert cached and not cached_result.valid
+    assert {c: [e.as_dict() for e in errs] for c, errs in cached_result.errors.items()} == \
+           {c: [e.as_dict() for e in errs] for c, errs in result.errors.items()}
+
+
+def test_cache_key(cache, valid_network_file):
+    """ Keys depend upon the content, ruleset and result options only """
+    digest = sha256digest(valid_network_file)
+    key = cache.key(digest)
+    assert cache.key(digest, json_backend="json") == key
+    assert cache.key(digest, allow_duplicate_edges=False) != key
+    assert cache.key(digest, ruleset="pywrmaster") != key
+    assert cache.key("0" * 64) != key
+
+
+def test_cache_modified_file(cache, valid_network_file, tmp_path):
+    """ A modified file is validated again """
+    filename = tmp_path / "network.json"
+    shutil.copy(valid_network_file, filename)
+    summarise_file(filename, {}, cache)
+    with open(filename, "a") as fp:
+        fp.write("\n")
+    _, _, cached = summarise_file(filename, {}, cache)
+    assert not cached
+
+
+def test_cache_corrupt_entry(cache):
+    """ Unreadable entries are discarded """
+    cache.put("k", ValidationResult())
+    with open(cache.path("k"), "wb") as fp:
+        fp.write(b"not a pickle")
+    assert cache.get("k") is None
+    assert not os.path.exists(cache.path("k"))
+
+
+def test_cache_unpicklable_result(cache):
+    """ A result which cannot be pickled leaves no temporary file """
+    cache.put("k", ValidationResult())
+    with pytest.raises(TypeError):
+        cache.put("u", threading.Lock())
+    assert os.listdir(cache.directory) == [os.path.basename(cache.path("k"))]
+
+
+def test_cache_eviction(tmp_path):
+    """ The least recently used entries are evicted once over size """
+    cache = ResultCache(tmp_path)
+    cache.put("a", ValidationResult())
+    entry_size = cache.size()
+    cache.max_size = 2 * entry_size
+    cache.put("b", ValidationResult())
+    os.utime(cache.path("a"), (1, 1))
+    os.utime(cache.path("b"), (2, 2))
+    assert cache.get("a") is not None
+    cache.put("c", ValidationResult())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size() <= cache.max_size
+
+
+def test_cli_cache_dir(tmp_path, valid_network_file, capsys):
+    """ Cached results are reported as cached """
+    cache_dir = str(tmp_path / "cache")
+    argv = ["-b", valid_network_file, "--cache-dir", cache_dir, "--terse-report"]
+    for expected in ("(0 cached)", "(1 cached)"):
+        with pytest.raises(SystemExit):
+            parse.handle_args(parse.configure_args(argv))
+        assert expected in capsys.readouterr().out
@@ -20,3 +20,21 @@ def test_version(capsys):
     assert exc.type == SystemExit
     version = capsys.readouterr().out
     assert version == __version__ + '\n'  # print adds newline
+
+
+@pytest.mark.parametrize("output", ([], ["--json-output"]))
+def test_profile_rules(capsys, valid_network_file, output):
+    """ Rule profiles are written to stderr, leaving the report on stdout """
+    args = parse.configure_args(["-f", valid_network_file, "--profile-rules", *output])
+    with pytest.raises(SystemExit) as exc:
+        parse.handle_args(args)
+    assert exc.value.code == 0
+    captured = capsys.readouterr()
+    assert "rule_type_required" in captured.err
+    assert "rule_type_required" not in captured.out
+
+
+def test_structural_level(capsys, valid_network_file):
+    args = parse.configure_args(["-f", valid_network_file, "--level", "structural"])
+    parse.handle_args(args)
+    assert "Structure: valid" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+import json
+import pytest
+
+from pywrparser.constraints import (
+    Constraint,
+    constant_values,
+    constraint_findings
+)
+from pywrparser.parsers import PywrJSONParser
+from pywrparser.types.exceptions import PywrTypeValidationError
+
+
+@pytest.fixture
+def constrained_src(valid_network_file):
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src["nodes"] += [
+        {"name": "Over", "type": "storage", "max_volume": 100, "initial_volume": 150, "cost": -5},
+        {"name": "Shared", "type": "storage", "max_volume": "Capacity", "initial_volume": 150},
+        {"name": "Inline", "type": "virtualstorage", "initial_volume": 0,
+         "max_volume": {"type": "constant", "value": -1}},
+        {"name": "Varying", "type": "storage", "max_volume": "Profile", "initial_volume": 500},
+        {"name": "Within", "type": "storage", "max_volume": 100, "initial_volume": 50}
+    ]
+    src["parameters"].update({
+        "Capacity": {"type": "constant", "value": 120},
+        "Profile": {"type": "monthlyprofile", "values": list(range(12)),
+                    "lower_bounds": 1, "upper_bounds": 20},
+        "Curves": {"type": "controlcurveindex", "storage_node": "Over",
+                   "control_curves": [0.5, "Capacity", 0.2]},
+        "Unresolved": {"type": "controlcurveindex", "storage_node": "Over",
+                       "control_curves": [0.5, "Profile", 0.2]}
+    })
+    return src
+
+
+def test_constraints_exhaustive(constrained_src):
+    """
+    Are constraints evaluated only at the exhaustive level, resolving constant
+    parameters and skipping values which are not numeric?
+    """
+    parser = PywrJSONParser(json.dumps(constrained_src))
+    parser.parse()
+    assert not parser.has_errors
+
+    parser = PywrJSONParser(json.dumps(constrained_src))
+    parser.parse(level="exhaustive")
+    errors = [(error.rule, json.loads(error.valuetext).get("name")) for error in parser.errors["nodes"]]
+    assert errors == [
+        ("rule_storage_initial_volume_within_max", "Over"),
+        ("rule_storage_initial_volume_within_max", "Shared"),
+        ("rule_storage_initial_volume_within_max", "Inline"),
+        ("rule_storage_max_volume_non_negative", "Inline")
+    ]
+    assert "'initial_volume' 150 exceeds 'max_volume' 120" in parser.errors["nodes"][1].message
+    assert [error.rule for error in parser.errors["parameters"]] == ["rule_monthlyprofile_within_lower_bounds"]
+    assert [warning.rule for warning in parser.warnings["nodes"]] == ["warn_node_cost_non_negative"]
+    assert [warning.rule for warning in parser.warnings["parameters"]] == ["warn_controlcurves_ordered"]
+    assert "<Curves>" in parser.warnings["parameters"][0].message
+
+
+def test_constraints_selected(constrained_src):
+    """
+    Are constraints ignored and suppressed by name as other rules are?
+    """
+    constrained_src["metadata"]["pywrparser"] = {"ignore": {"nodes": {"Over": ["rule_storage_*"]}}}
+    parser = PywrJSONParser(json.dumps(constrained_src), ignore=["warn_*", "rule_monthlyprofile_*"])
+    parser.parse(level="exhaustive")
+    assert "parameters" not in parser.errors and not parser.has_warnings
+    assert [json.loads(error.valuetext)["name"] for error in parser.errors["nodes"]] == ["Shared", "Inline", "Inline"]
+
+
+def test_constraints_raise(constrained_src):
+    parser = PywrJSONParser(json.dumps(constrained_src))
+    with pytest.raises(PywrTypeValidationError) as exc_info:
+        parser.parse(level="exhaustive", raise_on_error=True)
+    assert exc_info.value.as_dict()["rule"] == "rule_monthlyprofile_within_lower_bounds"
+
+
+def test_constraints_numpy(constrained_src):
+    """
+    Are the findings of constraints identical with and without NumPy?
+    """
+    pytest.importorskip("numpy")
+    parser = PywrJSONParser(json.dumps(constrained_src))
+    parser.parse()
+    constants = constant_values(parser.parameters)
+    for section in ("nodes", "parameters"):
+        components = list(getattr(parser, section).values())
+        constraints = parser.types[section].constraints
+        findings = [constraint_findings(constraints, components, constants, use_numpy=use_numpy)
+                    for use_numpy in (True, False)]
+        as_dicts = [{idx: [f.as_dict() for f in found] for idx, found in by_index.items()}
+                    for by_index in findings]
+        assert as_dicts[0] == as_dicts[1] and as_dicts[0]
+
+
+def test_constraint_declaration():
+    with pytest.raises(ValueError):
+        Constraint("check_volume", ["max_volume"], lambda volume: volume >= 0, "")
+    with pytest.raises(ValueError):
+        Constraint("rule_volume", [("max_volume", "mean")], lambda volume: volume >= 0, "")
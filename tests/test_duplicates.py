@@ -0,0 +1,101 @@
+import io
+import json
+import pytest
+
+from pywrparser.parsers import (
+    PywrJSONParser,
+    PywrJSONStreamParser
+)
+
+
+DUPLICATES_SRC = """{
+ "metadata": {"title": "Duplicates"},
+ "timestepper": {"start": "2000-01-01", "end": "2000-12-31"},
+ "scenarios": [{"name": "scen", "size": 1}, {"name": "scen", "size": 2}],
+ "tables": {"tab": {"url": "a.csv"}, "tab": {"url": "b.csv"}},
+ "nodes": [
+  {"name": "n1", "type": "input", "inline": {"type": "constant", "value": 1, "value": 2}},
+  {"name": "n2", "type": "output"},
+  {"name": "n1", "type": "output"}
+ ],
+ "edges": [["n1", "n2"]],
+ "parameters": {"p1": {"type": "constant", "value": 1}, "p1": {"type": "constant", "value": 2}},
+ "edges": [["n2", "n1"]]
+}"""
+
+
+def test_duplicate_records():
+    """
+    Duplicated names are recorded by section, with the position of each occurrence
+    """
+    parser = PywrJSONParser(DUPLICATES_SRC)
+    dups = {(d.section, d.name): d for d in parser.duplicates}
+
+    assert set(dups) == {
+        ("scenarios", "scen"),
+        ("tables", "tab"),
+        ("nodes", "n1"),
+        ("parameters", "p1"),
+        (None, "edges")
+    }
+    assert dups[("nodes", "n1")].positions == (0, 2)
+    assert dups[("nodes", "n1")].paths == (("nodes", 0), ("nodes", 2))
+    assert dups[("parameters", "p1")].count == 2
+    assert dups[(None, "edges")].positions == (5, 7)
+
+
+def test_duplicate_errors():
+    """
+    Each duplicate occurrence is reported as a network error
+    """
+    parser = PywrJSONParser(DUPLICATES_SRC)
+    parser.parse()
+    messages = [err.message for err in parser.errors["network"]]
+    assert "Duplicate node name <n1>" in messages
+    assert "Duplicate parameter name <p1>" in messages
+    assert "Duplicate table name <tab>" in messages
+    assert "Duplicate scenario name <scen>" in messages
+    assert "Duplicate section name <edges>" in messages
+
+
+def test_duplicate_values():
+    """
+    Duplicate members take the last value given and the first of a duplicate
+    section is used, while keys nested within components are not tracked
+    """
+    parser = PywrJSONParser(DUPLICATES_SRC)
+    parser.parse()
+    assert parser.src["parameters"]["p1"]["value"] == 2
+    assert parser.src["edges"] == [["n1", "n2"]]
+    assert parser.nodes["n1"].data["type"] == "input"
+    assert parser.src["nodes"][0]["inline"]["value"] == 2
+
+
+def test_stream_duplicates():
+    """
+    The stream parser records the same duplicates as the document parser
+    """
+    parser = PywrJSONParser(DUPLICATES_SRC)
+    stream = PywrJSONStreamParser(io.StringIO(DUPLICATES_SRC), chunk_size=8)
+    stream.parse()
+    as_dicts = lambda dups: sorted(json.dumps(d.as_dict()) for d in dups)
+    assert as_dicts(stream.duplicates) == as_dicts(parser.duplicates)
+
+
+@pytest.mark.parametrize("section, valid", [
+    ("parameters", {"type": "constant", "value": 1}),
+    ("recorders", {"type": "numpyarraynoderecorder", "node": "n2"})
+])
+def test_duplicate_definitions_validated(section, valid):
+    """
+    Every definition of a duplicated name is validated, not only the last,
+    which is the definition retained
+    """
+    src = json.loads(DUPLICATES_SRC)
+    del src["parameters"]
+    text = json.dumps(src)[:-1] + f', "{section}": ' \
+           f'{{"x": {{"name": "x"}}, "y": {json.dumps(valid)}, "x": {json.dumps(valid)}}}}}'
+    for parser in (PywrJSONParser(text), PywrJSONStreamParser(io.StringIO(text))):
+        parser.parse()
+        assert [json.loads(error.valuetext) for error in parser.errors[section]] == [{"name": "x"}]
+        assert getattr(parser, section)["x"].data == valid
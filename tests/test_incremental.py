@@ -0,0 +1,104 @@
+import json
+import pytest
+
+from pywrparser.incremental import IncrementalValidator
+from pywrparser.types.exceptions import PywrParserException
+from pywrparser.types.network import PywrNetwork
+
+
+def summary(results):
+    """ The messages of each section, with network errors in any order """
+    if not results:
+        return {}
+    return {section: sorted(map(str, items)) if section == "network" else list(map(str, items))
+            for section, items in results.items()}
+
+
+def assert_as_full_parse(validator, **kwargs):
+    _, errors, warnings = PywrNetwork.from_json(json.dumps(validator.src), **kwargs)
+    assert summary(validator.errors) == summary(errors)
+    assert summary(validator.warnings) == summary(warnings)
+
+
+@pytest.fixture
+def validator(valid_network_file):
+    with open(valid_network_file) as fp:
+        return IncrementalValidator(fp.read(), allow_duplicate_edges=False)
+
+
+@pytest.mark.parametrize("patch", [
+    [{"op": "replace", "path": "/metadata/title", "value": 5}],
+    [{"op": "add", "path": "/nodes/1", "value": {"name": "Node_1", "type": "link"}}],
+    [{"op": "remove", "path": "/nodes/0"}],
+    [{"op": "replace", "path": "/nodes/2/name", "value": "Node_1"}],
+    [{"op": "add", "path": "/edges/-", "value": ["Node_1", "Node_1"]}],
+    [{"op": "copy", "from": "/edges/0", "path": "/edges/0"}],
+    [{"op": "add", "path": "/parameters/bad", "value": {"type": "constant"}},
+     {"op": "add", "path": "/parameters/bad/value", "value": 1}],
+    [{"op": "move", "from": "/nodes/0", "path": "/nodes/3"}],
+    [{"op": "remove", "path": "/edges"}],
+    [{"op": "add", "path": "/nodes/-", "value": {"name": "_hidden", "type": "link"}}],
+])
+def test_patch_as_full_parse(validator, patch):
+    """
+    Revalidating the components changed by a patch gives the result of
+    validating the whole patched document
+    """
+    validator.apply_patch(patch)
+    assert_as_full_parse(validator, allow_duplicate_edges=False)
+
+
+def test_patch_reverted(validator):
+    """
+    Errors introduced by one patch are removed by another which reverts it
+    """
+    name = validator.src["nodes"][2]["name"]
+    errors, _ = validator.apply_patch([{"op": "replace", "path": "/nodes/2/name", "value": "Node_1"},
+                                       {"op": "remove", "path": "/nodes/0/type"}])
+    assert len(errors["network"]) == 1 and errors["nodes"]
+    errors, _ = validator.apply_patch([{"op": "replace", "path": "/nodes/2/name", "value": name},
+                                       {"op": "add", "path": "/nodes/0/type", "value": "input"}])
+    assert errors is None and validator.valid
+
+
+def test_update_components(validator):
+    validator.update([("parameters", "extra", {"type": "constant"}),
+                      ("nodes", len(validator.src["nodes"]), {"name": "sink", "type": "output"}),
+                      ("timestepper", None, {"start": "2020-01-01"})])
+    assert validator.src["nodes"][-1]["name"] == "sink"
+    assert set(validator.errors) == {"parameters", "timestepper"}
+    assert_as_full_parse(validator, allow_duplicate_edges=False)
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "remove", "path": "/nodes/99"},
+    {"op": "replace", "path": "/parameters/nonesuch", "value": {}},
+    {"op": "add", "path": "/nodes/01", "value": {}},
+    {"op": "test", "path": "/metadata/title", "value": "Another title"},
+    {"op": "move", "from": "/nodes", "path": "/nodes/0"},
+    {"op": "replace", "path": "nodes/0"},
+    {"op": "delete", "path": "/nodes/0"}
+])
+def test_invalid_patch(validator, operation):
+    """
+    Invalid or failed operations raise, leaving the results of the document unchanged
+    """
+    with pytest.raises(PywrParserException):
+        validator.apply_patch([operation])
+    assert validator.valid
+    assert_as_full_parse(validator, allow_duplicate_edges=False)
+
+
+def test_patch_scales_with_edit(validator, monkeypatch):
+    """
+    Only the components touched by a patch are validated again
+    """
+    import pywrparser.incremental
+
+    checked = []
+    check_component = pywrparser.incremental.check_component
+    monkeypatch.setattr(pywrparser.incremental, "check_component",
+                        lambda ctype, data, name=None: checked.append(ctype) or check_component(ctype, data, name))
+    validator.apply_patch([{"op": "replace", "path": "/nodes/1/type", "value": "link"},
+                           {"op": "add", "path": "/edges/0", "value": ["Node_1", "Node_5"]}])
+    assert [ctype.__name__ for ctype in checked] == ["PywrNode", "PywrEdge"]
@@ -0,0 +1,115 @@
+import mmap
+import pytest
+
+from pywrparser.jsonbackend import (
+    PREFERENCE,
+    available_backends,
+    get_backend
+)
+from pywrparser.parsers import PywrJSONParser
+from pywrparser.types.exceptions import PywrParserException
+from pywrparser.types.network import PywrNetwork
+
+from .test_duplicates import DUPLICATES_SRC
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return request.param
+
+
+@pytest.fixture(params=[name for name in available_backends() if get_backend(name).accelerated])
+def accelerated_backend(request):
+    return get_backend(request.param)
+
+
+def error_messages(parser):
+    return {section: [str(e) for e in errs] for section, errs in parser.errors.items()}
+
+
+def test_backend_unknown():
+    """ Unknown backends are rejected """
+    with pytest.raises(ValueError):
+        get_backend("nonesuch")
+
+
+def test_backend_auto():
+    """ The default backend is the first installed in order of preference """
+    installed = available_backends()
+    preferred = [name for name in PREFERENCE if name in installed]
+    assert get_backend().name == preferred[0]
+    assert get_backend("auto") is get_backend()
+
+
+def test_backend_valid_network(backend, valid_network_file):
+    """ Each backend decodes a valid network identically """
+    with open(valid_network_file, "rb") as fp:
+        src = fp.read()
+    network, errors, warnings = PywrNetwork.from_json(src, json_backend=backend)
+    reference, _, _ = PywrNetwork.from_json(src, json_backend="json")
+    assert errors is None
+    assert network.as_dict() == reference.as_dict()
+
+
+def test_backend_duplicates(backend):
+    """ Duplicates are reported identically by each backend """
+    parser = PywrJSONParser(DUPLICATES_SRC, json_backend=backend)
+    parser.parse()
+    reference = PywrJSONParser(DUPLICATES_SRC, json_backend="json")
+    reference.parse()
+    assert [d.as_dict() for d in parser.duplicates] == [d.as_dict() for d in reference.duplicates]
+    assert error_messages(parser) == error_messages(reference)
+
+
+def test_backend_invalid_json(backend):
+    """ Invalid documents raise the same message with each backend """
+    src = '{"nodes": [{"name": "a"},]}'
+    with pytest.raises(PywrParserException) as exc:
+        PywrJSONParser(src, json_backend=backend)
+    with pytest.raises(PywrParserException) as ref:
+        PywrJSONParser(src, json_backend="json")
+    assert str(exc.value) == str(ref.value)
+
+
+def test_backend_nonstandard_constants(backend):
+    """ Constants which the stdlib accepts are decoded by every backend """
+    src = '{"parameters": {"p": {"type": "constant", "value": NaN}}}'
+    parser = PywrJSONParser(src, json_backend=backend)
+    assert parser.src["parameters"]["p"]["value"] != parser.src["parameters"]["p"]["value"]
+
+
+@pytest.mark.parametrize("src", [
+    '{"a": {"b": 1, "b": 2}}',
+    '{"a": [{"x": "1:2", "x": "3"}]}',
+    '{"a": 1, "a": 1}'
+])
+def test_backend_detects_duplicate_keys(accelerated_backend, src):
+    """ Documents with duplicate keys are passed back to the stdlib decoder """
+    decoded = accelerated_backend.loads(src)
+    assert not accelerated_backend.has_unique_keys(src, decoded)
+
+
+@pytest.mark.parametrize("src", [
+    '{"a": "x:y", "b": {"c": 1}}',
+    '{"a\\u003ab": 1, "c": "\\u003A"}'
+])
+def test_backend_unique_keys(accelerated_backend, src):
+    """ Colons within strings do not appear as duplicates """
+    decoded = accelerated_backend.loads(src)
+    assert accelerated_backend.has_unique_keys(src, decoded)
+
+
+def test_backend_mmap(backend, valid_network_file):
+    """ Memory-mapped sources are decoded by each backend """
+    with open(valid_network_file, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as src:
+            parser = PywrJSONParser(src, json_backend=backend)
+    parser.parse()
+    assert not parser.has_errors
+
+
+def test_backend_as_json(backend, valid_network_file):
+    """ Networks encoded by each backend decode to the same document """
+    import json
+    network, _, _ = PywrNetwork.from_file(valid_network_file)
+    assert json.loads(network.as_json(json_backend=backend)) == network.as_dict()
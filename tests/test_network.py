@@ -84,3 +84,35 @@ def test_network_promote_inline_recorders(valid_network_file):
     assert not isinstance(node.data["max_flow"], PywrRecorder)
     network.promote_inline_recorders()
     assert isinstance(node.data["max_flow"], PywrRecorder)
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test_network_from_json_buffer(valid_network_file, buffer_type):
+    """
+    Bytes-like sources are parsed without prior decoding
+    """
+    with open(valid_network_file, 'rb') as fp:
+        src = buffer_type(fp.read())
+    network, errors, warnings = PywrNetwork.from_json(src)
+    assert network is not None
+    assert errors is None
+
+def test_network_from_json_mmap(valid_network_file):
+    import mmap
+    with open(valid_network_file, 'rb') as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            network, errors, warnings = PywrNetwork.from_json(mm)
+    assert network is not None
+
+@pytest.mark.parametrize("mmap_threshold", [0, None])
+def test_network_from_file_mmap(valid_network_file, mmap_threshold):
+    """
+    Files are parsed identically whether or not they are memory-mapped
+    """
+    network, errors, warnings = PywrNetwork.from_file(valid_network_file, mmap_threshold=mmap_threshold)
+    reference, _, _ = PywrNetwork.from_file(valid_network_file)
+    assert network.as_dict() == reference.as_dict()
+
+def test_network_from_binary_file_object(valid_network_file):
+    with open(valid_network_file, 'rb') as fp:
+        network, errors, warnings = PywrNetwork.from_file(fp)
+    assert network is not None
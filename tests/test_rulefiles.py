@@ -0,0 +1,136 @@
+import json
+import pytest
+
+from pywrparser.parsers import PywrJSONParser
+from pywrparser.rulefiles import load_rule_file
+from pywrparser.types.exceptions import PywrParserException
+from pywrparser.types.network import PywrNetwork
+
+
+HOUSE_RULES = """
+name = "House Rules"
+version = "0.1.0"
+
+[[nodes]]
+id = "storage_volumes"
+type = "storage"
+required = ["max_volume", "initial_volume"]
+value_types = { max_volume = ["number", "string"] }
+
+[[nodes]]
+id = "no_comments"
+forbidden = ["notes"]
+level = "warning"
+
+[[parameters]]
+id = "param_names"
+name_pattern = "^[a-z][a-z0-9_]*$"
+"""
+
+
+@pytest.fixture
+def rule_file(tmp_path):
+    path = tmp_path / "house.toml"
+    path.write_text(HOUSE_RULES)
+    return str(path)
+
+
+@pytest.fixture
+def network_src(valid_network_file):
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src["nodes"] += [
+        {"name": "store1", "type": "Storage", "max_volume": True},
+        {"name": "store2", "type": "storage", "max_volume": 10, "initial_volume": 5},
+        {"name": "link1", "type": "link", "notes": "Some notes"}
+    ]
+    src["parameters"] = {
+        "Bad Name": {"type": "constant", "value": 1},
+        "good_name": {"type": "constant", "value": 2}
+    }
+    return src
+
+
+def rule_names(results, section):
+    return [getattr(eow, "rule", None) or eow.warning for eow in results.get(section, [])]
+
+
+def test_rule_file_applied(rule_file, network_src):
+    """
+    Declared rules are applied to the components of the matching types only
+    """
+    parser = PywrJSONParser(json.dumps(network_src), rule_files=[rule_file])
+    parser.parse()
+
+    assert rule_names(parser.errors, "nodes") == ["rule_storage_volumes"]
+    message = str(parser.errors["nodes"][0].exc)
+    assert "store1" in message and "'initial_volume'" in message and "'max_volume' is not of type" in message
+    assert rule_names(parser.errors, "parameters") == ["rule_param_names"]
+    assert rule_names(parser.warnings, "nodes") == ["warn_no_comments"]
+
+
+def test_rule_file_json(tmp_path, network_src):
+    """
+    Rule files may be JSON, and apply alongside the rules of Python classes
+    """
+    path = tmp_path / "house.json"
+    path.write_text(json.dumps({"parameters": [{"id": "has_comment", "required": ["comment"],
+                                                "type": "constant", "message": "No comment"}]}))
+    del network_src["parameters"]["Bad Name"]
+    network_src["parameters"][" spaced"] = {"type": "constant", "value": 1}
+
+    network_src["parameters"]["untyped"] = {"value": 1}
+
+    _, errors, _ = PywrNetwork.from_json(json.dumps(network_src), rule_files=[path])
+    assert rule_names(errors, "parameters") == ["rule_has_comment", "rule_has_comment",
+                                                "rule_type_required"]
+    assert str(errors["parameters"][0].exc) == "No comment"
+
+
+def test_rule_file_not_sticky(rule_file, network_src):
+    """
+    Rule files apply only to the parser given them
+    """
+    PywrJSONParser(json.dumps(network_src), rule_files=[rule_file]).parse()
+    parser = PywrJSONParser(json.dumps(network_src))
+    parser.parse()
+    assert "nodes" not in parser.errors
+
+
+def test_rule_file_compiled_once(rule_file):
+    assert load_rule_file(rule_file) is load_rule_file(rule_file)
+
+
+def test_rule_file_parallel(rule_file, network_src):
+    """
+    Declared rules are applied by worker processes
+    """
+    network_src["parameters"].update({f"p{i}": {"type": "constant", "value": i} for i in range(100)})
+    parser = PywrJSONParser(json.dumps(network_src), rule_files=[rule_file])
+    parser.parse(jobs=2, chunk_size=20)
+    assert rule_names(parser.errors, "nodes") == ["rule_storage_volumes"]
+    assert rule_names(parser.errors, "parameters") == ["rule_param_names"]
+
+
+@pytest.mark.parametrize("content", [
+    '[[nodes]]\nrequired = "max_volume"',
+    '[[nodes]]\nlevel = "fatal"',
+    '[[nodes]]\nunknown = 1',
+    '[[nodes]]\nname_pattern = "["',
+    '[[nodes]]\nvalue_types = { a = "decimal" }',
+    '[[widgets]]\nrequired = ["a"]',
+    'not toml'
+])
+def test_invalid_rule_file(tmp_path, content):
+    path = tmp_path / "invalid.toml"
+    path.write_text(content)
+    with pytest.raises(PywrParserException):
+        load_rule_file(path)
+
+
+def test_from_file_invalid_rule_file(valid_network_file, tmp_path):
+    """
+    An unreadable rule file is reported as a network error by from_file
+    """
+    _, errors, _ = PywrNetwork.from_file(valid_network_file, rule_files=[tmp_path / "missing.toml"])
+    assert "Unable to read rule file" in str(errors["network"][0])
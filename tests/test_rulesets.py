@@ -1,6 +1,15 @@
+import json
+import pickle
 import pytest
+import sys
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
 
 from pywrparser import rules
+from pywrparser.parsers import PywrJSONParser
+from pywrparser.types.exceptions import PywrParserException
+from pywrparser.types.network import PywrNetwork
 
 
 def test_all_rulesets_complete():
@@ -14,3 +23,174 @@ def test_all_rulesets_complete():
         assert data["name"] == ruleset_mod.__ruleset_name__
         assert data["version"] == ruleset_mod.__version__
         assert data["description"] == ruleset_mod.__description__
+
+
+def strict_network_src(valid_network_file):
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src["nodes"].append({"name": "_hidden", "type": "link"})
+    return json.dumps(src)
+
+
+def test_get_ruleset_shared():
+    """
+    Each ruleset is resolved once and shared
+    """
+    strict = rules.get_ruleset("strict")
+    assert rules.get_ruleset("strict") is strict
+    assert rules.get_ruleset(strict) is strict
+    assert rules.get_ruleset() is rules.get_ruleset(None)
+    assert strict.types["nodes"].__name__ == "StrictNode"
+    assert pickle.loads(pickle.dumps(strict)) is strict
+    with pytest.raises(KeyError):
+        rules.get_ruleset("nonesuch")
+
+
+def test_ruleset_not_sticky(valid_network_file):
+    """
+    A ruleset applies only to the parser given it
+    """
+    src = strict_network_src(valid_network_file)
+    strict = PywrJSONParser(src, ruleset="strict")
+    strict.parse()
+    default = PywrJSONParser(src)
+    default.parse()
+    assert strict.errors["nodes"][0].rule == "rule_no_undersstart"
+    assert "nodes" not in default.errors
+
+
+def test_rulesets_concurrent(valid_network_file):
+    """
+    Networks may be validated against different rulesets at once by threads
+    """
+    src = strict_network_src(valid_network_file)
+    barrier = threading.Barrier(8)
+
+    def validate(ruleset):
+        barrier.wait()
+        _, errors, _ = PywrNetwork.from_json(src, ruleset=ruleset)
+        return ruleset, errors
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(validate, ["strict", None] * 4))
+
+    for ruleset, errors in results:
+        assert (errors is not None) == (ruleset == "strict")
+
+
+def test_ruleset_with_rule_file(valid_network_file, tmp_path):
+    """
+    Rule files apply alongside the rules of a ruleset
+    """
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"nodes": [{"id": "no_links", "type": "link", "forbidden": ["type"]}]}))
+    _, errors, _ = PywrNetwork.from_json(strict_network_src(valid_network_file),
+                                         ruleset="strict", rule_files=[path])
+    assert {eow.rule for eow in errors["nodes"]} == {"rule_no_undersstart", "rule_no_links"}
+
+
+
+def test_several_rulesets(valid_network_file, monkeypatch):
+    """
+    A network is decoded once and validated against each of several rulesets
+    as if by each alone
+    """
+    src = strict_network_src(valid_network_file)
+    decode = PywrJSONParser.decode
+    decoded = []
+    monkeypatch.setattr(PywrJSONParser, "decode", lambda self, json_src: decoded.append(1) or decode(self, json_src))
+    results = PywrNetwork.from_json(src, ruleset=["strict", None, "pywrmaster", "strict"])
+    assert len(decoded) == 1
+    assert list(results) == ["strict", None, "pywrmaster"]
+
+    for key, (network, errors, warnings) in results.items():
+        expected = PywrNetwork.from_json(src, ruleset=key)
+        assert (network is None) == (expected[0] is None)
+        assert network is None or network.ruleset is rules.get_ruleset(key)
+        assert ([str(err) for err in (errors or {}).get("nodes", [])]
+                == [str(err) for err in (expected[1] or {}).get("nodes", [])])
+    assert results["strict"][1]["nodes"][0].rule == "rule_no_undersstart"
+
+
+def test_several_rulesets_failure(valid_network_file):
+    results = PywrNetwork.from_file(valid_network_file, ruleset=["strict", "nonesuch"])
+    assert list(results) == ["strict", "nonesuch"]
+    assert "No ruleset with key: nonesuch" in str(results["strict"][1]["network"][0])
+    results = PywrNetwork.from_file("missing.json", ruleset=["strict", None])
+    assert list(results) == ["strict", None]
+    assert all(errors["network"] for _, errors, _ in results.values())
+
+
+HOUSE_RULESET = '''
+from pywrparser.types.node import PywrNode
+
+__key__ = "house"
+__ruleset_name__ = "House Ruleset"
+__version__ = "0.1.0"
+__description__ = "A ruleset installed by another package"
+
+
+class HouseNode(PywrNode):
+    def rule_no_buses(self):
+        assert self.type != "bus", "Buses are not permitted"
+'''
+
+
+@pytest.fixture(params=["house"])
+def installed_ruleset(request, tmp_path, monkeypatch):
+    """
+    A ruleset module registered by the entry point of an installed distribution,
+    under the entry point name given by the fixture parameter
+    """
+    (tmp_path / "house_rules.py").write_text(HOUSE_RULESET)
+    dist_info = tmp_path / "house_rules-0.1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: house-rules\nVersion: 0.1.0\n")
+    (dist_info / "entry_points.txt").write_text(f"[pywrparser.rulesets]\n{request.param} = house_rules\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    rules.refresh_rulesets()
+    yield request.param
+    monkeypatch.undo()
+    sys.modules.pop("house_rules", None)
+    rules.refresh_rulesets()
+
+
+def test_entry_point_ruleset(installed_ruleset, valid_network_file):
+    """
+    Rulesets registered by entry points are discovered without being imported
+    """
+    assert installed_ruleset in rules.get_ruleset_keys()
+    assert "house_rules" not in sys.modules
+
+    _, errors, _ = PywrNetwork.from_file(valid_network_file, ruleset=installed_ruleset)
+    assert "house_rules" in sys.modules
+    assert errors["nodes"][0].rule == "rule_no_buses"
+    assert rules.get_rulesets()[installed_ruleset]["name"] == "House Ruleset"
+
+
+@pytest.mark.parametrize("installed_ruleset", ["cottage"], indirect=True)
+def test_entry_point_key_mismatch(installed_ruleset):
+    """
+    A ruleset module which declares a key other than that by which it is
+    registered is not resolved
+    """
+    assert installed_ruleset in rules.get_ruleset_keys()
+    with pytest.raises(PywrParserException, match="declares __key__ 'house'"):
+        rules.get_ruleset(installed_ruleset)
+    with pytest.raises(PywrParserException):
+        rules.get_rulesets()
+
+
+def test_ruleset_lookups_cached():
+    """
+    Rulesets are discovered and their modules imported only once
+    """
+    rules.get_rulesets()
+    discovered = rules.ruleset_loaders.cache_info().misses
+    imported = rules.get_ruleset_module.cache_info().misses
+    for _ in range(3):
+        rules.get_rulesets()
+        rules.get_ruleset_module("strict")
+        assert "strict" in rules.get_ruleset_keys()
+    assert rules.ruleset_loaders.cache_info().misses == discovered
+    assert rules.get_ruleset_module.cache_info().misses == imported
@@ -0,0 +1,124 @@
+import io
+import json
+import pytest
+
+from pywrparser import parse
+from pywrparser.incremental import IncrementalValidator
+from pywrparser.parsers import (
+    PywrJSONParser,
+    PywrJSONStreamParser
+)
+from pywrparser.selection import RuleSelection
+from pywrparser.utils import profile_rules
+
+
+@pytest.fixture
+def network_src(valid_network_file):
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src["nodes"] += [
+        {"name": "A", "type": "link"},
+        {"name": "B", "type": "storage"},
+        {"name": "C", "type": "link"}
+    ]
+    src["parameters"]["no_value"] = {"type": "constant"}
+    return src
+
+
+def rule_names(results, section):
+    return [getattr(eow, "rule", None) or eow.warning for eow in results.get(section, [])]
+
+
+def profiled_calls(profile):
+    return {f"{row['class']}.{row['rule']}": row["calls"] for row in profile.rows()}
+
+
+def test_ignored_rules_never_invoked(network_src):
+    with profile_rules() as profile:
+        parser = PywrJSONParser(json.dumps(network_src), ignore=["warn_node_*", "rule_constant_has_value"])
+        parser.parse()
+    calls = profiled_calls(profile)
+    assert not any(name.startswith("PywrNode.warn_node_") for name in calls)
+    assert "PywrParameter.rule_constant_has_value" not in calls
+    assert calls["PywrNode.warn_storage_has_max_volume"] == 1
+    assert rule_names(parser.warnings, "nodes") == ["warn_storage_has_max_volume"]
+    assert "parameters" not in parser.errors
+
+
+def test_select_qualified_pattern(network_src):
+    parser = PywrJSONParser(json.dumps(network_src), select=["PywrNode.warn_*"])
+    parser.parse()
+    assert not parser.has_errors
+    assert sorted(set(rule_names(parser.warnings, "nodes"))) == [
+        "warn_node_name_min_len", "warn_storage_has_max_volume"
+    ]
+
+
+def test_selection_hashable():
+    assert RuleSelection(["a*"], ["b"]) == RuleSelection(("a*",), ("b",))
+    assert hash(RuleSelection(["a*"])) == hash(RuleSelection(("a*",)))
+    assert not RuleSelection() and RuleSelection(ignore=["b"])
+    with pytest.raises(TypeError):
+        RuleSelection("warn_*")
+
+
+@pytest.mark.parametrize("parser_class", [PywrJSONParser, PywrJSONStreamParser])
+def test_metadata_suppressions(network_src, parser_class):
+    network_src["metadata"]["pywrparser"] = {
+        "ignore": {
+            "nodes": {"A": ["warn_*"], "B": ["warn_storage_*"]},
+            "parameters": {"no_value": ["rule_*_has_value"]}
+        }
+    }
+    json_src = json.dumps(network_src)
+    if parser_class is PywrJSONStreamParser:
+        json_src = io.StringIO(json_src)
+    parser = parser_class(json_src)
+    parser.parse()
+    assert not parser.has_errors
+    assert not any('"A"' in warning.valuetext for warning in parser.warnings["nodes"])
+    assert rule_names(parser.warnings, "nodes") == ["warn_node_name_min_len"] * 2
+
+
+@pytest.mark.parametrize("declaration", [
+    ["warn_*"],
+    {"ignore": {"edges": {"A": ["warn_*"]}}},
+    {"ignore": {"nodes": {"A": "warn_*"}}},
+    {"ignore": {"nodes": ["A"]}}
+])
+def test_invalid_suppressions(network_src, declaration):
+    network_src["metadata"]["pywrparser"] = declaration
+    parser = PywrJSONParser(json.dumps(network_src))
+    parser.parse()
+    assert any("Invalid rule suppressions" in str(err) for err in parser.errors["network"])
+    assert "warn_node_name_min_len" in rule_names(parser.warnings, "nodes")
+
+
+def test_selection_parallel(network_src):
+    network_src["parameters"].update({f"p{i}": {"type": "constant"} for i in range(100)})
+    network_src["metadata"]["pywrparser"] = {"ignore": {"parameters": {"p0": ["*"]}}}
+    parser = PywrJSONParser(json.dumps(network_src), ignore=["warn_*"])
+    parser.parse(jobs=2, chunk_size=20)
+    assert "nodes" not in parser.warnings
+    assert len(parser.errors["parameters"]) == 100
+
+
+def test_incremental_suppressions(network_src):
+    validator = IncrementalValidator(json.dumps(network_src))
+    assert rule_names(validator.warnings, "nodes").count("warn_node_name_min_len") == 3
+    _, warnings = validator.apply_patch([{"op": "add", "path": "/metadata/pywrparser",
+                                          "value": {"ignore": {"nodes": {"A": ["warn_*"]}}}}])
+    assert rule_names(warnings, "nodes").count("warn_node_name_min_len") == 2
+    errors, warnings = validator.apply_patch([{"op": "remove", "path": "/metadata"}])
+    assert rule_names(warnings, "nodes").count("warn_node_name_min_len") == 3
+
+
+def test_cli_ignore(capsys, invalid_network_file):
+    """ Only network errors remain once every rule and warning is ignored """
+    args = parse.configure_args(["-f", invalid_network_file, "--json-output",
+                                 "--ignore", "rule_*", "--ignore", "warn_*"])
+    assert args.select is None and args.ignore == ["rule_*", "warn_*"]
+    parse.handle_args(args)
+    report = json.loads(capsys.readouterr().out)
+    assert report["parse_results"]["warnings"] == 0
+    assert list(report["errors"]) == ["network"]
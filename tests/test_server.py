@@ -0,0 +1,122 @@
+import gzip
+import http.client
+import json
+import pytest
+import socket
+import threading
+
+from pywrparser.server import (
+    ValidationService,
+    create_server
+)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = ValidationService(jobs=1, max_pending=4)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def connection(request, service, tmp_path):
+    if request.param == "unix":
+        server = create_server(service, socket_path=str(tmp_path / "pywrparser.sock"))
+        connect = lambda: UnixHTTPConnection(server.server_address)
+    else:
+        server = create_server(service, port=0)
+        connect = lambda: http.client.HTTPConnection(*server.server_address)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield connect
+    server.shutdown()
+    server.server_close()
+
+
+def request(connect, method, url, body=None):
+    conn = connect()
+    conn.request(method, url, body=body)
+    response = conn.getresponse()
+    payload = json.loads(response.read())
+    conn.close()
+    return response.status, payload
+
+
+def test_serve_valid(connection, valid_network_file):
+    """ Valid networks return a report without errors """
+    with open(valid_network_file, "rb") as fp:
+        body = fp.read()
+    status, results = request(connection, "POST", "/validate?name=model.json", body)
+    assert status == 200
+    assert results["parse_results"]["file"]["name"] == "model.json"
+    assert results["parse_results"]["errors"] == 0
+    assert results["parse_results"]["file"]["size"] == len(body)
+
+
+def test_serve_invalid(connection, invalid_network_file):
+    with open(invalid_network_file, "rb") as fp:
+        status, results = request(connection, "POST", "/validate", fp.read())
+    assert status == 200
+    assert results["parse_results"]["errors"] > 0
+    assert "nodes" in results["errors"]
+
+
+def test_serve_invalid_json(connection):
+    status, results = request(connection, "POST", "/validate", b'{"nodes": [')
+    assert status == 200
+    assert results["errors"]["network"][0]["message"].startswith("Invalid JSON document")
+
+
+def test_serve_unknown_ruleset(connection):
+    status, results = request(connection, "POST", "/validate?ruleset=nonesuch", b"{}")
+    assert status == 400
+
+
+def test_serve_health(connection):
+    status, health = request(connection, "GET", "/health")
+    assert status == 200 and health["status"] == "ok"
+
+
+def test_serve_max_pending(connection, service):
+    """ Requests beyond the pending limit are refused """
+    for _ in range(service.max_pending):
+        assert service.admit()
+    try:
+        status, _ = request(connection, "POST", "/validate", b"{}")
+        assert status == 503
+    finally:
+        for _ in range(service.max_pending):
+            service.release()
+
+
+def test_serve_max_size(service):
+    """
+    Requests whose content exceeds the size permitted are refused, whether
+    as received or once decompressed
+    """
+    server = create_server(service, port=0, max_size=64 * 1024)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    connect = lambda: http.client.HTTPConnection(*server.server_address)
+    try:
+        status, results = request(connect, "POST", "/validate", b" " * (64 * 1024 + 1))
+        assert status == 413
+        bomb = gzip.compress(b" " * 1024 * 1024)
+        assert len(bomb) < 64 * 1024
+        status, results = request(connect, "POST", "/validate", bomb)
+        assert status == 413 and "exceeds 65536 bytes" in results["error"]
+        status, results = request(connect, "POST", "/validate", gzip.compress(b"{}"))
+        assert status == 200
+    finally:
+        server.shutdown()
+        server.server_close()
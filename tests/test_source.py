@@ -0,0 +1,151 @@
+import io
+import pytest
+
+from pywrparser.display import results_as_dict
+from pywrparser.source import (
+    ContentSizeExceeded,
+    Source
+)
+from pywrparser.types.network import PywrNetwork
+from pywrparser.utils import sha256digest
+
+
+@pytest.mark.parametrize("mmap_threshold", [None, 1])
+def test_source_digest(valid_network_file, mmap_threshold):
+    """ Files are digested as read, whether or not memory-mapped """
+    source = Source.read(valid_network_file, mmap_threshold=mmap_threshold)
+    assert source.sha256 == sha256digest(valid_network_file)
+    assert source.size == len(bytes(source.content))
+    assert source.read_time >= 0
+    source.release()
+    assert source.content is None
+
+
+@pytest.mark.parametrize("mode", ["rb", "r"])
+def test_source_file_object(valid_network_file, mode):
+    """ File objects, such as stdin, are digested as their bytes """
+    with open(valid_network_file, mode) as fp:
+        stream = io.BytesIO(fp.read()) if mode == "rb" else io.StringIO(fp.read())
+    source = Source.read(stream)
+    assert source.name == "stdin"
+    assert source.sha256 == sha256digest(valid_network_file)
+
+
+def test_source_no_digest(valid_network_file):
+    source = Source.read(valid_network_file, digest=False)
+    assert source.sha256 is None and source.size > 0
+
+
+def test_from_file_source(valid_network_file):
+    """ A source which has been read is parsed and released """
+    source = Source.read(valid_network_file)
+    network, errors, warnings = PywrNetwork.from_file(source)
+    assert network is not None and errors is None
+    assert source.content is None and source.sha256
+
+
+def test_results_source(tmp_path, valid_network_file):
+    """ Reports describe the source without reading the file again """
+    filename = tmp_path / "network.json"
+    filename.write_bytes(open(valid_network_file, "rb").read())
+    source = Source.read(filename)
+    filename.unlink()
+    file_results = results_as_dict(filename, None, None, source=source)["parse_results"]["file"]
+    assert file_results["name"] == "network.json"
+    assert file_results["sha256"] == source.sha256
+    assert file_results["size"] == source.size
+
+
+COMPRESSORS = {
+    "gzip": ("gzip", ".gz"),
+    "bz2": ("bz2", ".bz2"),
+    "xz": ("lzma", ".xz")
+}
+
+
+def compress(compression, data):
+    import importlib
+    module, _ = COMPRESSORS[compression]
+    return importlib.import_module(module).compress(data)
+
+
+@pytest.fixture(params=list(COMPRESSORS))
+def compressed_network(request, tmp_path, valid_network_file):
+    compression = request.param
+    data = open(valid_network_file, "rb").read()
+    filename = tmp_path / f"network.json{COMPRESSORS[compression][1]}"
+    filename.write_bytes(compress(compression, data))
+    return compression, filename, data
+
+
+def test_source_compressed(compressed_network, valid_network_file):
+    """ Compressed files are decompressed, with digests of both forms of content """
+    compression, filename, data = compressed_network
+    source = Source.read(filename)
+    assert source.compression == compression
+    assert source.content == data
+    assert source.sha256 == sha256digest(filename)
+    assert source.content_sha256 == sha256digest(valid_network_file)
+    assert source.size == filename.stat().st_size
+    assert source.content_size == len(data)
+
+
+def test_source_compressed_file_object(compressed_network):
+    """ Compression is detected in file objects, such as stdin """
+    compression, filename, data = compressed_network
+    source = Source.read(io.BytesIO(filename.read_bytes()))
+    assert source.compression == compression and source.content == data
+
+
+def test_source_concatenated_streams(tmp_path):
+    """ Concatenated compressed streams are decompressed in turn """
+    filename = tmp_path / "network.json.gz"
+    filename.write_bytes(compress("gzip", b'{"a": ') + compress("gzip", b'1}'))
+    assert Source.read(filename).content == b'{"a": 1}'
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+def test_source_max_size(tmp_path, compression):
+    """
+    Reading stops once the decompressed content exceeds the size permitted,
+    however small the compressed input
+    """
+    filename = tmp_path / "network.json.z"
+    filename.write_bytes(compress(compression, b" " * 8 * 1024 * 1024))
+    assert filename.stat().st_size < 64 * 1024
+    with pytest.raises(ContentSizeExceeded):
+        Source.read(filename, max_size=1024 * 1024)
+    with pytest.raises(ContentSizeExceeded):
+        Source.read(io.BytesIO(filename.read_bytes()), max_size=1024 * 1024)
+    assert Source.read(filename, max_size=8 * 1024 * 1024).content_size == 8 * 1024 * 1024
+
+
+def test_source_max_size_uncompressed(valid_network_file):
+    size = Source.read(valid_network_file).size
+    assert Source.read(valid_network_file, max_size=size).size == size
+    with pytest.raises(ContentSizeExceeded):
+        Source.read(valid_network_file, max_size=size - 1)
+
+
+def test_from_file_compressed(compressed_network):
+    _, filename, _ = compressed_network
+    network, errors, warnings = PywrNetwork.from_file(filename)
+    assert network is not None and errors is None
+
+
+def test_from_file_truncated(compressed_network):
+    """ Invalid compressed input is reported as an error """
+    compression, filename, _ = compressed_network
+    filename.write_bytes(filename.read_bytes()[:-8])
+    network, errors, warnings = PywrNetwork.from_file(filename)
+    assert network is None
+    assert f"Invalid {compression} input" in str(errors["network"][0])
+
+
+def test_results_compressed(compressed_network):
+    compression, filename, data = compressed_network
+    source = Source.read(filename)
+    file_results = results_as_dict(filename, None, None, source=source)["parse_results"]["file"]
+    assert file_results["compression"] == compression
+    assert file_results["content_size"] == len(data)
+    assert file_results["content_sha256"] == source.content_sha256
@@ -0,0 +1,80 @@
+"""
+Startup time budgets for the command line utility.
+
+Each budget is the time in milliseconds which a command may take beyond the
+startup of a bare interpreter, taking the fastest of several runs.  Budgets
+may be scaled for slow systems with the PYWRPARSER_STARTUP_BUDGET_SCALE
+environment variable.  As timings depend upon the system, the budgets are
+marked as benchmarks and run only when selected, with ``pytest -m benchmark``.
+"""
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+VALID_NETWORK = ROOT / "tests" / "data" / "valid_network.json"
+RUNS = 5
+
+BUDGET_SCALE = float(os.environ.get("PYWRPARSER_STARTUP_BUDGET_SCALE", 1))
+VERSION_BUDGET_MS = 150
+VALIDATION_BUDGET_MS = 400
+
+
+def python(*args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(ROOT), env.get("PYTHONPATH"))))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, check=True)
+
+
+def fastest(*args):
+    """ Returns the fastest time in milliseconds of several runs of `args` """
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        python(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+@pytest.fixture(scope="module")
+def interpreter_ms():
+    return fastest("-c", "pass")
+
+
+def loaded_modules(*argv):
+    """ Returns the modules imported by running the utility with `argv` """
+    code = ("import sys; from pywrparser import parse; sys.argv = ['pywrparser', *sys.argv[1:]]\n"
+            "try:\n    parse.run()\nexcept SystemExit:\n    pass\n"
+            "print(' '.join(sys.modules), file=sys.stderr)")
+    return set(python("-c", code, *argv).stderr.decode().split())
+
+
+def test_version_imports():
+    """ Neither rich nor any ruleset is imported to display the version """
+    modules = loaded_modules("--version")
+    assert "rich" not in modules
+    assert not any(m.startswith("pywrparser.rulesets") for m in modules)
+
+
+def test_json_validation_imports():
+    """ rich and rulesets are not imported for a validation with JSON output """
+    modules = loaded_modules("-f", str(VALID_NETWORK), "--json-output")
+    assert "rich" not in modules
+    assert not any(m.startswith("pywrparser.rulesets") for m in modules)
+
+
+@pytest.mark.benchmark
+def test_version_budget(interpreter_ms):
+    elapsed = fastest("-m", "pywrparser.parse", "--version") - interpreter_ms
+    assert elapsed < VERSION_BUDGET_MS * BUDGET_SCALE
+
+
+@pytest.mark.benchmark
+def test_validation_budget(interpreter_ms):
+    elapsed = fastest("-m", "pywrparser.parse", "-f", str(VALID_NETWORK),
+                      "--json-output", "--no-digest") - interpreter_ms
+    assert elapsed < VALIDATION_BUDGET_MS * BUDGET_SCALE
@@ -0,0 +1,91 @@
+import io
+import json
+import pytest
+
+from pywrparser.parsers import (
+    PywrJSONParser,
+    PywrJSONStreamParser,
+    PywrComponentVisitor
+)
+from pywrparser.types.exceptions import PywrParserException
+from pywrparser.types.network import PywrNetwork
+
+
+class CountingVisitor(PywrComponentVisitor):
+    def __init__(self):
+        self.nodes = 0
+        self.parameters = []
+
+    def visit_node(self, node):
+        self.nodes += 1
+
+    def visit_parameter(self, parameter):
+        self.parameters.append(parameter.name)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1024*1024])
+def test_stream_matches_parser(invalid_network_file, invalid_network, chunk_size):
+    """
+    The stream parser finds the same errors as the document parser,
+    irrespective of the size of each read
+    """
+    with open(invalid_network_file, 'rb') as fp:
+        parser = PywrJSONStreamParser(fp, chunk_size=chunk_size)
+        parser.parse()
+
+    for component, errors in invalid_network.errors.items():
+        assert len(parser.errors[component]) == len(errors)
+    assert parser.duplicate_edges == invalid_network.duplicate_edges
+
+
+def test_stream_network_from_stream(valid_network_file, valid_network):
+    """
+    A valid network read as a stream has the same content as one parsed whole
+    """
+    with open(valid_network_file, 'r') as fp:
+        network, errors, warnings = PywrNetwork.from_stream(fp)
+    assert errors is None
+    assert network.as_dict() == PywrNetwork(valid_network).as_dict()
+
+
+def test_stream_visitor_without_retention(valid_network_file):
+    """
+    A visitor receives each component when components are not retained
+    """
+    visitor = CountingVisitor()
+    with open(valid_network_file, 'r') as fp:
+        parser = PywrJSONStreamParser(fp, chunk_size=16)
+        parser.parse(visitor=visitor, retain_components=False)
+
+    with open(valid_network_file, 'r') as fp:
+        src = json.load(fp)
+    assert visitor.nodes == len(src["nodes"])
+    assert visitor.parameters == list(src["parameters"])
+    assert len(parser.nodes) == 0
+
+
+def test_stream_callback(valid_network_file):
+    """
+    A plain callable may be used as a visitor
+    """
+    seen = []
+    with open(valid_network_file, 'r') as fp:
+        PywrJSONStreamParser(fp).parse(visitor=lambda section, c: seen.append(section))
+    assert "metadata" in seen and "edges" in seen
+
+
+@pytest.mark.parametrize("src", [
+    '{"nodes": [{"name": "a"} {"name": "b"}]}',
+    '{"nodes": [],\n "edges": [["a", "b"]\n  "parameters": {}}',
+    '{"metadata": {"title": "t"}} []',
+    '{"nodes": [{"name": "a", }]}'
+])
+def test_stream_invalid_json(src):
+    """
+    Invalid documents raise the same message as a whole-document parse
+    """
+    with pytest.raises(PywrParserException) as whole:
+        PywrJSONParser(src)
+    with pytest.raises(PywrParserException) as stream:
+        PywrJSONStreamParser(io.StringIO(src), chunk_size=4).parse()
+    assert str(stream.value) == str(whole.value)
@@ -1,4 +1,7 @@
+import json
 import pytest
+
+from types import SimpleNamespace
 from pywrparser.utils import (
     canonical_name,
     parse_reference_key
@@ -27,3 +30,204 @@ def test_canonical_names(input_node, input_attr, expected):
     Are references correctly generated in canonical format?
     """
     assert canonical_name(input_node, input_attr) == expected
+
+
+def test_rule_table_dispatch():
+    """
+    Are type-specific rules indexed by type and applied only to matching components?
+    """
+    from pywrparser.types.parameter import PywrParameter
+    from pywrparser.utils import RuleTable
+
+    table = RuleTable.for_class(PywrParameter)
+    assert "aggregated" in table.exact and "aggregatedparameter" in table.exact
+
+    warnings, rules = table.resolve(SimpleNamespace(type="AggregatedParameter"))
+    names = [name for name, _ in rules]
+    assert names == sorted(names)
+    assert "rule_aggregated_has_agg_func" in names
+    assert "rule_constant_has_value" not in names
+
+    warnings, rules = table.resolve(SimpleNamespace(type="constant"))
+    assert [name for name, _ in rules] == ["rule_constant_has_value", "rule_type_required"]
+
+    warnings, _ = table.resolve(SimpleNamespace(type="monthlyDataFrame"))
+    assert "warn_outdated_pandas" in [name for name, _ in warnings]
+
+
+def test_rule_table_untyped():
+    """
+    Do components without a string type run only the generic rules?
+    """
+    from pywrparser.types.exceptions import PywrTypeValidationErrorBundle
+    from pywrparser.types.parameter import PywrParameter
+
+    with pytest.raises(PywrTypeValidationErrorBundle) as err:
+        PywrParameter("p", {"type": 5})
+    assert [e.rule for e in err.value.errors] == ["rule_type_required"]
+
+
+def test_value_text_bounded():
+    """
+    Are values rendered only when shown, and truncated to the limit?
+    """
+    from pywrparser.utils import (
+        ValueText,
+        trim_json
+    )
+
+    value = {"type": "dataframe", "data": list(range(100000))}
+    text = ValueText(value, 50)
+    assert text.text is None
+    assert str(text) == json.dumps(value)[:50] + f"...[+{len(json.dumps(value)) - 50} chars]"
+    assert text.value is None
+
+    assert trim_json({"a": 1}, 50) == json.dumps({"a": 1})
+    assert trim_json({"a": 1}, 7) == json.dumps({"a": 1})[:7] + "...[+1 char]"
+
+
+def test_trim_json_stops(monkeypatch):
+    """
+    Is the encoding of a large value stopped once the limit is exceeded?
+    """
+    from pywrparser.utils import trim_json
+
+    iterencode = json.JSONEncoder.iterencode
+    consumed = []
+
+    def counted_iterencode(self, o, _one_shot=False):
+        chunks = iterencode(self, o, _one_shot)
+        if _one_shot:
+            return chunks
+        return (consumed.append(len(chunk)) or chunk for chunk in chunks)
+
+    monkeypatch.setattr(json.JSONEncoder, "iterencode", counted_iterencode)
+    value = {"type": "dataframe", "data": list(range(100000))}
+    text = trim_json(value, 50)
+    assert text == json.dumps(value)[:50] + f"...[+{len(json.dumps(value)) - 50} chars]"
+    assert sum(consumed) < 100
+
+
+def test_validation_warning_pickles_text():
+    """
+    Do pickled warnings carry the rendered value text rather than the value?
+    """
+    import pickle
+    from pywrparser.types.parameter import PywrParameter
+
+    param = PywrParameter("p", {"type": "monthlyprofile", "values": list(range(10000))})
+    warning, = param.warnings
+    restored = pickle.loads(pickle.dumps(warning))
+    assert restored.valuetext == warning.valuetext
+    assert len(pickle.dumps(warning)) < 1000
+
+
+def test_profile_rules(invalid_network_file):
+    """
+    Are the calls, outcomes and skips of each rule recorded while profiling?
+    """
+    from pywrparser.types.network import PywrNetwork
+    from pywrparser.utils import (
+        _rule_profile,
+        profile_rules
+    )
+
+    with profile_rules() as profile:
+        PywrNetwork.from_file(invalid_network_file)
+    assert _rule_profile.get() is None
+
+    rows = {(row["class"], row["rule"]): row for row in profile.rows()}
+    title = rows[("PywrMetadata", "rule_title_required")]
+    assert title["calls"] == title["failed"] == 1 and title["passed"] == 0
+    constant = rows[("PywrParameter", "rule_constant_has_value")]
+    parameters = sum(count for cls, count in profile.components.items()
+                     if cls.__name__ == "PywrParameter")
+    assert constant["calls"] + constant["skipped"] == parameters
+    assert all(row["passed"] + row["failed"] == row["calls"] for row in rows.values())
+    assert json.loads(profile.as_json())["rules"][0]["time"] >= profile.rows()[-1]["time"]
+
+
+def test_findings_compact(invalid_network_file):
+    """
+    Are failures recorded as compact findings, and raised as the exceptions
+    they stand for?
+    """
+    import pickle
+    from pywrparser.parsers import PywrJSONParser
+    from pywrparser.types.exceptions import PywrTypeValidationError
+    from pywrparser.types.findings import PywrErrorFinding
+
+    with open(invalid_network_file) as fp:
+        src = fp.read()
+    parser = PywrJSONParser(src)
+    parser.parse()
+    finding = parser.errors["metadata"][0]
+    assert isinstance(finding, PywrErrorFinding)
+    assert not hasattr(finding, "__dict__")
+    restored = pickle.loads(pickle.dumps(finding))
+    assert restored.as_dict() == finding.as_dict()
+    assert str(restored) == str(finding.exception())
+
+    with pytest.raises(PywrTypeValidationError) as exc_info:
+        PywrJSONParser(src).parse(raise_on_error=True)
+    assert exc_info.value.as_dict()["rule"] == "rule_title_required"
+
+
+def test_section_capture():
+    """
+    Are the findings of a section pushed in bulk and in order, or the first
+    raised, and are valid components stored as they are captured?
+    """
+    from collections import defaultdict
+    from pywrparser.types.exceptions import (
+        PywrTypeValidationError,
+        PywrValidationBudgetExhausted
+    )
+    from pywrparser.types.findings import (
+        PywrErrorFinding,
+        PywrWarningFinding
+    )
+    from pywrparser.types.warnings import PywrTypeValidationWarning
+    from pywrparser.utils import (
+        SectionCapture,
+        ValidationBudget
+    )
+
+    def component(name, errors=(), warnings=()):
+        inst = SimpleNamespace(name=name, errors=list(errors), warnings=list(warnings))
+        inst.has_warnings = bool(warnings)
+        return inst
+
+    def finding(rule):
+        return PywrErrorFinding("PywrNode", rule, "failed", "{}")
+
+    warning = PywrWarningFinding("PywrNode", "warn", "warned", "{}")
+    components = [component("a"), component("b", [finding("r1"), finding("r2")]),
+                  component("c", warnings=[warning]), component("d", [finding("r3")])]
+
+    def build(section, data, name):
+        return data
+
+    dest = SimpleNamespace(errors=defaultdict(list), warnings=defaultdict(list))
+    stored = []
+    valid = SectionCapture(False, False, dest).validate(
+        "nodes", [(c.name, c) for c in components], build, lambda section, inst: stored.append(inst.name))
+    assert [inst.name for inst in valid] == stored == ["a", "c"]
+    assert [error.rule for error in dest.errors["nodes"]] == ["r1", "r2", "r3"]
+    assert dest.warnings["nodes"] == [warning]
+
+    with pytest.raises(PywrTypeValidationError):
+        SectionCapture(True, False, dest).validate("nodes", [(None, components[1])], build)
+    with pytest.raises(PywrTypeValidationWarning):
+        SectionCapture(False, True, dest).validate("nodes", [(None, components[2])], build)
+    assert SectionCapture(False, True, dest, ignore_warnings=True).validate(
+        "nodes", [(None, components[2])], build) == [components[2]]
+
+    dest = SimpleNamespace(errors=defaultdict(list), warnings=defaultdict(list))
+    budget = ValidationBudget(max_errors=2)
+    stored = []
+    with pytest.raises(PywrValidationBudgetExhausted):
+        SectionCapture(False, False, dest, budget=budget).validate(
+            "nodes", [(c.name, c) for c in components], build, lambda section, inst: stored.append(inst.name))
+    assert stored == ["a"]
+    assert len(dest.errors["nodes"]) == 2 and budget.checked["nodes"] == 2
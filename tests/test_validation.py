@@ -116,3 +116,231 @@ def test_duplicate_edges(invalid_network):
     assert len(invalid_network.duplicate_edges) == 1
     key = next(iter(invalid_network.duplicate_edges))
     assert invalid_network.duplicate_edges[key] == 2
+
+
+def test_max_errors(invalid_network_file):
+    """
+    Validation stops once the error budget is exhausted, reporting the
+    components left unchecked
+    """
+    from pywrparser.types.exceptions import PywrValidationIncomplete
+    from pywrparser.types.network import PywrNetwork
+
+    _, all_errors, _ = PywrNetwork.from_file(invalid_network_file)
+    _, errors, _ = PywrNetwork.from_file(invalid_network_file, max_errors=5)
+
+    incomplete = errors["network"][-1]
+    assert isinstance(incomplete, PywrValidationIncomplete)
+    assert sum(len(errs) for errs in errors.values()) == 6
+    assert "nodes" not in errors and "edges" not in errors
+    assert incomplete.unchecked["nodes"] == 6
+    assert incomplete.as_dict()["unchecked"] == incomplete.unchecked
+
+    _, errors, _ = PywrNetwork.from_file(invalid_network_file, max_errors=1000)
+    assert {k: len(v) for k, v in errors.items()} == {k: len(v) for k, v in all_errors.items()}
+
+
+@pytest.mark.parametrize("max_errors", [1, 2, 3])
+def test_max_errors_network(invalid_network_file, max_errors):
+    """
+    Network errors found before components are validated are charged to the
+    budget singly, so that no more than `max_errors` errors are reported
+    """
+    from pywrparser.types.exceptions import PywrValidationIncomplete
+    from pywrparser.types.network import PywrNetwork
+
+    _, errors, _ = PywrNetwork.from_file(invalid_network_file, max_errors=max_errors)
+    assert sum(len(errs) for errs in errors.values()) == max_errors + 1
+    assert len(errors["network"]) == max_errors + 1
+    assert isinstance(errors["network"][-1], PywrValidationIncomplete)
+
+
+def test_max_errors_duplicate_names(valid_network_file):
+    """
+    Each definition of a duplicated name is counted among the components
+    left unchecked
+    """
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    del src["parameters"]
+    text = json.dumps(src)[:-1] + ', "parameters": {"x": {"name": "x"}, "x": {"name": "x"},' \
+                                  ' "x": {"name": "x"}, "y": {"type": "constant", "value": 1}}}'
+    parser = PywrJSONParser(text)
+    parser.parse(max_errors=3)
+    incomplete = parser.errors["network"][-1]
+    assert len(parser.errors["network"]) == 3 and len(parser.errors["parameters"]) == 1
+    assert incomplete.unchecked["parameters"] == 3
+    total = 2 + 4 + sum(len(src.get(section, ())) for section in
+                        ("scenarios", "scenario_combinations", "tables", "recorders", "nodes", "edges"))
+    assert f"{sum(incomplete.unchecked.values())} of {total} components" in incomplete.message
+
+
+@pytest.mark.parametrize("max_errors", [1, 2])
+def test_max_errors_missing_sections(valid_network_file, max_errors):
+    """ Missing sections are charged to the budget as other errors """
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    for section in ("metadata", "timestepper", "edges"):
+        del src[section]
+    parser = PywrJSONParser(json.dumps(src))
+    parser.parse(max_errors=max_errors)
+    assert sum(len(errors) for errors in parser.errors.values()) == max_errors + 1
+    assert "components were not checked" in parser.errors["network"][-1].message
+
+
+def test_max_warnings(valid_network_file):
+    """
+    Validation stops once the warning budget is exhausted, leaving the
+    network invalid
+    """
+    from pywrparser.types.network import PywrNetwork
+
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src["nodes"] += [{"name": f"store{i}", "type": "storage"} for i in range(3)]
+
+    network, _, warnings = PywrNetwork.from_json(json.dumps(src))
+    assert network and len(warnings["nodes"]) == 3
+
+    network, errors, warnings = PywrNetwork.from_json(json.dumps(src), max_warnings=2)
+    assert network is None
+    assert len(warnings["nodes"]) == 2
+    assert errors["network"][-1].unchecked == {"nodes": 1, "edges": len(src["edges"])}
+
+
+@pytest.fixture
+def large_network(valid_network_file):
+    """
+    A network with many parameters, recorders and nodes, some invalid or with warnings
+    """
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src.setdefault("parameters", {}).update({
+        f"param{i}": {"type": "constant", "value": i} if i % 7 else {"type": "constant"}
+        for i in range(300)
+    })
+    src.setdefault("recorders", {}).update({
+        f"rec{i}": {"type": "numpyarraynoderecorder", "node": "x"} if i % 11 else {}
+        for i in range(100)
+    })
+    src["nodes"] += [{"name": f"store{i}", "type": "storage"} for i in range(100)]
+    src["nodes"] += [{"type": "input"} for i in range(5)]
+    return json.dumps(src)
+
+
+def error_summary(results):
+    return {
+        component: [(type(eow).__name__, str(eow)) for eow in eows]
+        for component, eows in (results or {}).items()
+    }
+
+
+@pytest.mark.parametrize("inherit", [True, False])
+@pytest.mark.parametrize("max_errors", [None, 30])
+def test_parallel_validation(large_network, max_errors, inherit, monkeypatch):
+    """
+    Validation across worker processes gives identical, identically ordered
+    errors and warnings to validation in a single process, whether workers
+    inherit the components or are sent them
+    """
+    import multiprocessing
+    if not inherit:
+        monkeypatch.setattr(multiprocessing, "get_start_method", lambda: "spawn")
+
+    parser = PywrJSONParser(large_network)
+    parser.parse(max_errors=max_errors)
+
+    parallel = PywrJSONParser(large_network)
+    parallel.parse(max_errors=max_errors, jobs=2, chunk_size=40)
+
+    assert error_summary(parallel.errors) == error_summary(parser.errors)
+    assert error_summary(parallel.warnings) == error_summary(parser.warnings)
+    assert list(parallel.errors) == list(parser.errors)
+    assert list(parallel.parameters) == list(parser.parameters)
+    assert list(parallel.nodes) == list(parser.nodes)
+
+
+@pytest.fixture
+def levels_src(valid_network_file):
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    src["nodes"][0]["max_flow"] = {"type": "constant"}
+    src["edges"].append(["Node_1", "Nowhere"])
+    return src
+
+
+def test_structural_level(levels_src):
+    """
+    Structural validation reports structural faults without creating components
+    """
+    from pywrparser.utils import profile_rules
+
+    levels_src["scenarios"].append({"size": 2})
+    del levels_src["timestepper"]
+    levels_src["parameters"] = []
+    levels_src["edges"] += [["Node_1"], ["Node_1", "Node_2"], ["Node_1", "Node_2"]]
+    parser = PywrJSONParser(json.dumps(levels_src))
+    with profile_rules() as profile:
+        parser.parse(level="structural", allow_duplicate_edges=False)
+    assert not profile.components and not parser.nodes
+    assert [str(err) for err in parser.errors["network"]] == [
+        "Network contains no timestepper",
+        "Network section 'parameters' is not an object",
+        f"Scenario at index {len(levels_src['scenarios']) - 1} has no name",
+        f"Edge at index {len(levels_src['edges']) - 3} does not join two vertices",
+        "Edge <Node_1, Nowhere> refers to unknown node <Nowhere>",
+        "Duplicate edge <('Node_1', 'Node_2')>"
+    ]
+    assert list(parser.errors) == ["network"] and not parser.warnings
+
+
+def test_structurally_valid(valid_network_file):
+    from pywrparser.types.network import PywrNetwork
+    assert PywrNetwork.from_file(valid_network_file, level="structural") == (None, None, None)
+    with pytest.raises(ValueError):
+        PywrJSONParser("{}").parse(level="thorough")
+
+
+def test_exhaustive_level(levels_src):
+    """
+    Exhaustive validation checks edges and inline parameters, which standard
+    validation does not
+    """
+    standard = PywrJSONParser(json.dumps(levels_src))
+    standard.parse()
+    assert not standard.has_errors
+    exhaustive = PywrJSONParser(json.dumps(levels_src))
+    exhaustive.parse(level="exhaustive")
+    assert [err.rule for err in exhaustive.errors["parameters"]] == ["rule_constant_has_value"]
+    assert [str(err) for err in exhaustive.errors["network"]] == [
+        "Edge <Node_1, Nowhere> refers to unknown node <Nowhere>"
+    ]
+
+
+@pytest.mark.parametrize("section", ["metadata", "timestepper"])
+def test_missing_required_section(valid_network_file, section):
+    """
+    Is a network without a required section invalid at every level, and
+    reported identically by each parser?
+    """
+    import io
+    from pywrparser.incremental import IncrementalValidator
+    from pywrparser.parsers import PywrJSONStreamParser
+    from pywrparser.types.network import PywrNetwork
+
+    with open(valid_network_file) as fp:
+        src = json.load(fp)
+    del src[section]
+    json_src = json.dumps(src)
+    message = f"Network contains no {section}"
+
+    network, errors, _ = PywrNetwork.from_json(json_src)
+    assert network is None
+    assert [str(error) for error in errors["network"]] == [message]
+
+    stream = PywrJSONStreamParser(io.StringIO(json_src))
+    stream.parse()
+    assert [str(error) for error in stream.errors["network"]] == [message]
+
+    validator = IncrementalValidator(json_src)
+    assert [str(error) for error in validator.errors["network"]] == [message]